@@ -1,15 +1,34 @@
+import os
+from functools import wraps
+
 import coreapi
+from django.conf import settings
+from django.conf.urls import (
+    include,
+    url,
+)
+from django.http import HttpResponse
 from rest_framework.compat import (
     URLPattern,
     URLResolver,
 )
 from rest_framework.compat import get_original_route
-from rest_framework.documentation import include_docs_urls
+from rest_framework.renderers import (
+    CoreJSONRenderer,
+    DocumentationRenderer,
+    SchemaJSRenderer,
+)
 from rest_framework.schemas import SchemaGenerator
 from rest_framework.schemas.generators import (
     EndpointEnumerator,
     distribute_links,
 )
+from rest_framework.schemas.views import SchemaView
+
+PRERENDERED_CONTENT_TYPES = {
+    'index.html': 'text/html; charset=utf-8',
+    'schema.js': 'application/javascript; charset=utf-8',
+}
 
 
 class CustomCoreApiDocument(coreapi.Document):
@@ -80,11 +99,17 @@ class CustomEndpointEnumerator(EndpointEnumerator):
 class CustomGenerator(SchemaGenerator):
     """
     Fixes DRF fail if custom `schema` definition in @detail_route provided.
+    Links are built once per (public, authenticated) variant and kept
+    for the lifetime of the process.
 
     """
 
     endpoint_inspector_cls = CustomEndpointEnumerator
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.links_cache = {}
+
     def create_view(self, callback, method, request=None):
         view = super().create_view(callback, method, request)
         view.schema.view = view
@@ -96,11 +121,7 @@ class CustomGenerator(SchemaGenerator):
 
         """
 
-        if self.endpoints is None:
-            inspector = self.endpoint_inspector_cls(self.patterns, self.urlconf)
-            self.endpoints = inspector.get_api_endpoints()
-
-        links = self.get_links(None if public else request)
+        links = self.get_cached_links(request, public)
         if not links:
             return None
 
@@ -108,17 +129,80 @@ class CustomGenerator(SchemaGenerator):
         if not url and request is not None:
             url = request.build_absolute_uri()
 
-        distribute_links(links)
         return CustomCoreApiDocument(
             title=self.title, description=self.description,
             url=url, content=links, links=links,
         )
 
+    def get_cached_links(self, request, public):
+        key = (public, request is not None and request.user.is_authenticated)
+        if key not in self.links_cache:
+            if self.endpoints is None:
+                inspector = self.endpoint_inspector_cls(self.patterns, self.urlconf)
+                self.endpoints = inspector.get_api_endpoints()
+
+            links = self.get_links(None if public else request)
+            if links:
+                distribute_links(links)
+            self.links_cache[key] = links
+        return self.links_cache[key]
+
+
+# Contents of pre-rendered files, a missing file is looked up again on the next request.
+prerendered_cache = {}
+
+
+def read_prerendered(path):
+    if path not in prerendered_cache:
+        try:
+            with open(path, 'rb') as file:
+                prerendered_cache[path] = file.read()
+        except FileNotFoundError:
+            return None
+    return prerendered_cache[path]
+
+
+def prerendered(view, filename):
+    """
+    Serve `filename` of `API_DOCS_ROOT`, written by `manage.py render_api_docs`,
+    instead of rendering the view. Requests for other formats and processes
+    without the file fall back to the view.
+
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        content = None
+        if request.method == 'GET' and 'format' not in request.GET and \
+                CoreJSONRenderer.media_type not in request.META.get('HTTP_ACCEPT', ''):
+            content = read_prerendered(os.path.join(settings.API_DOCS_ROOT, filename))
+        if content is None:
+            return view(request, *args, **kwargs)
+        return HttpResponse(content, content_type=PRERENDERED_CONTENT_TYPES[filename])
 
-docs = include_docs_urls(
-    generator_class=CustomGenerator,
+    return wrapper
+
+
+# Both views share the generator and so its cached links.
+generator = CustomGenerator(
     title='Blog with Post API',
     description='Blog with Post endpoints',
-    authentication_classes=[],
-    permission_classes=[],
 )
+
+
+def get_docs_view(renderer_classes):
+    return SchemaView.as_view(
+        renderer_classes=renderer_classes,
+        schema_generator=generator,
+        public=True,
+        authentication_classes=[],
+        permission_classes=[],
+    )
+
+
+docs = include(([
+    url(r'^$', prerendered(get_docs_view([DocumentationRenderer, CoreJSONRenderer]), 'index.html'),
+        name='docs-index'),
+    url(r'^schema.js$', prerendered(get_docs_view([SchemaJSRenderer]), 'schema.js'),
+        name='schema-js'),
+], 'api-docs'), namespace='api-docs')
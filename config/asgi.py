@@ -0,0 +1,11 @@
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+django.setup()
+
+from common.asgi import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
@@ -0,0 +1,70 @@
+"""
+Gunicorn settings of `manage.py serve`, also usable with `gunicorn -c config/gunicorn.py`.
+
+The app is loaded and warmed up in the master before workers are forked,
+the heap is frozen so workers share it copy-on-write. Every worker logs
+its memory after start and the latency of its first request.
+
+"""
+import multiprocessing
+import os
+import time
+
+CPU_COUNT = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+# I/O bound workers: processes for the cores, threads for requests waiting on the database
+workers = int(os.environ.get('GUNICORN_WORKERS', CPU_COUNT * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+timeout = 30
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
+wsgi_app = 'config.wsgi:application'
+
+
+def when_ready(server):
+    from django.db import connections
+
+    from common.warmup import (
+        freeze_heap,
+        get_memory_usage,
+        warm_up,
+    )
+
+    started = time.perf_counter()
+    views = warm_up()
+    # Forked workers must not share connections of the master.
+    connections.close_all()
+    freeze_heap()
+    server.log.info('Warmed up %d views in %.1fms, master memory: %s',
+                    views, (time.perf_counter() - started) * 1000, format_memory(get_memory_usage()))
+
+
+def post_worker_init(worker):
+    from common.warmup import get_memory_usage
+
+    worker.first_request_started = None
+    worker.log.info('Worker %d started, memory: %s', worker.pid, format_memory(get_memory_usage()))
+
+
+def pre_request(worker, req):
+    if worker.first_request_started is None:
+        worker.first_request_started = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    started, worker.first_request_started = worker.first_request_started, False
+    if started:
+        from common.warmup import get_memory_usage
+
+        worker.log.info('Worker %d first request %s %s in %.1fms, memory: %s', worker.pid, req.method, req.path,
+                        (time.perf_counter() - started) * 1000, format_memory(get_memory_usage()))
+
+
+def format_memory(usage):
+    return ', '.join(f'{name} {value / 1024:.1f}MB' for name, value in usage.items())
@@ -15,7 +15,7 @@ LOGGING = {
             'format': '%(levelname)s %(asctime)s %(name)s %(filename)s %(funcName)s %(lineno)d \n%(message)s\n'
         },
         'sqlformatter': {
-            '()': 'sqlformatter.SqlFormatter',
+            '()': 'common.sqlformatter.SqlFormatter',
             'format': '%(levelname)s %(message)s',
         },
         'rich_formatter': {
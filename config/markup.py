@@ -0,0 +1,18 @@
+"""
+Renderers of `MARKUP_FIELD_TYPES`. Markdown and docutils are imported when
+the first body is rendered, not by every process loading the settings.
+
+"""
+
+
+def render_markdown(markup):
+    import markdown
+
+    return markdown.markdown(markup)
+
+
+def render_rest(markup):
+    from docutils.core import publish_parts
+
+    parts = publish_parts(source=markup, writer_name='html4css1')
+    return parts['fragment']
@@ -4,14 +4,14 @@ import sys
 from urllib.parse import urlunparse
 
 import environ
-import markdown
-import raven
 from django.conf.global_settings import LANGUAGES as BASE_LANGUAGES
 from django.contrib import messages
-from docutils.core import publish_parts
-from model_utils import Choices
 
 from .logging import LOGGING
+from .markup import (
+    render_markdown,
+    render_rest,
+)
 
 ROOT_DIR = environ.Path(__file__) - 2
 APPS_DIR = ROOT_DIR.path('project')
@@ -37,6 +37,7 @@ env = environ.Env(
     DJANGO_ALLOWED_HOSTS=(list, []),
     DJANGO_DISALLOWED_USER_AGENTS=(list, []),
     DJANGO_INTERNAL_IPS=(list, []),
+    DJANGO_NUM_PROXIES=(int, 0),
     DJANGO_DEFAULT_HTTP_PROTOCOL=(str, 'http'),
 
     DJANGO_ADMIN_URL=(str, 'admin/'),
@@ -45,6 +46,7 @@ env = environ.Env(
     DJANGO_DEFAULT_FROM_EMAIL=(str, 'webmaster@localhost'),
     DJANGO_SERVER_EMAIL=(str, 'root@localhost'),
     DJANGO_EMAIL_URL=(str, 'consolemail://'),
+    DJANGO_EMAIL_QUEUE=(bool, False),
     DJANGO_EMAIL_USE_LOCALTIME=(bool, True),
     DJANGO_EMAIL_SUBJECT_PREFIX=(str, 'Django'),
     DJANGO_EMAIL_SSL_CERTFILE=(str, ''),
@@ -71,6 +73,7 @@ env = environ.Env(
 
     DJANGO_USE_SILK=(bool, False),
     DJANGO_SENTRY_DSN=(str, ''),
+    DJANGO_SENTRY_RELEASE=(str, ''),
 
     CLIENT_DOMAIN=(str, 'localhost:8000'),
 )
@@ -170,6 +173,7 @@ DEFAULT_HTTP_PROTOCOL = env.str('DJANGO_DEFAULT_HTTP_PROTOCOL')
 
 MIDDLEWARE = (
     'corsheaders.middleware.CorsMiddleware',
+    'common.middleware.AdmissionControlMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -237,6 +241,12 @@ EMAIL_URL = env.email_url('DJANGO_EMAIL_URL')
 
 EMAIL_BACKEND = EMAIL_URL.get('EMAIL_BACKEND')
 
+# messages are stored and delivered by the send_queued_mail command with MAIL_QUEUE_BACKEND
+if env.bool('DJANGO_EMAIL_QUEUE'):
+    MAIL_QUEUE_BACKEND, EMAIL_BACKEND = EMAIL_BACKEND, 'common.mail.QueuedEmailBackend'
+    # error reports are sent right away, the queue may be what is failing
+    LOGGING['handlers']['mail_admins']['email_backend'] = MAIL_QUEUE_BACKEND
+
 EMAIL_FILE_PATH = env.str('EMAIL_FILE_PATH', APPS_DIR.path('media/email').root)
 
 EMAIL_HOST = EMAIL_URL.get('EMAIL_HOST')
@@ -375,7 +385,7 @@ FIRST_DAY_OF_WEEK = 0
 
 LANGUAGE_CODE = 'en-us'
 
-LANGUAGES = Choices(*[(lang[0], lang[0].replace('-', '_'), lang[1]) for lang in BASE_LANGUAGES])
+LANGUAGES = BASE_LANGUAGES
 
 LOCALE_PATHS = []
 
@@ -509,11 +519,19 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser'
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_jwt.authentication.JSONWebTokenAuthentication',
+        'users.authentication.StatelessJSONWebTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': 'rest_framework.permissions.AllowAny',
+    # rates are set per view in `throttle_rates`
+    'DEFAULT_THROTTLE_CLASSES': (
+        'common.throttling.UserSlidingWindowThrottle',
+        'common.throttling.IPSlidingWindowThrottle',
+        'common.throttling.ViewSlidingWindowThrottle',
+    ),
+    # reverse proxies in front of the app setting X-Forwarded-For, see `common.utils.get_client_ip`
+    'NUM_PROXIES': env.int('DJANGO_NUM_PROXIES'),
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'common.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.SwitchablePagination',
     'PAGE_SIZE': 25,
     'EXCEPTION_HANDLER': 'common.exceptions.exception_handler',
 }
@@ -535,7 +553,7 @@ JWT_AUTH = {
         'rest_framework_jwt.utils.jwt_decode_handler',
 
     'JWT_PAYLOAD_HANDLER':
-        'rest_framework_jwt.utils.jwt_payload_handler',
+        'users.authentication.jwt_payload_handler',
 
     'JWT_PAYLOAD_GET_USER_ID_HANDLER':
         'rest_framework_jwt.utils.jwt_get_user_id_from_payload_handler',
@@ -562,6 +580,9 @@ JWT_AUTH = {
     'JWT_AUTH_COOKIE': False,
 }
 
+# verified tokens kept by users.authentication.StatelessJSONWebTokenAuthentication
+JWT_VERIFIED_TOKENS_CACHE_SIZE = 1024
+
 ##############################################################################
 # Django Debug Toolbar
 # https://django-debug-toolbar.readthedocs.io/en/stable/configuration.html
@@ -643,12 +664,14 @@ if USE_SILK:
 ##############################################################################
 
 if env('DJANGO_SENTRY_DSN'):
+    import raven
+
     INSTALLED_APPS += (
         'raven.contrib.django.raven_compat',
     )
     RAVEN_CONFIG = {
         'dsn': env('DJANGO_SENTRY_DSN'),
-        'release': raven.fetch_git_sha(ROOT_DIR.root),
+        'release': env('DJANGO_SENTRY_RELEASE') or raven.fetch_git_sha(ROOT_DIR.root),
     }
     LOGGING['handlers'].update({
         'sentry': {
@@ -676,13 +699,8 @@ if env('DJANGO_SENTRY_DSN'):
 # https://github.com/jamesturk/django-markupfield#django-markupfield
 ##############################################################################
 
-def render_rest(markup):
-    parts = publish_parts(source=markup, writer_name='html4css1')
-    return parts['fragment']
-
-
 MARKUP_FIELD_TYPES = (
-    ('markdown', markdown.markdown),
+    ('markdown', render_markdown),
     ('ReST', render_rest),
 )
 
@@ -700,3 +718,54 @@ WEB_URLS = {
 
 COMMENT_UPDATE_TIMEDELTA = datetime.timedelta(minutes=5)
 COMMENT_DELETE_TIMEDELTA = datetime.timedelta(minutes=10)
+
+POST_DETAIL_COMMENTS_LIMIT = 10
+
+# exact, cached or estimated, see common.counts
+PAGINATION_COUNT_STRATEGY = 'estimated'
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 100000
+
+# rows deleted at once by common.deletion.BatchDeleter
+DELETE_BATCH_SIZE = 1000
+
+# delivery of queued mail by common.management.commands.send_queued_mail
+MAIL_QUEUE_BATCH_SIZE = 100
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = datetime.timedelta(minutes=1)
+MAIL_QUEUE_LEASE = datetime.timedelta(minutes=10)
+
+# concurrency limits of common.middleware.AdmissionControlMiddleware per worker process,
+# at most `queue` requests wait up to `timeout` seconds for one of `limit` slots
+ADMISSION_CONTROL_CLASSES = {
+    'default': {'limit': 32, 'queue': 64, 'timeout': 2},
+    'expensive': {'limit': 4, 'queue': 8, 'timeout': 0.5},
+}
+ADMISSION_CONTROL_VIEWS = {
+    'api:posts:list': 'expensive',
+    'api:users:user_list': 'expensive',
+}
+ADMISSION_CONTROL_RETRY_AFTER = 1
+
+# turns off throttles of common.throttling, e.g. for the benchmark command
+THROTTLE_ENABLED = True
+
+# bounded thread pools running views of config.asgi, see common.asgi.ASGIHandler
+ASGI_THREADS = 8
+ASGI_READ_THREADS = 16
+ASGI_READ_ONLY_VIEWS = (
+    'api:posts:list',
+    'api:posts:detail',
+    'api:users:user_info',
+    'api:users:user_posts',
+    'api:users:user_comments',
+)
+
+# import time budgets in milliseconds of common.management.commands.startup_profile
+STARTUP_IMPORT_BUDGET = {
+    'setup': 500,
+    'wsgi': 600,
+}
+
+# docs pages pre-rendered by common.management.commands.render_api_docs, see config.api_docs
+API_DOCS_ROOT = str(environ.Path(STATIC_ROOT).path('api-docs'))
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from django.core.management import call_command
 from faker import Factory as FakerFactory
 from pytest_factoryboy import register
@@ -33,6 +34,13 @@ def pytest_generate_tests(metafunc):
         metafunc.parametrize('tmp_ct', range(count))
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Drop cached responses of rolled back test data"""
+
+    cache.clear()
+
+
 @pytest.fixture
 def token(user):
     return jwt_encode(user)
@@ -2,4 +2,9 @@
 #migrate, create super and run server
 
 ./manage.py migrate --noinput
-./manage.py runserver 0.0.0.0:8000
+if [ "${DJANGO_DEBUG}" = "True" ]; then
+    ./manage.py runserver 0.0.0.0:8000
+else
+    ./manage.py render_api_docs
+    ./manage.py serve --bind 0.0.0.0:8000
+fi
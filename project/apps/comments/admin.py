@@ -6,10 +6,14 @@ from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 
 from comments.models import Comment
+from common.mixins import (
+    BatchDeleteAdminMixin,
+    CountStrategyAdminMixin,
+)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BatchDeleteAdminMixin, CountStrategyAdminMixin, admin.ModelAdmin):
     list_display = (
         'id', 'truncated_body', 'post_link',
         'author_link', 'ip_address',
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from django.db.models import CASCADE
 from django.utils.translation import ugettext_lazy as _
+from model_utils import FieldTracker
 from model_utils.models import TimeStampedModel
 
 from posts.models import Post
@@ -11,7 +12,7 @@ User = get_user_model()
 
 class Comment(TimeStampedModel):
     post = models.ForeignKey(
-        to=Post, on_delete=CASCADE,
+        to=Post, on_delete=CASCADE, db_index=False,
         verbose_name=_('Post'), related_name='comments',
         help_text=_('Post.')
     )
@@ -20,7 +21,7 @@ class Comment(TimeStampedModel):
         help_text=_('Comment Body.')
     )
     user = models.ForeignKey(
-        to=User, on_delete=CASCADE,
+        to=User, on_delete=CASCADE, db_index=False,
         verbose_name=_('User'), related_name='comments',
         help_text=_('Comment Author.')
     )
@@ -29,12 +30,15 @@ class Comment(TimeStampedModel):
         help_text=_('Comment Author IP Address.')
     )
 
+    tracker = FieldTracker(fields=['post', 'user'])
+
     class Meta:
         verbose_name = _('Comment')
         verbose_name_plural = _('Comments')
         ordering = ('-created', 'user')
         indexes = (
-            models.Index(fields=['post', 'body', 'user', 'ip_address']),
+            models.Index(fields=['post', '-created']),
+            models.Index(fields=['user', '-created']),
         )
 
     def __str__(self):
@@ -3,9 +3,16 @@ from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
 from comments.models import Comment
+from common.serializers import (
+    LoadedRelationListSerializer,
+    ValuesSerializer,
+)
 from common.utils import get_client_ip
 from posts.models import Post
-from users.serializers import UserSimpleSerializer
+from users.serializers import (
+    UserSimpleSerializer,
+    UserSimpleValuesSerializer,
+)
 
 
 class CommentSimpleSerializer(serializers.ModelSerializer):
@@ -20,6 +27,32 @@ class CommentDetailsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ('id', 'user', 'body', 'created', 'modified')
+        list_serializer_class = LoadedRelationListSerializer
+
+
+class CommentSimpleValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id'),
+        ('post_id', 'post_id'),
+        ('body', 'body'),
+        ('created', 'created'),
+        ('modified', 'modified'),
+    )
+    converters = {
+        'created': serializers.DateTimeField().to_representation,
+        'modified': serializers.DateTimeField().to_representation,
+    }
+
+
+class CommentDetailsValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id'),
+        ('user', UserSimpleValuesSerializer),
+        ('body', 'body'),
+        ('created', 'created'),
+        ('modified', 'modified'),
+    )
+    converters = CommentSimpleValuesSerializer.converters
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -0,0 +1,92 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from comments.models import Comment
+from common.cache import invalidate_response_cache
+from common.signals import pre_batch_delete
+from posts.models import Post
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+def change_comments_count(post_id, delta):
+    queryset = Post.objects.filter(id=post_id)
+    if delta < 0:
+        queryset = queryset.filter(comments_count__gte=-delta)
+    if not queryset.update(comments_count=F('comments_count') + delta) and delta < 0:
+        logger.warning('comments_count of post %s not decreased by %s, it has drifted, run reconcile_counters.',
+                       post_id, -delta)
+
+
+def decrease_comments_count(comments):
+    """
+    Subtract `comments` from counters of their posts in one statement,
+    counters never go below zero.
+
+    """
+
+    counts = comments.filter(post_id=OuterRef('pk')).order_by().values('post_id').annotate(
+        count=Count('pk')
+    ).values('count')
+    Post.objects.filter(id__in=comments.values('post_id')).update(
+        comments_count=Greatest(F('comments_count') - Subquery(counts, output_field=IntegerField()), 0)
+    )
+
+
+def invalidate_comment_cache(comment, *tags):
+    invalidate_response_cache(
+        f'comment:{comment.id}', f'post:{comment.post_id}', f'user-comments:{comment.user_id}', *tags
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    tags = []
+    if created:
+        change_comments_count(instance.post_id, 1)
+        User.objects.change_counter(instance.user_id, 'comments_count', 1)
+    else:
+        if instance.tracker.has_changed('post'):
+            previous_post_id = instance.tracker.previous('post')
+            change_comments_count(previous_post_id, -1)
+            change_comments_count(instance.post_id, 1)
+            tags.append(f'post:{previous_post_id}')
+        if instance.tracker.has_changed('user'):
+            previous_user_id = instance.tracker.previous('user')
+            User.objects.change_counter(previous_user_id, 'comments_count', -1)
+            User.objects.change_counter(instance.user_id, 'comments_count', 1)
+            tags.append(f'user-comments:{previous_user_id}')
+    invalidate_comment_cache(instance, *tags)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    change_comments_count(instance.post_id, -1)
+    User.objects.change_counter(instance.user_id, 'comments_count', -1)
+    invalidate_comment_cache(instance)
+
+
+@receiver(pre_batch_delete, sender=Comment)
+def comments_deleting(sender, queryset, **kwargs):
+    tags = set()
+    for comment_id, post_id, user_id in queryset.values_list('id', 'post_id', 'user_id'):
+        tags.update((f'comment:{comment_id}', f'post:{post_id}', f'user-comments:{user_id}'))
+    decrease_comments_count(queryset)
+    User.objects.decrease_counter('comments_count', queryset, 'user')
+    invalidate_response_cache(*tags)
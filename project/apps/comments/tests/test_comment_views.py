@@ -2,12 +2,15 @@ import datetime
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, F
 from django.urls import reverse_lazy
 from freezegun import freeze_time
 from rest_framework import status
 
 from comments.models import Comment
 from comments.serializers import CommentSimpleSerializer
+from comments.views import CommentCreateApiView
 from posts.models import Post
 
 User = get_user_model()
@@ -77,6 +80,29 @@ class CommentViewsTestSuite:
         assert response.data == CommentSimpleSerializer(Comment.objects.get(id=response.data.get('id'))).data
         user.refresh_from_db()
         assert user.comments.count() == comments_count + 1
+        normal_post.refresh_from_db()
+        assert normal_post.comments_count == 1
+
+    def test_comment_create_throttle(self, client, user, user_factory, post, faker, monkeypatch):
+        monkeypatch.setattr(CommentCreateApiView, 'throttle_rates', {'user': '2/min', 'ip': '3/min'})
+        payloads = {
+            self.post_id_field: post.id,
+            self.body_field: faker.word(),
+        }
+        client.force_authenticate(user)
+        for _ in range(2):
+            response = client.post(self.comment_create_url, data=payloads)
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.post(self.comment_create_url, data=payloads)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert 0 < int(response['Retry-After']) <= 60
+
+        client.force_authenticate(user_factory())
+        response = client.post(self.comment_create_url, data=payloads)
+        assert response.status_code == status.HTTP_201_CREATED
+        response = client.post(self.comment_create_url, data=payloads)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
 
     def test_comment_update_view(self, client, comment, comment_factory, faker, settings):
         test_url = reverse_lazy(self.comment_update_url, args=(1,))
@@ -150,6 +176,8 @@ class CommentViewsTestSuite:
 
         user.refresh_from_db()
         assert user.comments.count() == comments_count - 1
+        comment.post.refresh_from_db()
+        assert comment.post.comments_count == 0
 
         comment = comment_factory(user=user)
         url = reverse_lazy(self.comment_delete_url, args=(comment.id,))
@@ -159,3 +187,26 @@ class CommentViewsTestSuite:
             assert response.status_code == status.HTTP_403_FORBIDDEN
         user.refresh_from_db()
         assert user.comments.count() == comments_count
+
+    def test_comments_count_reconcile(self, comment_factory, post_factory):
+        post = post_factory()
+        comment_factory.create_batch(3, post=post)
+        post.refresh_from_db()
+        assert post.comments_count == 3
+
+        another_post = post_factory()
+        comment = Comment.objects.filter(post=post).first()
+        comment.post = another_post
+        comment.save()
+        post.refresh_from_db()
+        another_post.refresh_from_db()
+        assert post.comments_count == 2
+        assert another_post.comments_count == 1
+
+        Post.objects.filter(id=post.id).update(comments_count=100)
+        call_command('reconcile_counters', chunk_size=10)
+        post.refresh_from_db()
+        assert post.comments_count == 2
+        assert not Post.objects.annotate(
+            comments_total=Count('comments')
+        ).exclude(comments_count=F('comments_total')).exists()
@@ -7,6 +7,10 @@ from comments.serializers import (
     CommentSerializer,
     CommentUpdateSerializer,
 )
+from common.mixins import (
+    BatchDeleteMixin,
+    OptimizedQuerysetMixin,
+)
 from common.permissions import IsObjectOwner
 
 
@@ -19,27 +23,30 @@ class CommentCreateApiView(generics.CreateAPIView):
     http_method_names = ('post', 'head', 'options')
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticated,)
+    throttle_rates = {'user': '10/min', 'ip': '30/min'}
 
 
-class CommentUpdateApiView(generics.UpdateAPIView):
+class CommentUpdateApiView(OptimizedQuerysetMixin, generics.UpdateAPIView):
     """
     patch: Update comment body
 
     """
 
-    queryset = Comment.objects
+    queryset = Comment.objects.all()
+    queryset_fields = ('user', 'created', 'modified')
     http_method_names = ('patch', 'head', 'options')
     serializer_class = CommentUpdateSerializer
     permission_classes = (IsAuthenticated, IsObjectOwner, TimeDeltaPermission)
 
 
-class CommentDeleteApiView(generics.DestroyAPIView):
+class CommentDeleteApiView(BatchDeleteMixin, OptimizedQuerysetMixin, generics.DestroyAPIView):
     """
     delete: Delete comment
 
     """
 
-    queryset = Comment.objects
+    queryset = Comment.objects.all()
+    queryset_fields = ('user', 'created', 'modified')
     http_method_names = ('delete', 'head', 'options')
     serializer_class = CommentSerializer
     permission_classes = (IsAuthenticated, IsObjectOwner, TimeDeltaPermission)
@@ -0,0 +1,161 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import (
+    Resolver404,
+    resolve,
+)
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def get_path_info(scope):
+    """
+    Path of the scope relative to the `root_path` the application is mounted at.
+
+    """
+
+    root_path = scope.get('root_path', '')
+    if root_path and scope['path'].startswith(root_path):
+        return scope['path'][len(root_path):] or '/'
+    return scope['path']
+
+
+def get_environ(scope, body):
+    """
+    WSGI environ of an ASGI HTTP scope and the request body.
+
+    """
+
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin1'),
+        'PATH_INFO': get_path_info(scope).encode().decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name, value = name.decode('latin1'), value.decode('latin1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = f'HTTP_{name.upper().replace("-", "_")}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class ASGIHandler:
+    """
+    ASGI application running Django views in bounded thread pools.
+
+    Request bodies are read and responses are sent by the event loop,
+    so slow clients hold a coroutine instead of a thread. Only the view,
+    with its database work, runs in a thread. GET and HEAD requests of
+    `ASGI_READ_ONLY_VIEWS` get their own pool of `ASGI_READ_THREADS`,
+    so writes cannot take every thread from them. Other requests run
+    in a pool of `ASGI_THREADS`.
+
+    """
+
+    def __init__(self):
+        self.wsgi_handler = WSGIHandler()
+        self.read_executor = ThreadPoolExecutor(settings.ASGI_READ_THREADS)
+        self.executor = ThreadPoolExecutor(settings.ASGI_THREADS)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported ASGI scope type {scope["type"]}.')
+
+        body = await self.read_body(receive)
+        if body is None:
+            # The client is gone, there is no one to respond to.
+            return
+        loop = asyncio.get_event_loop()
+        status, headers, chunks = await loop.run_in_executor(
+            self.get_executor(scope), self.get_response, get_environ(scope, body)
+        )
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        for chunk in chunks[:-1]:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': chunks[-1] if chunks else b''})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def close(self):
+        self.read_executor.shutdown()
+        self.executor.shutdown()
+
+    @staticmethod
+    async def read_body(receive):
+        """
+        Return the request body or `None` when the client disconnects before sending it.
+
+        """
+
+        body = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(body)
+
+    def get_executor(self, scope):
+        if scope['method'] not in READ_METHODS:
+            return self.executor
+        try:
+            view_name = resolve(get_path_info(scope)).view_name
+        except Resolver404:
+            return self.executor
+        return self.read_executor if view_name in settings.ASGI_READ_ONLY_VIEWS else self.executor
+
+    def get_response(self, environ):
+        """
+        Run the WSGI handler and return the status, headers and body chunks
+        of the response. Closing the response sends `request_finished`,
+        which closes database connections of the thread.
+
+        """
+
+        started = []
+
+        def start_response(status, headers):
+            started.append((int(status.split(' ', 1)[0]), headers))
+
+        response = self.wsgi_handler(environ, start_response)
+        try:
+            chunks = [chunk for chunk in response if chunk]
+        finally:
+            response.close()
+        status, headers = started[0]
+        return status, [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers], chunks
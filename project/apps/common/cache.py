@@ -0,0 +1,131 @@
+from hashlib import md5
+from time import time
+from uuid import uuid4
+
+from django.core.cache import (
+    DEFAULT_CACHE_ALIAS,
+    caches,
+)
+
+
+class TaggedCache:
+    """
+    Cache entries tagged with the ids of the objects they contain.
+
+    Every tag has a version stored in the cache, the time it was last
+    invalidated (zero for new tags) and a random part. An entry keeps versions of its tags from the moment
+    it was stored and is stale once any of them differs. Invalidation
+    replaces tag versions, so it costs one cache round trip no matter
+    how many entries carry the tags.
+
+    Versions are snapshotted before the value is computed, so a value
+    computed while its tags are invalidated is stored as stale. Tags only
+    known once the value is computed must not be invalidated since the
+    snapshot, otherwise the value is not stored. Clocks of the processes
+    are assumed in sync.
+
+    """
+
+    tag_prefix = 'version'
+    stats_prefix = 'stats'
+
+    def __init__(self, prefix, alias=DEFAULT_CACHE_ALIAS, timeout=None):
+        self.prefix = prefix
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f'{self.prefix}:{md5(key.encode()).hexdigest()}'
+
+    def make_tag_key(self, tag):
+        return f'{self.prefix}:{self.tag_prefix}:{tag}'
+
+    def make_stats_key(self, name):
+        return f'{self.prefix}:{self.stats_prefix}:{name}'
+
+    @staticmethod
+    def make_version(invalidated=0.0):
+        return invalidated, uuid4().hex
+
+    def get_tag_versions(self, tags, create=False):
+        tag_keys = {self.make_tag_key(tag): tag for tag in tags}
+        versions = {tag_keys[key]: version for key, version in self.cache.get_many(tag_keys).items()}
+        if create:
+            for tag in set(tag_keys.values()) - set(versions):
+                self.cache.add(self.make_tag_key(tag), self.make_version(), None)
+                version = self.cache.get(self.make_tag_key(tag))
+                if version is not None:
+                    versions[tag] = version
+        return versions
+
+    def snapshot(self, tags):
+        """
+        Return the current time and versions of `tags`,
+        taken before computing a value to `set()`.
+
+        """
+
+        return time(), self.get_tag_versions(set(tags), create=True)
+
+    def get(self, key, default=None):
+        entry = self.cache.get(self.make_key(key))
+        if entry is None:
+            self.count('misses')
+            return default
+
+        versions, value = entry
+        if self.get_tag_versions(versions) != versions:
+            self.count('misses')
+            return default
+        self.count('hits')
+        return value
+
+    def set(self, key, value, tags, snapshot):
+        """
+        Store `value` with versions of `tags` from `snapshot`. Nothing is
+        stored when tags missing in the snapshot may have been invalidated
+        since it was taken.
+
+        """
+
+        started, versions = snapshot
+        versions = {tag: version for tag, version in versions.items() if tag in tags}
+        missing = set(tags) - set(versions)
+        versions.update(self.get_tag_versions(missing, create=True))
+        if set(tags) - set(versions) or any(versions[tag][0] > started for tag in missing):
+            return
+        self.cache.set(self.make_key(key), (versions, value), self.timeout)
+
+    def invalidate(self, *tags):
+        version = self.make_version(time())
+        self.cache.set_many({self.make_tag_key(tag): version for tag in tags}, None)
+
+    def count(self, name):
+        self.increment(self.make_stats_key(name))
+
+    def increment(self, key):
+        if not self.cache.add(key, 1, None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, 1, None)
+
+    def get_stats(self):
+        hits, misses = (self.cache.get(self.make_stats_key(name), 0) for name in ('hits', 'misses'))
+        requests = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / requests if requests else 0.0,
+        }
+
+
+response_cache = TaggedCache('response', timeout=60 * 60)
+
+
+def invalidate_response_cache(*tags):
+    response_cache.invalidate(*tags)
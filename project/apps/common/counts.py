@@ -0,0 +1,146 @@
+import json
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import (
+    DatabaseError,
+    connections,
+)
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATED = 'estimated'
+
+
+def is_unfiltered(queryset):
+    """
+    Return `True` if the queryset counts every row of its table.
+
+    """
+
+    query = queryset.query
+    return not (query.where or query.distinct or query.extra_tables or
+                query.combinator or query.low_mark or query.high_mark is not None)
+
+
+def estimate_sqlite(connection, queryset):
+    """
+    Row count of the table from `sqlite_stat1`, it is filled by `ANALYZE`.
+    Filtered querysets cannot be estimated.
+
+    """
+
+    if not is_unfiltered(queryset):
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [queryset.model._meta.db_table])
+            stats = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+    except DatabaseError:
+        return None
+    return max(stats) if stats else None
+
+
+def estimate_postgresql(connection, queryset):
+    """
+    `pg_class.reltuples` of the table, or the row estimate of the planner
+    for filtered querysets.
+
+    """
+
+    with connection.cursor() as cursor:
+        if is_unfiltered(queryset):
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+ESTIMATES = {
+    'sqlite': estimate_sqlite,
+    'postgresql': estimate_postgresql,
+}
+
+
+def estimate_count(queryset):
+    estimate = ESTIMATES.get(connections[queryset.db].vendor)
+    return estimate(connections[queryset.db], queryset) if estimate else None
+
+
+def get_exact_count(queryset):
+    return queryset.count(), EXACT
+
+
+def get_cached_count(queryset):
+    """
+    Exact count cached for `PAGINATION_COUNT_CACHE_TIMEOUT` seconds,
+    keyed by the SQL and params of the queryset.
+
+    """
+
+    sql, params = queryset.query.sql_with_params()
+    key = f'count:{md5(f"{queryset.db}:{sql}:{params}".encode()).hexdigest()}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count, CACHED
+
+
+def get_table_rows(queryset):
+    """
+    Row estimate of the table of the queryset cached for
+    `PAGINATION_COUNT_CACHE_TIMEOUT` seconds, so the catalog is not
+    read on every request. Tables without an estimate are cached as `-1`.
+
+    """
+
+    key = f'count:table:{queryset.db}:{queryset.model._meta.db_table}'
+    rows = cache.get(key)
+    if rows is None:
+        rows = estimate_count(queryset.model._default_manager.using(queryset.db).all())
+        rows = -1 if rows is None else rows
+        cache.set(key, rows, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return None if rows < 0 else rows
+
+
+def get_estimated_count(queryset):
+    """
+    Planner estimate for tables of `PAGINATION_COUNT_ESTIMATE_THRESHOLD`
+    rows and more, exact count for smaller or never analyzed tables.
+    Filtered querysets the database cannot estimate are counted with cache.
+
+    """
+
+    table_rows = get_table_rows(queryset)
+    if table_rows is None or table_rows < settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+        return get_exact_count(queryset)
+
+    rows = table_rows if is_unfiltered(queryset) else estimate_count(queryset)
+    if rows is None:
+        return get_cached_count(queryset)
+    return rows, ESTIMATED
+
+
+COUNT_STRATEGIES = {
+    EXACT: get_exact_count,
+    CACHED: get_cached_count,
+    ESTIMATED: get_estimated_count,
+}
+
+
+def get_count(queryset, strategy=None):
+    """
+    Count queryset rows with `strategy`, `PAGINATION_COUNT_STRATEGY` by default.
+    Returns the count and the strategy that produced it.
+
+    """
+
+    return COUNT_STRATEGIES[strategy or settings.PAGINATION_COUNT_STRATEGY](queryset)
@@ -0,0 +1,49 @@
+import io
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    transaction,
+)
+
+
+def get_row(model, values, connection):
+    """
+    Return column values of `values` (a dict by attname or a model instance)
+    prepared for the database, dict rows get defaults for missing fields.
+
+    """
+
+    fields = model._meta.concrete_fields
+    if isinstance(values, dict):
+        values = [values[field.attname] if field.attname in values else field.get_default() for field in fields]
+    else:
+        values = [getattr(values, field.attname) for field in fields]
+    return tuple(field.get_db_prep_save(value, connection) for field, value in zip(fields, values))
+
+
+def escape_copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def insert_rows(model, rows, using=DEFAULT_DB_ALIAS):
+    """
+    Insert prepared rows with COPY on PostgreSQL and one
+    multi-row `executemany` elsewhere. Model `save()` and signals are skipped.
+
+    """
+
+    connection = connections[using]
+    opts = model._meta
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(field.column) for field in opts.concrete_fields)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            data = io.StringIO(''.join('\t'.join(escape_copy_value(value) for value in row) + '\n' for row in rows))
+            cursor.copy_expert(f'COPY {quote_name(opts.db_table)} ({columns}) FROM STDIN', data)
+        else:
+            placeholders = ', '.join(['%s'] * len(opts.concrete_fields))
+            cursor.executemany(f'INSERT INTO {quote_name(opts.db_table)} ({columns}) VALUES ({placeholders})', rows)
+    return len(rows)
@@ -0,0 +1,192 @@
+from collections import (
+    Counter,
+    defaultdict,
+)
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import (
+    connections,
+    transaction,
+)
+from django.db.models import (
+    CASCADE,
+    DO_NOTHING,
+    SET_NULL,
+    Q,
+)
+from django.db.models.deletion import (
+    Collector,
+    get_candidate_relations_to_delete,
+)
+from django.db.models.signals import (
+    post_delete,
+    pre_delete,
+)
+
+from common.signals import pre_batch_delete
+
+BATCH_ON_DELETE = (CASCADE, SET_NULL, DO_NOTHING)
+
+
+class BatchDeleter:
+    """
+    Delete a queryset and its CASCADE relations in chunks of `batch_size` rows.
+
+    `Collector` loads every related object before deleting anything.
+    The deleter walks foreign keys pointing to the model instead, deletes
+    children of every chunk first and selects them with subqueries,
+    so at most `batch_size` primary keys per model are held in memory.
+    Rows without relations and delete receivers are deleted with
+    `DELETE ... WHERE pk IN (SELECT pk ... LIMIT batch_size)` without loading them.
+
+    Models with `pre_batch_delete` receivers get one signal per chunk,
+    models with only `pre_delete` / `post_delete` receivers get them
+    for every instance of the chunk. Relations the deleter does not handle
+    are deleted with `Collector` chunk by chunk.
+    `progress` is called with the model label and the number of deleted rows
+    after every chunk.
+
+    """
+
+    def __init__(self, batch_size=None, progress=None):
+        self.batch_size = batch_size or settings.DELETE_BATCH_SIZE
+        self.progress = progress
+        self.deleted = Counter()
+        self.tables = None
+
+    def get_relations(self, model, using):
+        """
+        Relations to delete with the model. Models of apps without migrations,
+        like `allauth.socialaccount` imported by `rest_auth`, are registered
+        without tables and are skipped.
+
+        """
+
+        if self.tables is None:
+            self.tables = set(connections[using].introspection.table_names())
+        return [related for related in get_candidate_relations_to_delete(model._meta)
+                if related.related_model._meta.db_table in self.tables]
+
+    def can_batch_delete(self, model, using):
+        """
+        Return `True` if relations of the model can be deleted by the deleter,
+        inherited models and generic relations are left to `Collector`.
+
+        """
+
+        opts = model._meta
+        return (
+            not opts.concrete_model._meta.parents and
+            not any(hasattr(field, 'bulk_related_objects') for field in opts.private_fields) and
+            all(related.field.remote_field.on_delete in BATCH_ON_DELETE
+                for related in self.get_relations(model, using))
+        )
+
+    def delete(self, queryset):
+        """
+        Delete the queryset in one transaction, returns the total number
+        of deleted rows and the numbers per model label as `QuerySet.delete()` does.
+
+        """
+
+        assert queryset.query.can_filter(), 'Cannot use "limit" or "offset" with delete.'
+        self.deleted, self.tables = Counter(), None
+        with transaction.atomic(using=queryset.db, savepoint=False):
+            self.delete_queryset(queryset.order_by())
+        return sum(self.deleted.values()), dict(self.deleted)
+
+    def count(self, queryset):
+        """
+        Return the numbers of rows `delete()` would delete per model,
+        counted with one COUNT per model and without loading rows.
+        Relations of models left to `Collector` are not counted.
+
+        """
+
+        self.tables = None
+        related_querysets = defaultdict(list)
+        querysets = [queryset.order_by()]
+        while querysets:
+            queryset = querysets.pop()
+            model, using = queryset.model, queryset.db
+            related_querysets[model].append(queryset)
+            if not self.can_batch_delete(model, using):
+                continue
+            for related in self.get_relations(model, using):
+                if related.field.remote_field.on_delete is CASCADE:
+                    querysets.append(related.related_model._base_manager.using(using).filter(
+                        **{f'{related.field.name}__in': queryset.values('pk')}
+                    ))
+
+        counts = {}
+        for model, model_querysets in related_querysets.items():
+            # A row reached by several relations is counted once.
+            count = model._base_manager.using(model_querysets[0].db).filter(
+                reduce(or_, (Q(pk__in=queryset.values('pk')) for queryset in model_querysets))
+            ).count()
+            if count:
+                counts[model._meta.label] = count
+        return counts
+
+    def delete_queryset(self, queryset):
+        model, using = queryset.model, queryset.db
+        if Collector(using=using).can_fast_delete(queryset) and not pre_batch_delete.has_listeners(model):
+            while True:
+                chunk = model._base_manager.using(using).filter(
+                    pk__in=queryset.values('pk')[:self.batch_size]
+                )
+                deleted = chunk._raw_delete(using)
+                self.add_deleted(model, deleted)
+                if deleted < self.batch_size:
+                    return
+
+        while True:
+            pks = list(queryset.values_list('pk', flat=True)[:self.batch_size])
+            if not pks:
+                return
+            self.delete_chunk(model._base_manager.using(using).filter(pk__in=pks))
+
+    def delete_chunk(self, chunk):
+        model, using = chunk.model, chunk.db
+        if not self.can_batch_delete(model, using):
+            collector = Collector(using=using)
+            collector.collect(chunk)
+            for label, deleted in collector.delete()[1].items():
+                self.add_deleted(label, deleted)
+            return
+
+        instances = ()
+        if pre_batch_delete.has_listeners(model):
+            pre_batch_delete.send(sender=model, queryset=chunk, using=using)
+        elif pre_delete.has_listeners(model) or post_delete.has_listeners(model):
+            instances = list(chunk)
+            for instance in instances:
+                pre_delete.send(sender=model, instance=instance, using=using)
+
+        for related in self.get_relations(model, using):
+            field = related.field
+            on_delete = field.remote_field.on_delete
+            if on_delete is DO_NOTHING:
+                continue
+            children = related.related_model._base_manager.using(using).filter(**{f'{field.name}__in': chunk})
+            if on_delete is CASCADE:
+                self.delete_queryset(children.order_by())
+            else:
+                children.update(**{field.name: None})
+
+        self.add_deleted(model, chunk._raw_delete(using))
+        for instance in instances:
+            post_delete.send(sender=model, instance=instance, using=using)
+            setattr(instance, model._meta.pk.attname, None)
+
+    def add_deleted(self, model, deleted):
+        label = model if isinstance(model, str) else model._meta.label
+        self.deleted[label] += deleted
+        if deleted and self.progress is not None:
+            self.progress(label, deleted)
+
+
+def delete_objects(queryset, batch_size=None, progress=None):
+    return BatchDeleter(batch_size, progress).delete(queryset)
@@ -0,0 +1,176 @@
+import json
+import os
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    transaction,
+)
+from django.db.models.signals import (
+    post_save,
+    pre_save,
+)
+
+from common.db import (
+    get_row,
+    insert_rows,
+)
+
+BUFFER_SIZE = 64 * 1024
+
+
+def find_fixture(fixture_name):
+    for fixture_dir in settings.FIXTURE_DIRS:
+        path = os.path.join(fixture_dir, f'{fixture_name}.json')
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f'Fixture {fixture_name} not found in {", ".join(settings.FIXTURE_DIRS)}.')
+
+
+def iter_json_array(file, buffer_size=BUFFER_SIZE):
+    """
+    Yield items of the top-level JSON array of the file one by one,
+    reading `buffer_size` characters at a time.
+
+    """
+
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+
+    def skip_whitespace():
+        nonlocal buffer, position, eof
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            buffer, position = file.read(buffer_size), 0
+            eof = not buffer
+
+    def expect(characters):
+        nonlocal position
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise ValueError(f'Expected one of {characters!r} at character {position} of the fixture buffer.')
+        position += 1
+        return buffer[position - 1]
+
+    expect('[')
+    skip_whitespace()
+    if buffer[position:position + 1] == ']':
+        return
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                item, end = None, None
+            # An item running to the end of the buffer may continue in the next read.
+            if end is not None and (end < len(buffer) or eof):
+                break
+            chunk = file.read(buffer_size)
+            if not chunk:
+                eof = True
+                if end is None:
+                    raise ValueError('Fixture ends inside of an item.')
+            buffer, position = buffer[position:] + chunk, 0
+        position = end
+        yield item
+        if expect(',]') == ']':
+            return
+
+
+def build_instance(model, data):
+    """
+    Build model instance, m2m data and attnames of the fields set
+    by one serialized fixture object.
+
+    """
+
+    opts = model._meta
+    values, m2m_data = {opts.pk.attname: opts.pk.to_python(data.get('pk'))}, {}
+    for field_name, value in data['fields'].items():
+        field = opts.get_field(field_name)
+        if field.many_to_many:
+            m2m_data[field.name] = value
+        elif field.is_relation:
+            values[field.attname] = value
+        else:
+            values[field.attname] = field.to_python(value)
+    return model(**values), m2m_data, set(values)
+
+
+def save_batch(model, batch, using):
+    """
+    Insert a batch of built instances and send `pre_save` and `post_save`
+    with `raw=True` for each of them, as `loaddata` does.
+
+    Rows with primary keys of the batch are replaced, like `loaddata`
+    updates existing objects, so a fixture can be loaded again.
+    Fields the fixture does not set, like denormalized counters,
+    keep values of the replaced rows.
+
+    """
+
+    connection = connections[using]
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    queryset = model._base_manager.using(using).filter(pk__in=[instance.pk for instance, *_ in batch])
+    existing = {row[0]: row[1:] for row in queryset.values_list('pk', *(field.attname for field in fields))}
+    if existing:
+        queryset._raw_delete(using)
+    for instance, m2m_data, field_names in batch:
+        for field, value in zip(fields, existing.get(instance.pk, ())):
+            if field.attname not in field_names:
+                setattr(instance, field.attname, value)
+        pre_save.send(sender=model, instance=instance, raw=True, using=using, update_fields=None)
+    insert_rows(model, [get_row(model, instance, connection) for instance, *_ in batch], using=using)
+    for instance, m2m_data, field_names in batch:
+        instance._state.adding, instance._state.db = False, using
+        post_save.send(sender=model, instance=instance, created=instance.pk not in existing,
+                       update_fields=None, raw=True, using=using)
+        for field_name, value in m2m_data.items():
+            if value:
+                getattr(instance, field_name).set(value)
+
+
+def load_fixture(fixture_name, apps=global_apps, using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """
+    Load a JSON fixture like `loaddata` does, but resolve models through
+    given app registry, so data migrations can load fixtures
+    against historical models.
+
+    The fixture is parsed incrementally and objects are inserted in
+    batches of `batch_size` per model, so memory does not grow with
+    the fixture. Foreign keys are checked once all objects are inserted.
+
+    Returns the number of loaded objects.
+
+    """
+
+    connection = connections[using]
+    batches, loaded = {}, 0
+    with transaction.atomic(using=using):
+        with open(find_fixture(fixture_name)) as fixture, connection.constraint_checks_disabled():
+            for data in iter_json_array(fixture):
+                model = apps.get_model(data['model'])
+                batch = batches.setdefault(model, [])
+                batch.append(build_instance(model, data))
+                loaded += 1
+                if len(batch) >= batch_size:
+                    save_batch(model, batch, using)
+                    batch.clear()
+            for model, batch in batches.items():
+                if batch:
+                    save_batch(model, batch, using)
+
+        connection.check_constraints(table_names=[model._meta.db_table for model in batches])
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), batches)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
+    return loaded
@@ -0,0 +1,149 @@
+import random
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.db import connection
+from pytz import UTC
+
+from comments.models import Comment
+from common.db import (
+    get_row,
+    insert_rows,
+)
+from posts.models import Post
+
+User = get_user_model()
+
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore '
+    'et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip '
+    'ex ea commodo consequat duis aute irure in reprehenderit voluptate velit esse cillum fugiat nulla '
+    'pariatur excepteur sint occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim '
+    'id est laborum python django blog post comment markdown database query index cache search'
+).split()
+NAMES = (
+    'Alice Bob Carol Dave Erin Frank Grace Heidi Ivan Judy Mallory Niaj Olivia Peggy Rupert Sybil '
+    'Trent Victor Walter Yvonne Zoe'
+).split()
+EPOCH = datetime(2018, 1, 1, tzinfo=UTC)
+PERIOD = timedelta(days=3 * 365).total_seconds()
+
+_context = {}
+
+
+def get_words(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def get_datetime(rng):
+    return EPOCH + timedelta(seconds=rng.uniform(0, PERIOD))
+
+
+def get_markdown(rng):
+    paragraphs = [f'## {get_words(rng, 2, 5).capitalize()}']
+    for _ in range(rng.randint(1, 4)):
+        paragraphs.append(f'{get_words(rng, 20, 60).capitalize()} *{rng.choice(WORDS)}* **{rng.choice(WORDS)}**.')
+    if rng.random() < 0.3:
+        paragraphs.append('\n'.join(f'- {get_words(rng, 2, 6)}' for _ in range(rng.randint(2, 5))))
+    return '\n\n'.join(paragraphs)
+
+
+def generate_users(rng, ids, context):
+    for user_id in ids:
+        joined = get_datetime(rng)
+        yield {
+            'id': user_id,
+            'username': f'user{user_id}',
+            'email': f'user{user_id}@example.com',
+            'primary_email_address': f'user{user_id}@example.com',
+            'email_verified': True,
+            'password': context['password'],
+            'first_name': rng.choice(NAMES),
+            'last_name': rng.choice(NAMES),
+            'date_joined': joined,
+            'modified': joined,
+        }
+
+
+def generate_email_addresses(rng, ids, context):
+    for user_id in ids:
+        yield {
+            'id': user_id + context['email_address_offset'],
+            'user_id': user_id,
+            'email': f'user{user_id}@example.com',
+            'verified': True,
+            'primary': True,
+        }
+
+
+def generate_posts(rng, ids, context):
+    render = Post._meta.get_field('body').markup_choices_dict['markdown']
+    for post_id in ids:
+        created = get_datetime(rng)
+        body = get_markdown(rng)
+        yield {
+            'id': post_id,
+            'title': get_words(rng, 3, 8).capitalize(),
+            'body': body,
+            'body_markup_type': 'markdown',
+            '_body_rendered': render(body),
+            'author_id': rng.choice(context['user_ids']),
+            'status': Post.PUBLISHED if rng.random() < 0.9 else Post.DRAFT,
+            'status_changed': created,
+            'created': created,
+            'modified': created,
+        }
+
+
+def generate_comments(rng, ids, context):
+    for comment_id in ids:
+        created = get_datetime(rng)
+        yield {
+            'id': comment_id,
+            'post_id': rng.choice(context['post_ids']),
+            'user_id': rng.choice(context['user_ids']),
+            'body': get_words(rng, 5, 40).capitalize(),
+            'ip_address': f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+            'created': created,
+            'modified': created,
+        }
+
+
+GENERATORS = {
+    'users': (User, generate_users),
+    'email_addresses': (EmailAddress, generate_email_addresses),
+    'posts': (Post, generate_posts),
+    'comments': (Comment, generate_comments),
+}
+
+
+def init_worker(context):
+    """
+    Keep ids to pick relations from and the password hash in the worker,
+    so they are not sent with every chunk.
+
+    """
+
+    global _context
+    _context = context
+
+
+def generate_chunk(task):
+    """
+    Generate rows of one `(kind, chunk, ids, seed, insert)` task,
+    seeded by the chunk number, so data does not depend on the number of workers.
+    Rows are inserted by the worker if `insert` is set, returned otherwise.
+
+    """
+
+    kind, chunk, ids, seed, insert = task
+    model, generator = GENERATORS[kind]
+    rng = random.Random(f'{seed}:{kind}:{chunk}')
+    rows = [get_row(model, values, connection) for values in generator(rng, ids, _context)]
+    if insert:
+        return kind, insert_rows(model, rows)
+    return kind, rows
@@ -0,0 +1,91 @@
+from contextlib import suppress
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import (
+    connection,
+    transaction,
+)
+from django.utils import timezone
+
+from common.models import QueuedEmail
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Store messages in the `QueuedEmail` table instead of sending them,
+    so requests do not wait for the mail server. Messages are delivered
+    by the `send_queued_mail` command with `MAIL_QUEUE_BACKEND`.
+
+    """
+
+    def send_messages(self, email_messages):
+        emails = [QueuedEmail.from_message(message) for message in email_messages if message.recipients()]
+        QueuedEmail.objects.bulk_create(emails)
+        return len(emails)
+
+
+class MailQueueWorker:
+    """
+    Deliver queued messages in batches over one connection of `backend`,
+    the connection stays open between batches and is reopened after errors.
+
+    Messages are claimed for `lease` by moving their next attempt,
+    so several workers can run at once and messages of a crashed worker
+    are delivered again once the lease expires. Failed messages are retried
+    after `retry_delay` doubled on every attempt and are marked as failed
+    after `max_attempts`. Delivered messages are deleted.
+
+    """
+
+    def __init__(self, backend=None, batch_size=None, max_attempts=None, retry_delay=None, lease=None):
+        self.connection = get_connection(backend or getattr(settings, 'MAIL_QUEUE_BACKEND', None))
+        self.batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.MAIL_QUEUE_MAX_ATTEMPTS
+        self.retry_delay = retry_delay or settings.MAIL_QUEUE_RETRY_DELAY
+        self.lease = lease or settings.MAIL_QUEUE_LEASE
+
+    def claim(self):
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(QueuedEmail.objects.select_for_update(
+                skip_locked=connection.features.has_select_for_update_skip_locked
+            ).filter(status=QueuedEmail.QUEUED, next_attempt__lte=now).order_by('next_attempt')[:self.batch_size])
+            QueuedEmail.objects.filter(id__in=[email.id for email in emails]).update(next_attempt=now + self.lease)
+        return emails
+
+    def send(self, email):
+        try:
+            self.connection.open()
+            self.connection.send_messages([email.get_message()])
+        except Exception as e:
+            with suppress(Exception):
+                self.connection.close()
+            email.attempts += 1
+            email.last_error = f'{e.__class__.__name__}: {e}'
+            if email.attempts >= self.max_attempts:
+                email.status = QueuedEmail.FAILED
+            email.next_attempt = timezone.now() + self.retry_delay * 2 ** (email.attempts - 1)
+            email.save(update_fields=('attempts', 'last_error', 'status', 'next_attempt', 'modified'))
+            return False
+        QueuedEmail.objects.filter(id=email.id).delete()
+        return True
+
+    def run_batch(self):
+        """
+        Deliver one batch, returns numbers of sent and failed messages.
+
+        """
+
+        sent = failed = 0
+        for email in self.claim():
+            if self.send(email):
+                sent += 1
+            else:
+                failed += 1
+        return sent, failed
+
+    def close(self):
+        with suppress(Exception):
+            self.connection.close()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from common.middleware import admission_stats
+
+
+class Command(BaseCommand):
+    help = 'Show numbers of admitted, queued and shed requests per URL name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the numbers after showing them.')
+
+    def handle(self, *args, **options):
+        for view_name, stats in admission_stats.get_stats().items():
+            self.stdout.write(f'{view_name}: admitted: {stats["admitted"]}, queued: {stats["queued"]}, '
+                              f'shed: {stats["shed"]}')
+        if options.get('reset'):
+            admission_stats.reset()
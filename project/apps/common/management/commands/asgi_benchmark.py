@@ -0,0 +1,143 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from common.asgi import (
+    ASGIHandler,
+    get_environ,
+)
+from common.management.commands.benchmark import get_percentile
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput of the WSGI and ASGI paths under the same load of slow clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=64,
+                            help='Number of concurrent client connections.')
+        parser.add_argument('--requests', type=int, default=10,
+                            help='Requests per client.')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds a client takes to send a request and to read a response.')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Threads of the WSGI server and of each ASGI pool.')
+
+    def handle(self, *args, **options):
+        clients, requests, threads = options.get('clients'), options.get('requests'), options.get('threads')
+        if clients < 1 or requests < 1 or threads < 1:
+            raise CommandError('Numbers of clients, requests and threads must be positive.')
+        post = Post.objects.filter(status=Post.PUBLISHED).order_by('-comments_count').first()
+        if post is None:
+            raise CommandError('There are no posts, see load_fake_data.')
+
+        paths = [
+            reverse('api:posts:list'),
+            reverse('api:posts:detail', args=(post.id,)),
+            reverse('api:users:user_info', args=(post.author_id,)),
+            reverse('api:users:user_posts', args=(post.author_id,)),
+            reverse('api:users:user_comments', args=(post.author_id,)),
+        ]
+        self.delay = options.get('client_delay') / 2
+        overrides = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            # Responses are not cached and requests are not throttled.
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            'THROTTLE_ENABLED': False,
+            'ADMISSION_CONTROL_CLASSES': {name: {'limit': clients} for name in settings.ADMISSION_CONTROL_CLASSES},
+            'ASGI_THREADS': threads,
+            'ASGI_READ_THREADS': threads,
+        }
+        with override_settings(**overrides):
+            self.wsgi_application = get_wsgi_application()
+            self.wsgi_executor = ThreadPoolExecutor(threads)
+            self.asgi_application = ASGIHandler()
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                for name, request in (('WSGI', self.wsgi_request), ('ASGI', self.asgi_request)):
+                    started = time.perf_counter()
+                    timings = loop.run_until_complete(asyncio.gather(*(
+                        self.run_client(request, paths, client, requests) for client in range(clients)
+                    )))
+                    elapsed = time.perf_counter() - started
+                    self.report(name, sorted(timing for client in timings for timing in client), elapsed)
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+                self.wsgi_executor.shutdown()
+                self.asgi_application.close()
+
+    def report(self, name, timings, elapsed):
+        self.stdout.write(
+            f'{name}: {len(timings)} requests in {elapsed:.2f}s, {len(timings) / elapsed:.1f} req/s, '
+            f'p50 {get_percentile(timings, 50) * 1000:.1f}ms, p95 {get_percentile(timings, 95) * 1000:.1f}ms'
+        )
+
+    async def run_client(self, request, paths, client, requests):
+        timings = []
+        for number in range(requests):
+            scope = {
+                'type': 'http',
+                'method': 'GET',
+                'path': paths[(client + number) % len(paths)],
+                'query_string': b'',
+                'headers': [(b'host', b'testserver')],
+                'server': ('testserver', 80),
+                'client': ('127.0.0.1', 10000 + client),
+            }
+            started = time.perf_counter()
+            status = await request(scope)
+            timings.append(time.perf_counter() - started)
+            if status != 200:
+                raise CommandError(f'{scope["path"]} responded with {status}.')
+        return timings
+
+    async def wsgi_request(self, scope):
+        """
+        A sync worker thread is blocked while the client sends the request
+        and reads the response.
+
+        """
+
+        def serve():
+            time.sleep(self.delay)
+            started = []
+            response = self.wsgi_application(get_environ(scope, b''), lambda status, headers: started.append(status))
+            try:
+                b''.join(response)
+            finally:
+                response.close()
+            time.sleep(self.delay)
+            return int(started[0].split(' ', 1)[0])
+
+        return await asyncio.get_event_loop().run_in_executor(self.wsgi_executor, serve)
+
+    async def asgi_request(self, scope):
+        """
+        The event loop waits for the client, threads only run the view.
+
+        """
+
+        messages = []
+
+        async def receive():
+            await asyncio.sleep(self.delay)
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+            if message['type'] == 'http.response.body' and not message.get('more_body'):
+                await asyncio.sleep(self.delay)
+
+        await self.asgi_application(scope, receive, send)
+        return messages[0]['status']
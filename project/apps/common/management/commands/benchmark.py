@@ -0,0 +1,215 @@
+import json
+import math
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.management.color import no_style
+from django.db import (
+    connection,
+    reset_queries,
+    transaction,
+)
+from django.db.models import Max
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from posts.models import Post
+from posts.search import get_search_backend
+
+User = get_user_model()
+
+PERCENTILES = (50, 95, 99)
+
+
+def get_percentile(timings, percentile):
+    """
+    Nearest-rank percentile of sorted timings.
+
+    """
+
+    return timings[max(math.ceil(percentile / 100 * len(timings)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = 'Time API endpoints at scaled data sizes and report latency percentiles as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1,10,100,1000',
+                            help='Comma separated multipliers of the loaded posts and comments.')
+        parser.add_argument('--requests', type=int, default=20,
+                            help='Timed requests per endpoint and scale.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows per INSERT when seeding.')
+        parser.add_argument('--cache', action='store_true', default=False,
+                            help='Keep configured caches, by default responses are not cached.')
+        parser.add_argument('--output', default=None,
+                            help='Write the report to a file instead of stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted({int(scale) for scale in options.get('scales').split(',')})
+        except ValueError:
+            raise CommandError('Scales must be comma separated integers.')
+        if not scales or scales[0] < 1:
+            raise CommandError('Scales must be positive.')
+
+        self.batch_size = options.get('batch_size')
+        self.base_posts = list(Post.objects.order_by('id'))
+        self.base_comments = list(Comment.objects.order_by('id'))
+        self.user = User.objects.filter(posts__isnull=False, is_active=True).first()
+        if not self.base_posts or self.user is None:
+            raise CommandError('Load data to scale first, see load_fake_data.')
+
+        # Repeated requests of one client are not throttled.
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'], 'THROTTLE_ENABLED': False}
+        if not options.get('cache'):
+            overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+        report = []
+        with override_settings(**overrides), transaction.atomic():
+            copies = 1
+            for scale in scales:
+                self.seed(copies, scale)
+                copies = scale
+                report.append(self.run(scale, options.get('requests')))
+            # Seeded and benchmarked data is never kept.
+            transaction.set_rollback(True)
+
+        output = json.dumps({'vendor': connection.vendor, 'scales': report}, indent=2)
+        if options.get('output'):
+            with open(options['output'], 'w') as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def seed(self, copies, scale):
+        """
+        Copy loaded posts with their comments until there are `scale` copies.
+
+        """
+
+        post_ids = [post.id for post in self.base_posts]
+        comment_ids = [(comment.id, comment.post_id) for comment in self.base_comments]
+        for copy in range(copies, scale):
+            post_offset = Post.objects.aggregate(max_id=Max('id'))['max_id']
+            comment_offset = Comment.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+            for post, post_id in zip(self.base_posts, post_ids):
+                post.id = post_id + post_offset
+            Post.objects.bulk_create(self.base_posts, batch_size=self.get_batch_size(Post, self.base_posts))
+            for comment, (comment_id, post_id) in zip(self.base_comments, comment_ids):
+                comment.id = comment_id + comment_offset
+                comment.post_id = post_id + post_offset
+            Comment.objects.bulk_create(self.base_comments,
+                                        batch_size=self.get_batch_size(Comment, self.base_comments))
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Post, Comment]):
+                cursor.execute(sql)
+        backend = get_search_backend()
+        if backend is not None and backend.table_exists():
+            backend.rebuild()
+
+    def get_batch_size(self, model, objects):
+        """
+        Limit `--batch-size` to the parameters the database accepts per INSERT.
+
+        """
+
+        return min(self.batch_size, connection.ops.bulk_batch_size(model._meta.concrete_fields, objects))
+
+    def get_endpoints(self):
+        """
+        Return `(name, method, url, data, authenticated)` of the endpoints,
+        url is a callable for requests that need a new object each time.
+
+        """
+
+        post = Post.objects.filter(status=Post.PUBLISHED).order_by('-comments_count').first()
+        own_post = Post.objects.filter(author=self.user).first()
+
+        def post_to_delete():
+            return reverse('api:posts:delete', args=(Post.objects.create(
+                title='Benchmark', body='Benchmark post.', author=self.user
+            ).id,))
+
+        return (
+            ('post_list', 'get', reverse('api:posts:list'), {}, False),
+            ('post_list_search', 'get', reverse('api:posts:list'), {'search': 'post'}, False),
+            ('post_list_ordering', 'get', reverse('api:posts:list'), {'ordering': '-title'}, False),
+            ('post_list_cursor', 'get', reverse('api:posts:list'), {'pagination': 'cursor'}, False),
+            ('my_post_list', 'get', reverse('api:posts:my_post_list'), {}, True),
+            ('post_detail', 'get', reverse('api:posts:detail', args=(post.id,)), {}, False),
+            ('post_comments', 'get', reverse('api:posts:comments', args=(post.id,)), {}, False),
+            ('user_list', 'get', reverse('api:users:user_list'), {}, False),
+            ('user_info', 'get', reverse('api:users:user_info', args=(self.user.id,)), {}, False),
+            ('user_posts', 'get', reverse('api:users:user_posts', args=(self.user.id,)), {}, False),
+            ('user_comments', 'get', reverse('api:users:user_comments', args=(self.user.id,)), {}, False),
+            ('post_create', 'post', reverse('api:posts:create'),
+             {'title': 'Benchmark', 'body': 'Benchmark post.'}, True),
+            ('post_update', 'patch', reverse('api:posts:update', args=(own_post.id,)),
+             {'title': 'Benchmark'}, True),
+            ('post_delete', 'delete', post_to_delete, {}, True),
+            ('comment_create', 'post', reverse('api:comments:create'),
+             {'post_id': post.id, 'body': 'Benchmark comment.'}, True),
+        )
+
+    def check_status(self, name, response):
+        """
+        Errors are not timed as answers of the endpoint.
+
+        """
+
+        if response.status_code >= 400:
+            raise CommandError(f'{name} answered with status {response.status_code}.')
+
+    def run(self, scale, requests):
+        report = {
+            'scale': scale,
+            'users': User.objects.count(),
+            'posts': Post.objects.count(),
+            'comments': Comment.objects.count(),
+            'endpoints': {},
+        }
+        client = APIClient()
+        endpoints = report['endpoints']
+        for name, method, url, data, authenticated in self.get_endpoints():
+            client.force_authenticate(self.user if authenticated else None)
+            request = getattr(client, method)
+
+            # The first request warms up and is the one queries are counted in,
+            # the query log is reset when a request starts.
+            path = url() if callable(url) else url
+            reset_queries()
+            with CaptureQueriesContext(connection) as context:
+                response = request(path, data)
+            queries = len(context)
+            self.check_status(name, response)
+            timings = []
+            for _ in range(requests):
+                path = url() if callable(url) else url
+                start = perf_counter()
+                timed_response = request(path, data)
+                timings.append((perf_counter() - start) * 1000)
+                self.check_status(name, timed_response)
+            timings.sort()
+
+            endpoints[name] = {
+                'status': response.status_code,
+                'queries': queries,
+                'bytes': len(response.content),
+                **{f'p{percentile}_ms': round(get_percentile(timings, percentile), 3)
+                   for percentile in PERCENTILES},
+            }
+            self.stderr.write(f'scale {scale}: {name} p50 {endpoints[name]["p50_ms"]} ms')
+
+        return report
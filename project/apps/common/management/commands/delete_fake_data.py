@@ -1,6 +1,9 @@
+from collections import Counter
+
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
-from django.db import connection
+
+from common.deletion import delete_objects
 
 User = get_user_model()
 
@@ -8,18 +11,21 @@ User = get_user_model()
 class Command(BaseCommand):
     help = 'Delete Fake Data'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows deleted at once, DELETE_BATCH_SIZE by default.')
+
     def handle(self, *args, **options):
-        users_ids = tuple(User.objects.only('id').exclude(
-            is_superuser=True
-        ).values_list('id', flat=True))
-        if not users_ids:
-            return
-        with connection.cursor() as cursor:
-            cursor.execute("""DELETE FROM comments_comment WHERE comments_comment.user_id IN %s """,
-                           [users_ids])
-            cursor.execute("""DELETE FROM posts_post WHERE posts_post.author_id IN %s """,
-                           [users_ids])
-            cursor.execute("""DELETE FROM account_emailaddress WHERE account_emailaddress.user_id IN %s """,
-                           [users_ids])
-            cursor.execute("""DELETE FROM users_user WHERE users_user.id IN %s """,
-                           [users_ids])
+        self.verbosity = options.get('verbosity', 1)
+        self.deleted = Counter()
+        total, _ = delete_objects(
+            User._base_manager.exclude(is_superuser=True),
+            batch_size=options.get('batch_size'),
+            progress=self.report_progress,
+        )
+        self.stdout.write(f'{total} row(s) deleted.')
+
+    def report_progress(self, label, count):
+        self.deleted[label] += count
+        if self.verbosity > 0:
+            self.stdout.write(f'{label}: {self.deleted[label]} deleted')
@@ -0,0 +1,118 @@
+import os
+from multiprocessing import Pool
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.management.color import no_style
+from django.db import (
+    connection,
+    connections,
+)
+from django.db.models import Max
+
+from comments.models import Comment
+from common.db import insert_rows
+from common.generators import (
+    generate_chunk,
+    init_worker,
+    GENERATORS,
+)
+from common.management.commands.reconcile_counters import Command as ReconcileCountersCommand
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Generate large amounts of synthetic users, posts and comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000,
+                            help='Number of users to generate.')
+        parser.add_argument('--posts', type=int, default=100000,
+                            help='Number of posts to generate.')
+        parser.add_argument('--comments', type=int, default=1000000,
+                            help='Number of comments to generate.')
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help='Rows generated and inserted at once.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Number of worker processes generating rows.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the generated data, same seed gives the same data.')
+        parser.add_argument('--password', default='password',
+                            help='Password of the generated users.')
+
+    def handle(self, *args, **options):
+        batch_size, workers, seed = options.get('batch_size'), options.get('workers'), options.get('seed')
+        if batch_size < 1 or workers < 1:
+            raise CommandError('Batch size and number of workers must be positive.')
+
+        user_ids = self.get_ids(User, options.get('users'))
+        post_ids = self.get_ids(Post, options.get('posts'))
+        comment_ids = self.get_ids(Comment, options.get('comments'))
+        max_email_address_id = EmailAddress.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        context = {
+            'password': make_password(options.get('password')),
+            'email_address_offset': max_email_address_id - user_ids.start + 1,
+            'user_ids': user_ids or list(User.objects.values_list('id', flat=True)),
+            'post_ids': post_ids or list(Post.objects.values_list('id', flat=True)),
+        }
+        if (post_ids or comment_ids) and not context['user_ids']:
+            raise CommandError('There are no users to author posts and comments.')
+        if comment_ids and not context['post_ids']:
+            raise CommandError('There are no posts to comment.')
+
+        tasks = [
+            ('users', user_ids),
+            ('email_addresses', user_ids),
+            ('posts', post_ids),
+            ('comments', comment_ids),
+        ]
+
+        # Workers insert themselves only where concurrent writers do not lock each other.
+        insert = connection.vendor == 'postgresql' and workers > 1
+        if workers > 1:
+            # Forked workers must not share the connection of this process.
+            connections.close_all()
+            with Pool(workers, initializer=init_worker, initargs=(context,)) as pool:
+                for kind, ids in tasks:
+                    self.generate(kind, ids, batch_size, seed, insert, pool.imap)
+        else:
+            init_worker(context)
+            for kind, ids in tasks:
+                self.generate(kind, ids, batch_size, seed, insert, map)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, EmailAddress, Post, Comment]):
+                cursor.execute(sql)
+        fixed = ReconcileCountersCommand.reconcile_posts_comments_count(batch_size)
+        self.stdout.write(f'Post.comments_count: {fixed} row(s) updated.')
+        for counter, fixed in ReconcileCountersCommand.reconcile_users_counters(batch_size).items():
+            self.stdout.write(f'User.{counter}: {fixed} row(s) updated.')
+        call_command('rebuild_search_index', stdout=self.stdout)
+
+    @staticmethod
+    def get_ids(model, count):
+        start = (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+        return range(start, start + max(count, 0))
+
+    def generate(self, kind, ids, batch_size, seed, insert, map_chunks):
+        """
+        Generate rows of `ids` in chunks of `batch_size` with `map_chunks`
+        and insert the rows workers return, chunks are streamed one by one.
+
+        """
+
+        model = GENERATORS[kind][0]
+        chunks = ((kind, chunk, ids[start:start + batch_size], seed, insert)
+                  for chunk, start in enumerate(range(0, len(ids), batch_size)))
+        total = 0
+        for _, result in map_chunks(generate_chunk, chunks):
+            total += result if insert else insert_rows(model, result)
+        self.stdout.write(f'{total} {model._meta.verbose_name_plural} generated.')
@@ -0,0 +1,171 @@
+import json
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
+from django.urls import (
+    resolve,
+    reverse,
+)
+from rest_framework.test import (
+    APIRequestFactory,
+    force_authenticate,
+)
+
+from posts.models import Post
+
+User = get_user_model()
+
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+SQLITE_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def explain_sqlite(cursor, sql):
+    """
+    Return tables scanned without index and indexes used by the query.
+
+    """
+
+    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+    scans, indexes = set(), set()
+    for row in cursor.fetchall():
+        detail = row[-1]
+        scan = SQLITE_SCAN.match(detail)
+        if scan:
+            scans.add(scan.group(1))
+        indexes.update(SQLITE_INDEX.findall(detail))
+    return scans, indexes
+
+
+def explain_postgresql(cursor, sql):
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+    plan = cursor.fetchone()[0]
+    nodes = json.loads(plan) if isinstance(plan, str) else plan
+    nodes = [node['Plan'] for node in nodes]
+    scans, indexes = set(), set()
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            scans.add(node['Relation Name'])
+        if 'Index Name' in node:
+            indexes.add(node['Index Name'])
+        nodes.extend(node.get('Plans', ()))
+    return scans, indexes
+
+
+EXPLAIN = {
+    'sqlite': explain_sqlite,
+    'postgresql': explain_postgresql,
+}
+
+
+class Command(BaseCommand):
+    help = 'Replay API read queries with EXPLAIN, report sequential scans and unused indexes'
+
+    # (url name, model of the `pk` url kwarg, query params, authenticated)
+    endpoints = (
+        ('api:posts:list', None, {}, False),
+        ('api:posts:list', None, {'search': 'post'}, False),
+        ('api:posts:list', None, {'pagination': 'cursor'}, False),
+        ('api:posts:my_post_list', None, {}, True),
+        ('api:posts:detail', Post, {}, False),
+        ('api:posts:comments', Post, {}, False),
+        ('api:posts:comments', Post, {'pagination': 'cursor'}, False),
+        ('api:users:user_list', None, {}, False),
+        ('api:users:user_info', User, {}, False),
+        ('api:users:user_posts', User, {}, False),
+        ('api:users:user_comments', User, {}, False),
+    )
+    apps_labels = ('posts', 'comments', 'users')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true', default=False,
+                            help='Run ANALYZE first so the planner has table statistics.')
+
+    def handle(self, *args, **options):
+        explain = EXPLAIN.get(connection.vendor)
+        if explain is None:
+            raise CommandError(f'EXPLAIN of {connection.vendor} database is not supported.')
+
+        if options.get('analyze'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        used_indexes = set()
+        tables = set(connection.introspection.table_names())
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        with override_settings(CACHES=caches, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for url_name, model, params, authenticated in self.endpoints:
+                queries = self.replay(url_name, model, params, authenticated)
+                if queries is None:
+                    self.stdout.write(f'{url_name}: skipped, no objects to look up.')
+                    continue
+                scans = set()
+                with connection.cursor() as cursor:
+                    for sql in queries:
+                        query_scans, query_indexes = explain(cursor, sql)
+                        scans.update(query_scans)
+                        used_indexes.update(query_indexes)
+                query = '&'.join(f'{name}={value}' for name, value in params.items())
+                self.stdout.write(f'{url_name}{"?" if query else ""}{query}: {len(queries)} queries')
+                for table in sorted(scans & tables):
+                    self.stdout.write(self.style.WARNING(f'    sequential scan of {table}'))
+
+        unused = [(table, name) for table, name in self.get_indexes() if name not in used_indexes]
+        self.stdout.write(f'Unused indexes: {len(unused)}')
+        for table, name in unused:
+            self.stdout.write(f'    {table}.{name}')
+
+    @staticmethod
+    def replay(url_name, model, params, authenticated):
+        """
+        Render the endpoint and return its SELECT statements
+        or `None` if there is no object to look up or user to authenticate.
+
+        """
+
+        kwargs = {}
+        if model is not None:
+            pk = model.objects.order_by('-pk').values_list('pk', flat=True).first()
+            if pk is None:
+                return None
+            kwargs['pk'] = pk
+        path = reverse(url_name, kwargs=kwargs)
+        request = APIRequestFactory().get(path, params)
+        if authenticated:
+            user = User.objects.filter(posts__isnull=False).first()
+            if user is None:
+                return None
+            force_authenticate(request, user)
+
+        request.resolver_match = resolve(path)
+        with CaptureQueriesContext(connection) as context:
+            response = request.resolver_match.func(request, **kwargs)
+            response.render()
+        return [query['sql'] for query in context.captured_queries
+                if query['sql'].lstrip().upper().startswith('SELECT')]
+
+    def get_indexes(self):
+        """
+        Yield `(table, index)` of non-unique indexes of the project tables.
+
+        """
+
+        with connection.cursor() as cursor:
+            for label in self.apps_labels:
+                for model in apps.get_app_config(label).get_models():
+                    table = model._meta.db_table
+                    constraints = connection.introspection.get_constraints(cursor, table)
+                    for name, constraint in sorted(constraints.items()):
+                        if constraint['index'] and not constraint['unique'] and not constraint['primary_key']:
+                            yield table, name
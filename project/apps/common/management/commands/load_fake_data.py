@@ -1,14 +1,24 @@
+from django.apps import apps as global_apps
 from django.contrib.sites.models import Site
-from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
+from common.fixtures import load_fixture
+
+FIXTURES = ('users', 'posts', 'comments')
+
 
 class Command(BaseCommand):
     help = 'Load Fake Data'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of objects of a model inserted at once.')
+
     def handle(self, *args, **options):
         if not options.get('call_from_test'):
             Site.objects.get_or_create(id=1, domain='localhost:8000', name='localhost:8000')
-        call_command('loaddata', 'users')
-        call_command('loaddata', 'posts')
-        call_command('loaddata', 'comments')
+        # Data migrations pass their historical app registry.
+        apps = options.get('apps') or global_apps
+        for fixture_name in FIXTURES:
+            objects_count = load_fixture(fixture_name, apps=apps, batch_size=options.get('batch_size', 1000))
+            self.stdout.write(f'Installed {objects_count} object(s) from {fixture_name} fixture.')
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from common.cache import invalidate_response_cache
+from posts.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild full-text search index of posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of posts indexed per transaction.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to rebuild the index in.')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options.get('database'))
+        if backend is None:
+            raise CommandError('Full-text search is not supported by the database.')
+        if backend.create_index():
+            self.stdout.write('Search index created.')
+        else:
+            indexed = backend.rebuild(chunk_size=options.get('chunk_size'))
+            self.stdout.write(f'{indexed} post(s) indexed.')
+        invalidate_response_cache('posts')
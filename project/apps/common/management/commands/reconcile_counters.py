@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from comments.models import Comment
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Repair drift of denormalized counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of rows checked per transaction.')
+
+    def handle(self, *args, **options):
+        chunk_size = options.get('chunk_size')
+        fixed = self.reconcile_posts_comments_count(chunk_size)
+        self.stdout.write(f'Post.comments_count: {fixed} row(s) fixed.')
+        for counter, fixed in self.reconcile_users_counters(chunk_size).items():
+            self.stdout.write(f'User.{counter}: {fixed} row(s) fixed.')
+
+    @staticmethod
+    def reconcile_posts_comments_count(chunk_size):
+        fixed, last_id = 0, 0
+        while True:
+            with transaction.atomic():
+                posts = list(Post.objects.filter(
+                    id__gt=last_id
+                ).order_by('id').values_list('id', 'comments_count')[:chunk_size])
+                if not posts:
+                    return fixed
+                last_id = posts[-1][0]
+                actual = dict(Comment.objects.filter(
+                    post_id__gte=posts[0][0], post_id__lte=last_id
+                ).order_by().values_list('post_id').annotate(total=Count('id')))
+                for post_id, comments_count in posts:
+                    if comments_count != actual.get(post_id, 0):
+                        Post.objects.filter(id=post_id).update(comments_count=actual.get(post_id, 0))
+                        fixed += 1
+
+    @staticmethod
+    def reconcile_users_counters(chunk_size):
+        counters = (
+            ('posts_count', Post, 'author_id'),
+            ('comments_count', Comment, 'user_id'),
+        )
+        fixed, last_id = dict.fromkeys((counter for counter, _, _ in counters), 0), 0
+        while True:
+            with transaction.atomic():
+                users = list(User.objects.filter(
+                    id__gt=last_id
+                ).order_by('id').values('id', *fixed)[:chunk_size])
+                if not users:
+                    return fixed
+                first_id, last_id = users[0]['id'], users[-1]['id']
+                for counter, model, user_field in counters:
+                    actual = dict(model.objects.filter(**{
+                        f'{user_field}__gte': first_id, f'{user_field}__lte': last_id
+                    }).order_by().values_list(user_field).annotate(total=Count('id')))
+                    for user in users:
+                        if user[counter] != actual.get(user['id'], 0):
+                            User.objects.filter(id=user['id']).update(**{counter: actual.get(user['id'], 0)})
+                            fixed[counter] += 1
@@ -0,0 +1,54 @@
+import os
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import (
+    resolve,
+    reverse,
+)
+
+from config.api_docs import PRERENDERED_CONTENT_TYPES
+
+PAGES = (
+    ('api-docs:docs-index', 'index.html'),
+    ('api-docs:schema-js', 'schema.js'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the API docs pages to API_DOCS_ROOT, served by workers without building the schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=None,
+                            help='Base URL of the API the docs call, the current site by default.')
+
+    def handle(self, *args, **options):
+        base_url = options.get('url') or f'{settings.DEFAULT_HTTP_PROTOCOL}://{Site.objects.get_current().domain}'
+        base_url = urlparse(base_url)
+        if not base_url.scheme or not base_url.hostname:
+            raise CommandError(f'{options.get("url")} is not an absolute URL.')
+
+        factory = RequestFactory(HTTP_HOST=base_url.netloc)
+        os.makedirs(settings.API_DOCS_ROOT, exist_ok=True)
+        with override_settings(ALLOWED_HOSTS=[base_url.hostname]):
+            for view_name, filename in PAGES:
+                path = reverse(view_name)
+                # The view itself, not the pre-rendered file it serves.
+                view = resolve(path).func.__wrapped__
+                response = view(factory.get(path, secure=base_url.scheme == 'https'))
+                response.render()
+                if response.status_code != 200 or response['Content-Type'] != PRERENDERED_CONTENT_TYPES[filename]:
+                    raise CommandError(f'{path} responded with {response.status_code} {response["Content-Type"]}.')
+
+                output = os.path.join(settings.API_DOCS_ROOT, filename)
+                with open(f'{output}.tmp', 'wb') as file:
+                    file.write(response.content)
+                os.replace(f'{output}.tmp', output)
+                self.stdout.write(f'{output}: {len(response.content)} bytes')
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from common.cache import response_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit ratio of the response cache'
+
+    def handle(self, *args, **options):
+        stats = response_cache.get_stats()
+        self.stdout.write(f'Hits: {stats["hits"]}, misses: {stats["misses"]}, '
+                          f'hit ratio: {stats["hit_ratio"]:.2%}')
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from common.mail import MailQueueWorker
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued email messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Number of messages claimed at once, MAIL_QUEUE_BATCH_SIZE by default.')
+        parser.add_argument('--backend', default=None,
+                            help='Email backend delivering the messages, MAIL_QUEUE_BACKEND by default.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep waiting for new messages instead of exiting when the queue is empty.')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait for new messages in the loop.')
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        if batch_size is not None and batch_size < 1:
+            raise CommandError('Batch size must be positive.')
+
+        worker = MailQueueWorker(backend=options.get('backend'), batch_size=batch_size)
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = worker.run_batch()
+                total_sent, total_failed = total_sent + sent, total_failed + failed
+                if sent or failed:
+                    self.stdout.write(f'{sent} message(s) sent, {failed} failed.')
+                if sent + failed < worker.batch_size:
+                    if not options.get('loop'):
+                        break
+                    time.sleep(options.get('interval'))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.close()
+        self.stdout.write(f'{total_sent} message(s) sent, {total_failed} failed in total.')
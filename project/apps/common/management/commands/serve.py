@@ -0,0 +1,44 @@
+import os
+import runpy
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.core.wsgi import get_wsgi_application
+
+
+class Command(BaseCommand):
+    help = 'Serve the project with gunicorn, settings are read from config/gunicorn.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default=None,
+                            help='Address to listen on, GUNICORN_BIND or 0.0.0.0:8000 by default.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Number of worker processes, two per CPU and one more by default.')
+        parser.add_argument('--threads', type=int, default=None,
+                            help='Number of threads per worker.')
+
+    def handle(self, *args, **options):
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            raise CommandError('gunicorn is not installed, see requirements/production.txt.')
+
+        overrides = {name: options.get(name) for name in ('bind', 'workers', 'threads')
+                     if options.get(name) is not None}
+
+        class Application(BaseApplication):
+            def load_config(self):
+                config = runpy.run_path(os.path.join(settings.ROOT_DIR.root, 'config', 'gunicorn.py'))
+                config.update(overrides)
+                for name, value in config.items():
+                    if name in self.cfg.settings:
+                        self.cfg.set(name, value)
+
+            def load(self):
+                # Django is set up by manage.py, the app is created in the master before forking.
+                return get_wsgi_application()
+
+        Application().run()
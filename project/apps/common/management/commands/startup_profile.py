@@ -0,0 +1,108 @@
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+ImportTime = namedtuple('ImportTime', ('name', 'self', 'cumulative', 'depth'))
+
+IMPORT_TIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+# `-X importtime` only exists since Python 3.7, older versions get the same
+# report from a hook around the loader of uncached modules.
+IMPORT_TIME_HOOK = '''
+import sys, time
+import _frozen_importlib as bootstrap
+find_and_load, stack = bootstrap._find_and_load, []
+def _find_and_load(name, import_):
+    stack.append(0)
+    started = time.perf_counter()
+    try:
+        return find_and_load(name, import_)
+    finally:
+        cumulative = int((time.perf_counter() - started) * 1000000)
+        nested = stack.pop()
+        if stack:
+            stack[-1] += cumulative
+        sys.stderr.write('import time: %9d | %10d | %s%s\\n' % (
+            cumulative - nested, cumulative, '  ' * len(stack), name))
+bootstrap._find_and_load = _find_and_load
+'''
+
+TARGETS = {
+    # every manage.py invocation
+    'setup': 'import django; django.setup()',
+    # a worker booting, with the URLconfs and views loaded by common.warmup
+    'wsgi': 'import config.wsgi; from django.urls import get_resolver; get_resolver().url_patterns',
+}
+
+
+def parse_import_times(output):
+    """
+    Parse `-X importtime` lines, in microseconds, of the report in `output`.
+
+    """
+
+    times = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if match:
+            self_time, cumulative, indent, name = match.groups()
+            times.append(ImportTime(name, int(self_time), int(cumulative), len(indent) // 2))
+    return times
+
+
+class Command(BaseCommand):
+    help = 'Profile imports of a fresh process and fail when they exceed the startup budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=sorted(TARGETS), default='setup',
+                            help='What the profiled process loads.')
+        parser.add_argument('--limit', type=int, default=20,
+                            help='Number of modules with the highest cumulative time to show.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Number of profiled processes, the fastest one is reported.')
+        parser.add_argument('--budget', type=int, default=None,
+                            help='Budget of the total import time in milliseconds, '
+                                 'STARTUP_IMPORT_BUDGET of the target by default.')
+
+    def handle(self, *args, **options):
+        target, limit, repeat = options.get('target'), options.get('limit'), options.get('repeat')
+        if limit < 1 or repeat < 1:
+            raise CommandError('Limit and number of repeats must be positive.')
+        budget = options.get('budget')
+        if budget is None:
+            budget = settings.STARTUP_IMPORT_BUDGET[target]
+
+        times = min((self.profile(TARGETS[target]) for _ in range(repeat)), key=get_total)
+        total = get_total(times) / 1000
+
+        self.stdout.write(f'{len(times)} modules imported in {total:.1f}ms, budget {budget}ms')
+        self.stdout.write(f'{"cumulative":>12} {"self":>10}  module')
+        for item in sorted(times, key=lambda item: item.cumulative, reverse=True)[:limit]:
+            self.stdout.write(f'{item.cumulative / 1000:10.1f}ms {item.self / 1000:8.1f}ms  {item.name}')
+
+        if total > budget:
+            raise CommandError(f'Imports took {total:.1f}ms, over the budget of {budget}ms.')
+
+    def profile(self, statement):
+        if sys.version_info >= (3, 7):
+            command = [sys.executable, '-X', 'importtime', '-c', statement]
+        else:
+            command = [sys.executable, '-c', f'{IMPORT_TIME_HOOK}\n{statement}']
+        environ = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        process = subprocess.run(command, cwd=str(settings.ROOT_DIR), env=environ,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if process.returncode:
+            raise CommandError(f'Profiled process failed:\n{process.stderr}')
+        return parse_import_times(process.stderr)
+
+
+def get_total(times):
+    return sum(item.cumulative for item in times if item.depth == 0)
@@ -0,0 +1,169 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import (
+    DEFAULT_CACHE_ALIAS,
+    caches,
+)
+from django.http import JsonResponse
+from django.urls import (
+    RegexURLPattern,
+    RegexURLResolver,
+    ResolverMatch,
+    get_resolver,
+)
+from django.utils.translation import ugettext as _
+
+ADMITTED = 'admitted'
+QUEUED = 'queued'
+SHED = 'shed'
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` requests run at once, at most `queue` more wait
+    for a slot and they wait no longer than `timeout` seconds.
+
+    """
+
+    def __init__(self, limit, queue=0, timeout=0):
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.queue = queue
+        self.timeout = timeout
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a slot, returns `ADMITTED` or `QUEUED` if a slot was taken
+        right away or after waiting, `SHED` if no slot was taken.
+
+        """
+
+        if self.semaphore.acquire(blocking=False):
+            return ADMITTED
+        with self.lock:
+            if self.waiting >= self.queue:
+                return SHED
+            self.waiting += 1
+        try:
+            return QUEUED if self.semaphore.acquire(timeout=self.timeout) else SHED
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+
+def iter_view_names(resolver=None, namespaces=()):
+    """
+    Yield `view_name` of resolver matches of all URL patterns,
+    the URL name or the dotted path of the view if the pattern has no name.
+
+    """
+
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, RegexURLResolver):
+            yield from iter_view_names(pattern, namespaces + ((pattern.namespace,) if pattern.namespace else ()))
+        elif isinstance(pattern, RegexURLPattern):
+            yield ResolverMatch(pattern.callback, (), {}, pattern.name, namespaces=list(namespaces)).view_name
+
+
+class AdmissionStats:
+    """
+    Numbers of admitted, queued and shed requests per URL name kept in the cache,
+    so they are shared by all worker processes.
+    Keys are made for the names of `ADMISSION_CONTROL_VIEWS` and of the URLconf,
+    so counting is one atomic increment without a shared list of names.
+
+    """
+
+    outcomes = (ADMITTED, QUEUED, SHED)
+
+    def __init__(self, prefix, alias=DEFAULT_CACHE_ALIAS):
+        self.prefix = prefix
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, view_name, outcome):
+        return f'{self.prefix}:{view_name}:{outcome}'
+
+    def get_view_names(self):
+        return sorted(set(settings.ADMISSION_CONTROL_VIEWS) | set(iter_view_names()))
+
+    def get_keys(self):
+        return [self.make_key(view_name, outcome) for view_name in self.get_view_names() for outcome in self.outcomes]
+
+    def count(self, view_name, outcome):
+        key = self.make_key(view_name, outcome)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # The first request of the name, or another one created the key meanwhile.
+            if not self.cache.add(key, 1, None):
+                self.cache.incr(key)
+
+    def get_stats(self):
+        """
+        Return numbers of URL names with any requests.
+
+        """
+
+        values = self.cache.get_many(self.get_keys())
+        stats = {}
+        for view_name in self.get_view_names():
+            numbers = {outcome: values.get(self.make_key(view_name, outcome), 0) for outcome in self.outcomes}
+            if any(numbers.values()):
+                stats[view_name] = numbers
+        return stats
+
+    def reset(self):
+        self.cache.delete_many(self.get_keys())
+
+
+admission_stats = AdmissionStats('admission')
+
+
+class AdmissionControlMiddleware:
+    """
+    Limit concurrent requests per class of endpoints in this process.
+
+    Views are assigned to classes of `ADMISSION_CONTROL_CLASSES` by their
+    URL name in `ADMISSION_CONTROL_VIEWS`, other views are in the `default` class.
+    So expensive endpoints cannot take every thread from cheap ones.
+    Requests that get no slot before the queue deadline are answered with 503
+    and `Retry-After` right away instead of timing out.
+
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limiters = {
+            name: ConcurrencyLimiter(**options) for name, options in settings.ADMISSION_CONTROL_CLASSES.items()
+        }
+        self.view_classes = settings.ADMISSION_CONTROL_VIEWS
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            limiter = getattr(request, '_admission_limiter', None)
+            if limiter is not None:
+                limiter.release()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        limiter = self.limiters[self.view_classes.get(view_name, 'default')]
+        outcome = limiter.acquire()
+        if outcome != SHED:
+            # Released by `__call__` even when counting fails.
+            request._admission_limiter = limiter
+        admission_stats.count(view_name, outcome)
+        if outcome == SHED:
+            response = JsonResponse({'detail': _('Server is overloaded, retry later.')}, status=503)
+            response['Retry-After'] = settings.ADMISSION_CONTROL_RETRY_AFTER
+            return response
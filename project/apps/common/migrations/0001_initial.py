@@ -4,8 +4,8 @@ from django.core.management import call_command
 from django.db import migrations
 
 
-def load_fake_data(*args, **kwargs):
-    call_command('load_fake_data')
+def load_fake_data(apps, schema_editor):
+    call_command('load_fake_data', apps=apps)
 
 
 def delete_fake_data(*args, **kwargs):
@@ -16,6 +16,9 @@ class Migration(migrations.Migration):
     initial = True
     dependencies = [
         ('sites', '0002_alter_domain_unique'),
+        ('account', '0002_email_max_length'),
+        ('posts', '0001_initial'),
+        ('comments', '0001_initial'),
         migrations.swappable_dependency(settings.AUTH_USER_MODEL),
     ]
     operations = [
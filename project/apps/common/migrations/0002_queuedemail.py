@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.11 on 2026-10-18 14:29
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('subject', models.CharField(help_text='Email Subject.', max_length=256, verbose_name='Subject')),
+                ('recipients', models.TextField(help_text='Comma separated email addresses of all recipients.', verbose_name='Recipients')),
+                ('message', models.BinaryField(help_text='Pickled email message.', verbose_name='Message')),
+                ('status', model_utils.fields.StatusField(choices=[('queued', 'Queued'), ('failed', 'Failed')], default='queued', help_text='Delivery Status.', max_length=100, no_check_for_status=True, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Number of failed delivery attempts.', verbose_name='Attempts')),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now, help_text='Email is not delivered before this time.', verbose_name='Next attempt')),
+                ('last_error', models.TextField(blank=True, help_text='Error of the last failed delivery attempt.', verbose_name='Last error')),
+            ],
+            options={
+                'verbose_name': 'Queued email',
+                'verbose_name_plural': 'Queued emails',
+                'ordering': ('next_attempt',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='queuedemail',
+            index=models.Index(fields=['status', 'next_attempt'], name='common_queu_status_ce23fd_idx'),
+        ),
+    ]
@@ -0,0 +1,436 @@
+from calendar import timegm
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import md5
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib import messages
+from django.contrib.admin import helpers
+from django.contrib.admin.actions import delete_selected
+from django.contrib.admin.options import (
+    IS_POPUP_VAR,
+    csrf_protect_m,
+)
+from django.contrib.admin.utils import (
+    model_ngettext,
+    unquote,
+)
+from django.contrib.auth import get_permission_codename
+from django.core.exceptions import PermissionDenied
+from django.db import (
+    router,
+    transaction,
+)
+from django.db.models import Max
+from django.http import HttpResponse
+from django.template.response import TemplateResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.translation import ugettext as _
+from rest_framework import (
+    mixins,
+    status,
+)
+from rest_framework.response import Response
+
+from common.cache import response_cache
+from common.deletion import (
+    BatchDeleter,
+    delete_objects,
+)
+from common.pagination import (
+    CountStrategyPaginator,
+    KeysetPagination,
+)
+from common.serializers import optimize_queryset
+
+
+def get_request_key(request):
+    """
+    Return view name, path and sorted query params of the request.
+
+    """
+
+    query = '&'.join(
+        f'{name}={value}'
+        for name in sorted(request.query_params)
+        for value in sorted(request.query_params.getlist(name))
+    )
+    return f'{request.resolver_match.view_name}:{request.path}?{query}'
+
+
+def get_content_etag(content):
+    return f'W/"{md5(content).hexdigest()}"'
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+
+
+class ConditionalResponseMixin:
+    """
+    ETag and Last-Modified validators answering conditional GET
+    and HEAD requests before the view queries and serializes objects.
+
+    Detail views are validated with `validator_fields` of the looked up row,
+    lists with `validator_aggregates` of the filtered queryset. Versions of
+    `validator_tags` (formatted with url kwargs and the row) and of
+    `get_validator_tags()` are added, so deleted rows and embedded objects
+    move the validators too. Last-Modified is the latest of datetime
+    validators and invalidations of the tags.
+
+    Responses cached by `CachedResponseMixin` keep validators of their
+    content, so they are validated without touching the database.
+
+    """
+
+    validator_fields = ('modified',)
+    validator_aggregates = {'modified': Max('modified')}
+    validator_tags = ()
+
+    @property
+    def is_detail_view(self):
+        return isinstance(self, mixins.RetrieveModelMixin)
+
+    def get_validators_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self.is_detail_view:
+            return queryset
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def get_validator_tags(self, row):
+        return {tag.format(**self.kwargs, **row) for tag in self.validator_tags}
+
+    def get_validators(self, request):
+        """
+        Return ETag and Last-Modified timestamp, `None` when
+        the object is not found, so the view raises 404 itself.
+
+        """
+
+        queryset = self.get_validators_queryset().order_by()
+        if self.is_detail_view:
+            row = queryset.values(*self.validator_fields).first()
+            if row is None:
+                return None
+        else:
+            row = queryset.aggregate(**self.validator_aggregates)
+
+        versions = response_cache.get_tag_versions(self.get_validator_tags(row), create=True)
+        validators = ';'.join(f'{name}={value}' for name, value in sorted({**row, **versions}.items()))
+        key = f'{get_request_key(request)}:{request.accepted_renderer.format}:{request.user.id}:{validators}'
+        last_modified = max([timegm(value.utctimetuple()) for value in row.values() if isinstance(value, datetime)] +
+                            [int(invalidated) for invalidated, _ in versions.values()])
+        return f'W/"{md5(key.encode()).hexdigest()}"', last_modified or None
+
+    def get(self, request, *args, **kwargs):
+        if getattr(self, 'is_response_cacheable', lambda request: False)(request):
+            return super().get(request, *args, **kwargs)
+
+        validators = self.get_validators(request)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None and request.method == 'HEAD':
+            response = Response()
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if 200 <= response.status_code < 400:
+            set_validators(response, etag, last_modified)
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Cache rendered JSON responses of anonymous GET requests.
+
+    The cache key is the view name, normalized path and sorted query params.
+    Entries are tagged with `cache_tags` formatted with url kwargs
+    and with `cache_object_tags` formatted with every serialized object,
+    signals of the models invalidate the tags. Tag versions are
+    snapshotted before the view runs, see `TaggedCache`.
+    Entries keep the ETag of their content and the time their tags were
+    snapshotted as Last-Modified, conditional requests of cached responses
+    are answered with 304.
+
+    """
+
+    cache_tags = ()
+    cache_object_tags = ()
+    cache_renderer_format = 'json'
+    cache_header = 'X-Cache'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.cached_objects = []
+
+    def get_serializer(self, *args, **kwargs):
+        if args and args[0] is not None:
+            instance = args[0]
+            if kwargs.get('many'):
+                self.cached_objects.extend(instance)
+            else:
+                self.cached_objects.append(instance)
+        return super().get_serializer(*args, **kwargs)
+
+    def is_response_cacheable(self, request):
+        return (request.method in ('GET', 'HEAD') and
+                not request.user.is_authenticated and
+                request.accepted_renderer.format == self.cache_renderer_format)
+
+    def get_cache_key(self, request):
+        return get_request_key(request)
+
+    def get_view_cache_tags(self):
+        return {tag.format(**self.kwargs) for tag in self.cache_tags}
+
+    def get_cache_tags(self):
+        tags = self.get_view_cache_tags()
+        tags.update(
+            tag.format(obj=SimpleNamespace(**obj) if isinstance(obj, dict) else obj)
+            for obj in self.cached_objects for tag in self.cache_object_tags
+        )
+        return tags
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        cached = response_cache.get(key)
+        if cached is not None:
+            content, content_type, etag, last_modified = cached
+            response = HttpResponse(content, content_type=content_type)
+            set_validators(response, etag, last_modified)
+            response[self.cache_header] = 'HIT'
+            return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+        snapshot = response_cache.snapshot(self.get_view_cache_tags())
+        response = super().get(request, *args, **kwargs)
+        response[self.cache_header] = 'MISS'
+        if response.status_code == status.HTTP_200_OK:
+            tags = self.get_cache_tags()
+
+            def cache_response(rendered):
+                etag, last_modified = get_content_etag(rendered.content), int(snapshot[0])
+                set_validators(rendered, etag, last_modified)
+                entry = (rendered.content, rendered['Content-Type'], etag, last_modified)
+                response_cache.set(key, entry, tags, snapshot)
+                return get_conditional_response(request, etag=etag, last_modified=last_modified, response=rendered)
+
+            response.add_post_render_callback(cache_response)
+        return response
+
+
+class ValuesListMixin:
+    """
+    Serve list pages as `values()` rows serialized by `values_serializer_class`.
+
+    Rows carry the serializer lookups, `values_fields` of the view
+    and key columns of the ordering, so keyset pagination works on them.
+
+    """
+
+    values_serializer_class = None
+    values_fields = ()
+
+    def get_values_queryset(self, queryset):
+        opts = queryset.model._meta
+        fields = list(self.values_serializer_class.values_fields) + list(self.values_fields)
+        fields.append(opts.pk.attname)
+        fields.extend(
+            KeysetPagination.get_keyset_field(opts, order.lstrip('-'))
+            for order in queryset.query.order_by
+        )
+        return queryset.values(*OrderedDict.fromkeys(fields))
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.get_values_queryset(queryset))
+
+    def get_serializer_class(self):
+        if self.request.method in ('GET', 'HEAD'):
+            return self.values_serializer_class
+        return super().get_serializer_class()
+
+
+class OptimizedQuerysetMixin:
+    """
+    Load only what `serializer_class` renders.
+
+    `only()`, `select_related()` and `prefetch_related()` of the view
+    queryset are derived from the serializer fields, `queryset_fields`
+    adds fields the view itself needs (permissions, lookups).
+
+    """
+
+    queryset_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.serializer_class is None:
+            return queryset
+        return optimize_queryset(queryset, self.serializer_class, self.queryset_fields)
+
+
+class CountStrategyAdminMixin:
+    """
+    Count admin changelists with the pagination count strategy
+    and skip the second count of the unfiltered queryset.
+    The strategy used is sent in `count_strategy_header`.
+
+    """
+
+    paginator = CountStrategyPaginator
+    show_full_result_count = False
+    count_strategy_header = 'X-Count-Strategy'
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, 'context_data', {}).get('cl')
+        if changelist is not None:
+            response[self.count_strategy_header] = changelist.paginator.used_count_strategy
+        return response
+
+
+class BatchDeleteMixin:
+    """
+    Destroy the object with its relations in batches, see `common.deletion`.
+
+    """
+
+    def perform_destroy(self, instance):
+        delete_objects(type(instance)._base_manager.filter(pk=instance.pk))
+
+
+def get_deleted_summary(modeladmin, request, queryset):
+    """
+    Return `model_count` and `perms_needed` of admin delete confirmations,
+    counted by `BatchDeleter` instead of collecting every related object.
+
+    """
+
+    model_count, perms_needed = {}, set()
+    for label, count in BatchDeleter().count(queryset).items():
+        model = apps.get_model(label)
+        opts = model._meta
+        if opts.auto_created:
+            continue
+        model_count[opts.verbose_name_plural] = count
+        codename = get_permission_codename('delete', opts)
+        if model in modeladmin.admin_site._registry and not request.user.has_perm(f'{opts.app_label}.{codename}'):
+            perms_needed.add(opts.verbose_name)
+    return model_count, perms_needed
+
+
+def batch_delete_selected(modeladmin, request, queryset):
+    """
+    `delete_selected` admin action confirming with related object counts
+    and deleting in batches.
+
+    """
+
+    opts = modeladmin.model._meta
+    if not modeladmin.has_delete_permission(request):
+        raise PermissionDenied
+    model_count, perms_needed = get_deleted_summary(modeladmin, request, queryset)
+
+    if request.POST.get('post'):
+        if perms_needed:
+            raise PermissionDenied
+        count = queryset.count()
+        if count:
+            for obj in queryset.iterator():
+                modeladmin.log_deletion(request, obj, str(obj))
+            delete_objects(queryset)
+            modeladmin.message_user(request, _('Successfully deleted %(count)d %(items)s.') % {
+                'count': count, 'items': model_ngettext(modeladmin.opts, count)
+            }, messages.SUCCESS)
+        return None
+
+    objects_name = model_ngettext(queryset)
+    context = dict(
+        modeladmin.admin_site.each_context(request),
+        title=_('Cannot delete %(name)s') % {'name': objects_name} if perms_needed else _('Are you sure?'),
+        objects_name=str(objects_name),
+        deletable_objects=[str(obj) for obj in queryset],
+        model_count=model_count.items(),
+        queryset=queryset,
+        perms_lacking=perms_needed,
+        protected=[],
+        opts=opts,
+        action_checkbox_name=helpers.ACTION_CHECKBOX_NAME,
+        media=modeladmin.media,
+    )
+    request.current_app = modeladmin.admin_site.name
+    return TemplateResponse(request, modeladmin.delete_selected_confirmation_template or [
+        f'admin/{opts.app_label}/{opts.model_name}/delete_selected_confirmation.html',
+        f'admin/{opts.app_label}/delete_selected_confirmation.html',
+        'admin/delete_selected_confirmation.html'
+    ], context)
+
+
+class BatchDeleteAdminMixin:
+    """
+    Delete objects with their relations in batches, see `common.deletion`.
+
+    Confirmation pages list related object counts instead of every related
+    object, the default pages collect all of them in memory.
+
+    """
+
+    def delete_model(self, request, obj):
+        delete_objects(type(obj)._base_manager.filter(pk=obj.pk))
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if 'delete_selected' in actions:
+            actions['delete_selected'] = (
+                batch_delete_selected, 'delete_selected', delete_selected.short_description
+            )
+        return actions
+
+    @csrf_protect_m
+    def delete_view(self, request, object_id, extra_context=None):
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            opts = self.model._meta
+            obj = self.get_object(request, unquote(object_id))
+            if not self.has_delete_permission(request, obj):
+                raise PermissionDenied
+            if obj is None:
+                return self._get_obj_does_not_exist_redirect(request, opts, object_id)
+
+            model_count, perms_needed = get_deleted_summary(
+                self, request, self.model._base_manager.filter(pk=obj.pk)
+            )
+            if request.POST:
+                if perms_needed:
+                    raise PermissionDenied
+                obj_display, obj_id = str(obj), obj.pk
+                self.log_deletion(request, obj, obj_display)
+                self.delete_model(request, obj)
+                return self.response_delete(request, obj_display, obj_id)
+
+            object_name = str(opts.verbose_name)
+            context = dict(
+                self.admin_site.each_context(request),
+                title=_('Cannot delete %(name)s') % {'name': object_name} if perms_needed else _('Are you sure?'),
+                object_name=object_name,
+                object=obj,
+                deleted_objects=[str(obj)],
+                model_count=model_count.items(),
+                perms_lacking=perms_needed,
+                protected=[],
+                opts=opts,
+                app_label=opts.app_label,
+                preserved_filters=self.get_preserved_filters(request),
+                is_popup=IS_POPUP_VAR in request.POST or IS_POPUP_VAR in request.GET,
+                to_field=None,
+                **(extra_context or {}),
+            )
+            return self.render_delete_form(request, context)
@@ -0,0 +1,97 @@
+import copy
+import pickle
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from model_utils import Choices
+from model_utils.fields import StatusField
+from model_utils.models import TimeStampedModel
+
+
+class CounterFieldsMixin:
+    """
+    Model mixin leaving denormalized `counter_fields` out of updates
+    of `save()`. Counters are changed by F() updates only, so saving
+    an instance loaded before a concurrent increment does not undo it.
+
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not (self._state.adding or args or kwargs.get('force_insert') or kwargs.get('update_fields')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class QueuedEmail(TimeStampedModel):
+    """
+    Outbound email stored by `common.mail.QueuedEmailBackend`
+    until the `send_queued_mail` command delivers it.
+
+    """
+
+    QUEUED = 'queued'
+    FAILED = 'failed'
+    STATUS = Choices(
+        ('queued', QUEUED, _(QUEUED.capitalize())),
+        ('failed', FAILED, _(FAILED.capitalize())),
+    )
+
+    subject = models.CharField(
+        _('Subject'), max_length=256,
+        help_text=_('Email Subject.')
+    )
+    recipients = models.TextField(
+        _('Recipients'),
+        help_text=_('Comma separated email addresses of all recipients.')
+    )
+    message = models.BinaryField(
+        _('Message'),
+        help_text=_('Pickled email message.')
+    )
+    status = StatusField(
+        _('Status'), default=QUEUED,
+        help_text=_('Delivery Status.')
+    )
+    attempts = models.PositiveSmallIntegerField(
+        _('Attempts'), default=0,
+        help_text=_('Number of failed delivery attempts.')
+    )
+    next_attempt = models.DateTimeField(
+        _('Next attempt'), default=timezone.now,
+        help_text=_('Email is not delivered before this time.')
+    )
+    last_error = models.TextField(
+        _('Last error'), blank=True,
+        help_text=_('Error of the last failed delivery attempt.')
+    )
+
+    class Meta:
+        verbose_name = _('Queued email')
+        verbose_name_plural = _('Queued emails')
+        ordering = ('next_attempt',)
+        indexes = (
+            models.Index(fields=['status', 'next_attempt']),
+        )
+
+    def __str__(self):
+        return self.subject
+
+    @classmethod
+    def from_message(cls, message):
+        message = copy.copy(message)
+        message.connection = None
+        return cls(
+            subject=str(message.subject)[:256],
+            recipients=', '.join(message.recipients()),
+            message=pickle.dumps(message, pickle.HIGHEST_PROTOCOL),
+        )
+
+    def get_message(self):
+        return pickle.loads(self.message)
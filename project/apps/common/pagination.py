@@ -1,19 +1,100 @@
+from base64 import (
+    b64decode,
+    b64encode,
+)
 from collections import OrderedDict
+from urllib import parse
 
+import coreapi
+import coreschema
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ValidationError,
+)
+from django.core.paginator import (
+    EmptyPage,
+    Paginator,
+)
+from django.db.models import (
+    F,
+    Q,
+)
+from django.db.models.fields.files import FieldFile
+from django.utils.encoding import force_text
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
+    BasePagination,
+    Cursor,
+    CursorPagination,
     PageNumberPagination as BasePageNumberPagination,
+    _reverse_ordering,
 )
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from common.counts import (
+    EXACT,
+    get_count,
+)
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator counting querysets with a count strategy
+    (`PAGINATION_COUNT_STRATEGY` unless `count_strategy` is set).
+
+    Only exact counts bound page numbers, with cached or estimated
+    counts any page is sliced and may come out short or empty.
+
+    """
+
+    count_strategy = None
+
+    @cached_property
+    def counted(self):
+        if not hasattr(self.object_list, 'query'):
+            return len(self.object_list), EXACT
+        return get_count(self.object_list, self.count_strategy)
+
+    @property
+    def count(self):
+        return self.counted[0]
+
+    @property
+    def used_count_strategy(self):
+        return self.counted[1]
+
+    @property
+    def count_is_exact(self):
+        return self.used_count_strategy == EXACT
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.count_is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
 
 
 class PageNumberPagination(BasePageNumberPagination):
     """
 
     Custom PageNumberPagination with additional data
-    like page_number_first and page_number_last
+    like page_number_first and page_number_last.
+    `count_strategy` tells how `count` was obtained.
 
     """
 
+    django_paginator_class = CountStrategyPaginator
     page_size_query_param = 'page_size'
     page_size_query_description = 'Results per page'
     max_page_size = 100
@@ -21,6 +102,7 @@ class PageNumberPagination(BasePageNumberPagination):
     def get_paginated_response(self, data):
         return Response(OrderedDict([
             ('count', self.page.paginator.count),
+            ('count_strategy', self.page.paginator.used_count_strategy),
             ('max_page_size', self.max_page_size),
             ('page_number_first', 1),
             ('page_number_last', self.page.paginator.num_pages),
@@ -29,3 +111,322 @@ class PageNumberPagination(BasePageNumberPagination):
             ('previous', self.get_previous_link()),
             ('results', data)
         ]))
+
+
+class KeysetPagination(CursorPagination):
+    """
+
+    Keyset pagination over the whole view ordering.
+
+    The opaque cursor keeps the values of every ordering field of the
+    boundary row (plus `pk` as a tie-breaker), so each page is a single
+    range query without OFFSET and without COUNT(*).
+    Relations in the ordering are paged by their key column.
+
+    """
+
+    page_size_query_param = 'page_size'
+    page_size_query_description = 'Results per page'
+    max_page_size = 100
+    ordering = ('-created',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+        self.nullable = self.get_nullable_fields(queryset.model._meta, self.ordering)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*self.get_order_by(ordering, self.nullable))
+
+        if self.cursor is not None:
+            if len(self.cursor.position) != len(ordering):
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(self.get_keyset_filter(ordering, self.cursor.position, self.nullable))
+
+        try:
+            results = list(queryset[:self.page_size + 1])
+        except (ValidationError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        self.page = results[:self.page_size]
+        has_following_page = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following_page
+        else:
+            self.has_next = has_following_page
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """
+        Return view ordering with relations replaced by their key columns
+        and with `pk` appended, so every row has a unique position.
+
+        """
+
+        opts = queryset.model._meta
+        ordering = []
+        for order in self.get_ordering(request, queryset, view):
+            prefix, field_name = ('-', order[1:]) if order.startswith('-') else ('', order)
+            ordering.append(f'{prefix}{self.get_keyset_field(opts, field_name)}')
+
+        if not {order.lstrip('-') for order in ordering} & {'pk', opts.pk.attname}:
+            prefix = '-' if ordering and ordering[0].startswith('-') else ''
+            ordering.append(f'{prefix}{opts.pk.attname}')
+        return tuple(ordering)
+
+    @staticmethod
+    def get_keyset_field(opts, field_name):
+        """
+        Return key column of ordering field: `pk` and relations
+        are replaced by their attnames.
+
+        """
+
+        if field_name == 'pk':
+            return opts.pk.attname
+        if '__' not in field_name:
+            try:
+                field = opts.get_field(field_name)
+            except FieldDoesNotExist:
+                pass
+            else:
+                if field.many_to_one:
+                    return field.attname
+        return field_name
+
+    @staticmethod
+    def get_nullable_fields(opts, ordering):
+        """
+        Return names of ordering fields which may be NULL,
+        following relations. Annotations are taken as not NULL.
+
+        """
+
+        nullable = set()
+        for order in ordering:
+            field_name, field_opts = order.lstrip('-'), opts
+            for name in field_name.split('__'):
+                try:
+                    field = field_opts.get_field(name)
+                except FieldDoesNotExist:
+                    break
+                if field.null:
+                    nullable.add(field_name)
+                    break
+                if not field.is_relation:
+                    break
+                field_opts = field.related_model._meta
+        return nullable
+
+    @staticmethod
+    def get_order_by(ordering, nullable=()):
+        """
+        Return `order_by()` arguments sorting NULLs as the largest values,
+        as PostgreSQL does by default, so the keyset filter agrees
+        with the ordering on every backend.
+
+        """
+
+        order_by = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if field_name not in nullable:
+                order_by.append(order)
+            elif order.startswith('-'):
+                order_by.append(F(field_name).desc(nulls_first=True))
+            else:
+                order_by.append(F(field_name).asc(nulls_last=True))
+        return order_by
+
+    @staticmethod
+    def get_keyset_filter(ordering, position, nullable=()):
+        """
+        Expand row comparison `(a, b, pk) > (x, y, z)` into
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)`
+        with the comparison direction taken from each ordering field.
+        NULL values (`None` in the position) sort after all other values.
+
+        """
+
+        keyset_filter = Q()
+        equal = Q()
+        for order, value in zip(ordering, position):
+            field_name = order.lstrip('-')
+            descending = order.startswith('-')
+            if value is None:
+                # Only non-NULL values follow NULL in descending order.
+                if descending:
+                    keyset_filter |= equal & Q(**{f'{field_name}__isnull': False})
+                equal &= Q(**{f'{field_name}__isnull': True})
+                continue
+
+            following = Q(**{f'{field_name}__{"lt" if descending else "gt"}': value})
+            if field_name in nullable and not descending:
+                following |= Q(**{f'{field_name}__isnull': True})
+            keyset_filter |= equal & following
+            equal &= Q(**{field_name: value})
+        return keyset_filter
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_link_after(self, base_url, instance, ordering):
+        """
+        Return link to the page following given instance,
+        for lists embedded outside of the paginated view.
+
+        """
+
+        self.base_url = base_url
+        position = self._get_position_from_instance(instance, ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def encode_cursor(self, cursor):
+        """
+        Encode the position with indexes of its NULL values in `n`,
+        as any string is a possible value.
+
+        """
+
+        tokens = {'p': ['' if value is None else value for value in cursor.position]}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        nulls = [str(index) for index, value in enumerate(cursor.position) if value is None]
+        if nulls:
+            tokens['n'] = nulls
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = tokens['p']
+            for index in tokens.get('n', ()):
+                position[int(index)] = None
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[field_name]
+            else:
+                value = instance
+                for attr in field_name.split('__'):
+                    value = getattr(value, attr)
+                if isinstance(value, FieldFile):
+                    value = value.name
+            position.append(None if value is None else str(value))
+        return position
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('max_page_size', self.max_page_size),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class SwitchablePagination(BasePagination):
+    """
+
+    Page number pagination by default.
+    Clients switch a request to keyset pagination with `?pagination=cursor`,
+    `next` and `previous` links of that mode keep the cursor, so following them
+    stays in keyset mode.
+
+    """
+
+    KEYSET = 'cursor'
+    PAGE_NUMBER = 'page'
+
+    pagination_query_param = 'pagination'
+    pagination_query_description = f'Pagination mode. Available values: {PAGE_NUMBER}, {KEYSET}'
+
+    page_number_pagination_class = PageNumberPagination
+    keyset_pagination_class = KeysetPagination
+
+    def __init__(self):
+        self.page_number_paginator = self.page_number_pagination_class()
+        self.keyset_paginator = self.keyset_pagination_class()
+        self.paginator = self.page_number_paginator
+
+    @property
+    def display_page_controls(self):
+        return self.paginator.display_page_controls
+
+    def is_keyset_requested(self, request):
+        return (request.query_params.get(self.pagination_query_param) == self.KEYSET or
+                self.keyset_paginator.cursor_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_requested(request):
+            self.paginator = self.keyset_paginator
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        assert coreapi is not None, 'coreapi must be installed to use `get_schema_fields()`'
+        assert coreschema is not None, 'coreschema must be installed to use `get_schema_fields()`'
+        fields = [
+            coreapi.Field(
+                name=self.pagination_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Pagination',
+                    description=force_text(self.pagination_query_description)
+                )
+            )
+        ]
+        field_names = {self.pagination_query_param}
+        for paginator in (self.page_number_paginator, self.keyset_paginator):
+            for field in paginator.get_schema_fields(view):
+                if field.name not in field_names:
+                    field_names.add(field.name)
+                    fields.append(field)
+        return fields
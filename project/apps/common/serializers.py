@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import (
+    Manager,
+    Prefetch,
+)
+from model_utils import FieldTracker
+from rest_framework.serializers import (
+    BaseSerializer,
+    ListSerializer,
+)
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer of `values()` rows for list endpoints.
+
+    Output shape is declared once in `fields` as `(name, source)` pairs,
+    where source is a `values()` lookup or a nested `ValuesSerializer` class
+    (its lookups are prefixed with `name__`, or with `relation__` for
+    `(name, serializer, relation)` triples).
+    `converters` turn raw values of named fields into the representation
+    of the equivalent model serializer field.
+
+    Everything is resolved when the class is created, serializing a row
+    is a flat loop without field instances or model hydration.
+
+    """
+
+    fields = ()
+    converters = {}
+
+    values_fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.plan = cls.compile()
+        cls.values_fields = tuple(cls.get_lookups(cls.plan))
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def compile(cls, prefix=''):
+        plan = []
+        for name, source, *relation in cls.fields:
+            if isinstance(source, type) and issubclass(source, ValuesSerializer):
+                nested_prefix = f'{prefix}{relation[0] if relation else name}__'
+                plan.append((name, None, None, source.compile(nested_prefix)))
+            else:
+                plan.append((name, f'{prefix}{source}', cls.converters.get(name), None))
+        return plan
+
+    @classmethod
+    def get_lookups(cls, plan):
+        for name, lookup, converter, nested in plan:
+            if nested is not None:
+                yield from cls.get_lookups(nested)
+            else:
+                yield lookup
+
+    @classmethod
+    def represent(cls, row, plan):
+        data = OrderedDict()
+        for name, lookup, converter, nested in plan:
+            if nested is not None:
+                data[name] = cls.represent(row, nested)
+            elif converter is not None:
+                data[name] = converter(row[lookup])
+            else:
+                data[name] = row[lookup]
+        return data
+
+    def to_representation(self, row):
+        return self.represent(row, self.plan)
+
+    @property
+    def data(self):
+        if self.many:
+            return [self.represent(row, self.plan) for row in self.instance]
+        return self.represent(self.instance, self.plan)
+
+
+def load_relations(serializer, instances):
+    """
+    Set forward relations rendered by nested serializers with `Meta.loader`
+    on all instances, with one `loader.get_many()` per relation.
+
+    """
+
+    for field in serializer.fields.values():
+        loader = getattr(getattr(field, 'Meta', None), 'loader', None)
+        if loader is None or field.write_only or len(field.source_attrs) != 1:
+            continue
+        for model_field in {type(instance)._meta.get_field(field.source) for instance in instances}:
+            cache_name = model_field.get_cache_name()
+            pending = [instance for instance in instances if not hasattr(instance, cache_name)]
+            related = loader.get_many({getattr(instance, model_field.attname) for instance in pending})
+            for instance in pending:
+                related_object = related.get(getattr(instance, model_field.attname))
+                if related_object is not None:
+                    setattr(instance, cache_name, related_object)
+
+
+class LoadedRelationSerializerMixin:
+    """
+    Nested serializer of a relation loaded with `Meta.loader` instead
+    of a join, `loader.get_many(ids)` returns related objects by id.
+
+    """
+
+    def get_attribute(self, instance):
+        load_relations(self.parent, [instance])
+        return super().get_attribute(instance)
+
+
+class LoadedRelationListSerializer(ListSerializer):
+    """
+    Load relations of `LoadedRelationSerializerMixin` fields of all items at once.
+
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, Manager) else data)
+        load_relations(self.child, items)
+        return super().to_representation(items)
+
+
+def get_tracked_fields(model):
+    """
+    Return fields watched by `FieldTracker`s of the model, deferring them
+    breaks the tracker, so they are always loaded.
+
+    """
+
+    return {field for value in vars(model).values()
+            if isinstance(value, FieldTracker) for field in value.fields}
+
+
+def get_queryset_plan(serializer, model, prefix=''):
+    """
+    Walk serializer fields and return `only()` fields, `select_related()`
+    lookups and `Prefetch` objects needed to render them.
+
+    Forward relations rendered by nested serializers are joined, unless
+    the nested serializer has a `Meta.loader`, see `LoadedRelationSerializerMixin`.
+    Reverse and many-to-many relations are prefetched with their own plan.
+    Fields of properties and method fields cannot be resolved, they
+    need `Meta.queryset_fields` on the serializer; without it every
+    field of the model is loaded.
+
+    """
+
+    opts = model._meta
+    meta = getattr(serializer, 'Meta', None)
+    fields = {opts.pk.name} | get_tracked_fields(model) | set(getattr(meta, 'queryset_fields', ()))
+    hinted = hasattr(meta, 'queryset_fields')
+    restricted = True
+    only, select_related, prefetch = [], [], []
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        nested = field.child if isinstance(field, ListSerializer) else field
+        try:
+            model_field = opts.get_field(field.source_attrs[0]) if field.source != '*' else None
+        except FieldDoesNotExist:
+            model_field = None
+        if model_field is None:
+            restricted = restricted and hinted
+            continue
+
+        if not model_field.is_relation or not isinstance(nested, BaseSerializer):
+            fields.add(model_field.name)
+            if model_field.is_relation and not model_field.concrete:
+                prefetch.append(Prefetch(f'{prefix}{model_field.name}'))
+        elif model_field.concrete and getattr(getattr(nested, 'Meta', None), 'loader', None) is not None:
+            fields.add(model_field.name)
+        elif model_field.concrete and not model_field.many_to_many:
+            fields.add(model_field.name)
+            select_related.append(f'{prefix}{model_field.name}')
+            nested_only, nested_select_related, nested_prefetch = get_queryset_plan(
+                nested, model_field.related_model, f'{prefix}{model_field.name}__'
+            )
+            only.extend(nested_only)
+            select_related.extend(nested_select_related)
+            prefetch.extend(nested_prefetch)
+        else:
+            remote_fields = () if model_field.many_to_many else (model_field.field.name,)
+            prefetch.append(Prefetch(
+                f'{prefix}{model_field.name}',
+                queryset=optimize_queryset(
+                    model_field.related_model._default_manager.all(), type(nested), remote_fields
+                ),
+            ))
+
+    if not restricted:
+        fields.update(field.name for field in opts.concrete_fields)
+    only.extend(f'{prefix}{name}' for name in sorted(fields))
+    return only, select_related, prefetch
+
+
+@lru_cache(maxsize=None)
+def get_serializer_queryset_plan(serializer_class, extra_fields=()):
+    serializer = serializer_class()
+    only, select_related, prefetch = get_queryset_plan(serializer, serializer.Meta.model)
+    return only + list(extra_fields), select_related, prefetch
+
+
+def optimize_queryset(queryset, serializer_class, extra_fields=()):
+    """
+    Apply `only()`, `select_related()` and `prefetch_related()`
+    derived from serializer fields to the queryset.
+
+    """
+
+    only, select_related, prefetch = get_serializer_queryset_plan(serializer_class, tuple(extra_fields))
+    queryset = queryset.only(*only)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
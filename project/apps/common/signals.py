@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by `common.deletion.BatchDeleter` once per chunk of rows, before the rows
+# and their relations are deleted. Models with receivers of this signal do not
+# get instance `pre_delete` / `post_delete` from the deleter.
+pre_batch_delete = Signal(providing_args=['queryset', 'using'])
@@ -1,14 +1,30 @@
-import sqlparse
+from functools import lru_cache
 
 from django.utils.log import ServerFormatter
-from pygments import formatters, highlight, lexers
 
 TIME_CRIT = 0.2
 TIME_WARN = 0.05
 TIME_FORMAT = u'\x1b[0;30;{bgcolor}m {duration:.3f}s \x1b[0m\n{msg}'
 
-LEXER = lexers.SqlLexer()
-FORMATTER = formatters.Terminal256Formatter(style='monokai')
+
+@lru_cache(maxsize=None)
+def get_highlighter():
+    """
+    sqlparse and pygments are loaded when the first query is logged,
+    not by every process configuring logging.
+
+    """
+
+    import sqlparse
+    from pygments import formatters, highlight, lexers
+
+    lexer, formatter = lexers.SqlLexer(), formatters.Terminal256Formatter(style='monokai')
+
+    def highlight_sql(sql):
+        sql = sqlparse.format(sql, reindent=True, keyword_case='upper')
+        return highlight(sql, lexer, formatter)
+
+    return highlight_sql
 
 
 class SqlFormatter(ServerFormatter):
@@ -20,9 +36,8 @@ class SqlFormatter(ServerFormatter):
         except AttributeError:
             return super(SqlFormatter, self).format(record)
 
-        sql = sqlparse.format(sql, reindent=True, keyword_case='upper')
         bg_color = 41 if duration > TIME_CRIT else 43 if duration > TIME_WARN else 42
 
         return TIME_FORMAT.format(bgcolor=bg_color,
                                   duration=duration,
-                                  msg=highlight(sql, LEXER, FORMATTER))
+                                  msg=get_highlighter()(sql))
@@ -0,0 +1,137 @@
+import time
+from abc import (
+    ABCMeta,
+    abstractmethod,
+)
+
+from django.conf import settings
+from django.core.cache import (
+    DEFAULT_CACHE_ALIAS,
+    caches,
+)
+from rest_framework.throttling import BaseThrottle
+
+from common.utils import get_client_ip
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """
+    Number of requests and window seconds of a `'100/min'` like rate.
+
+    """
+
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle, metaclass=ABCMeta):
+    """
+    Throttle with a sliding window approximated by two fixed windows.
+
+    Requests of the previous window count in proportion to the part
+    of it still in the sliding window. Every check is one atomic increment
+    of the current window counter and one read of the previous one.
+    Denied requests are counted too unless `count_denied` is off,
+    then they are subtracted again.
+
+    The rate is read from `throttle_rates` of the view by `kind`,
+    views without a rate of the kind are not throttled, no view is
+    throttled with `THROTTLE_ENABLED` off.
+
+    """
+
+    kind = None
+    count_denied = True
+    cache_alias = DEFAULT_CACHE_ALIAS
+    cache_prefix = 'throttle'
+
+    def __init__(self):
+        self.duration = None
+        self.now = None
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @abstractmethod
+    def get_ident(self, request, view):
+        """
+        Return what requests are counted by, `None` for requests not throttled.
+
+        """
+
+    def make_key(self, request, view, ident, window):
+        view_name = getattr(request.resolver_match, 'view_name', None) or view.__class__.__name__
+        return f'{self.cache_prefix}:{self.kind}:{view_name}:{ident}:{window}'
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        rate = getattr(view, 'throttle_rates', {}).get(self.kind)
+        ident = self.get_ident(request, view) if rate else None
+        if ident is None:
+            return True
+
+        num_requests, self.duration = parse_rate(rate)
+        self.now = time.time()
+        window = int(self.now // self.duration)
+        key = self.make_key(request, view, ident, window)
+        self.cache.add(key, 0, self.duration * 2)
+        try:
+            current = self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            self.cache.set(key, 1, self.duration * 2)
+            current = 1
+        previous = self.cache.get(self.make_key(request, view, ident, window - 1), 0)
+        elapsed = self.now % self.duration / self.duration
+        allowed = previous * (1 - elapsed) + current <= num_requests
+        if not allowed and not self.count_denied:
+            try:
+                self.cache.decr(key)
+            except ValueError:
+                pass
+        return allowed
+
+    def wait(self):
+        return self.duration - self.now % self.duration
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Requests of every authenticated user.
+
+    """
+
+    kind = 'user'
+
+    def get_ident(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Requests from every client IP address.
+
+    """
+
+    kind = 'ip'
+
+    def get_ident(self, request, view):
+        return get_client_ip(request)
+
+
+class ViewSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    All requests of the view. Denied requests are not counted,
+    so clients retrying early cannot keep the view denied for everyone.
+
+    """
+
+    kind = 'view'
+    count_denied = False
+
+    def get_ident(self, request, view):
+        return 'all'
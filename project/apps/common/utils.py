@@ -1,5 +1,6 @@
 from django.db.models import QuerySet
 from django.shortcuts import _get_queryset
+from rest_framework.settings import api_settings
 
 
 def get_object_or_none(klass, *args, **kwargs):
@@ -28,9 +29,16 @@ def get_object_or_none(klass, *args, **kwargs):
 
 
 def get_client_ip(request):
+    """
+    Return the client address added to X-Forwarded-For by the first of
+    `NUM_PROXIES` trusted proxies, entries before it are sent by the client.
+    Without proxies the client is the remote address.
+
+    """
+
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+    num_proxies = api_settings.NUM_PROXIES
+    if not (x_forwarded_for and num_proxies):
+        return request.META.get('REMOTE_ADDR')
+    addresses = x_forwarded_for.split(',')
+    return addresses[-min(num_proxies, len(addresses))].strip()
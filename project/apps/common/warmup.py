@@ -0,0 +1,76 @@
+import gc
+import resource
+
+from django.urls import (
+    RegexURLPattern,
+    RegexURLResolver,
+    get_resolver,
+)
+
+
+def iter_views(resolver=None):
+    """
+    Yield view callables of all URL patterns, included URLconfs are imported.
+
+    """
+
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, RegexURLResolver):
+            yield from iter_views(pattern)
+        elif isinstance(pattern, RegexURLPattern):
+            yield pattern.callback
+
+
+def warm_up():
+    """
+    Import every URLconf, view and serializer and build the serializer fields,
+    so workers forked afterwards share them instead of loading them on their
+    first requests. Returns the number of warmed views.
+
+    """
+
+    views = list(iter_views())
+    for view in views:
+        view_class = getattr(view, 'cls', None)
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        if serializer_class is not None:
+            try:
+                serializer_class().fields
+            except Exception:
+                # Serializers needing a context or a request are imported at least.
+                pass
+    return len(views)
+
+
+def freeze_heap():
+    """
+    Move all objects to the permanent generation of the garbage collector,
+    so collections in forked workers do not touch and copy pre-fork pages.
+    `gc.freeze()` is available since Python 3.7, older versions only collect.
+
+    """
+
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def get_memory_usage():
+    """
+    Memory of this process in kilobytes: `rss`, and `pss` and `private`
+    where Linux reports them, which count shared pages by the share
+    of this process and not at all.
+
+    """
+
+    usage = {'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    try:
+        with open('/proc/self/smaps_rollup') as smaps:
+            # The first line is the address range of the rollup.
+            values = dict(line.split(':', 1) for line in smaps.readlines()[1:])
+    except OSError:
+        return usage
+    usage['rss'] = int(values['Rss'].split()[0])
+    usage['pss'] = int(values['Pss'].split()[0])
+    usage['private'] = sum(int(values[name].split()[0]) for name in ('Private_Clean', 'Private_Dirty'))
+    return usage
@@ -4,17 +4,22 @@ from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext as _
 
+from common.mixins import (
+    BatchDeleteAdminMixin,
+    CountStrategyAdminMixin,
+)
 from posts.models import Post
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BatchDeleteAdminMixin, CountStrategyAdminMixin, admin.ModelAdmin):
     list_display = (
-        'id', 'title', 'author_link', 'status'
+        'id', 'title', 'author_link', 'status',
+        'comments_count',
     )
     list_display_links = ('title',)
     readonly_fields = (
-        'status_changed',
+        'status_changed', 'comments_count',
         'created', 'modified',
     )
     search_fields = (
@@ -7,20 +7,58 @@ from rest_framework.filters import (
     SearchFilter,
     OrderingFilter,
 )
+from rest_framework.settings import api_settings
 
 from posts.models import Post
+from posts.search import (
+    SEARCH_RANK,
+    get_search_backend,
+)
 
 
 class PostsSearchFilter(SearchFilter):
-    pass
+    """
+    Full-text search ranked by relevance if the database supports it,
+    plain `icontains` search otherwise. Explicit ordering of the request
+    takes precedence over the rank.
+
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = getattr(view, 'search_fields', None)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        backend = get_search_backend(queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = backend.filter_queryset(queryset, search_terms, search_fields)
+        if SEARCH_RANK in queryset.query.annotations and api_settings.ORDERING_PARAM not in request.query_params:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by(f'-{SEARCH_RANK}', *ordering)
+        return queryset
 
 
 class PostsOrderingFilter(OrderingFilter):
+    """
+    Results of full-text search are ordered by relevance,
+    unless ordering is given explicitly.
+
+    """
+
     ordering_fields = ('id', 'title', 'author')
     ordering_description = _(
         f'Which field to use when ordering the results. Available values: {", ".join(ordering_fields)}'
     )
 
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if SEARCH_RANK in queryset.query.annotations and not request.query_params.get(self.ordering_param):
+            ordering = (f'-{SEARCH_RANK}',) + tuple(ordering or ())
+        return ordering
+
 
 class MyPostsStatusFilter(BaseFilterBackend):
     filter_name = 'status'
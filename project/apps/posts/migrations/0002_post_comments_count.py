@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.11 on 2026-10-18 13:43
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comments_count(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('comments', 'Comment')
+    comments_count = Comment.objects.order_by().values_list('post_id').annotate(total=Count('id'))
+    for post_id, total in comments_count:
+        Post.objects.filter(id=post_id).update(comments_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+        ('comments', '0001_initial'),
+        # comments of the fake data are counted too
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of post comments.', verbose_name='Comments count'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
@@ -13,6 +13,7 @@ from model_utils.models import (
     StatusModel,
 )
 
+from common.models import CounterFieldsMixin
 from common.validators import ImageSizeValidator
 
 User = get_user_model()
@@ -22,7 +23,7 @@ def get_blog_image_upload_path(instance, filename):
     return os.path.join(*('posts', 'images', str(instance.pk), filename))
 
 
-class Post(TimeStampedModel, StatusModel):
+class Post(CounterFieldsMixin, TimeStampedModel, StatusModel):
     DRAFT = 'draft'
     PUBLISHED = 'published'
     STATUS = Choices(
@@ -45,7 +46,7 @@ class Post(TimeStampedModel, StatusModel):
         help_text=_('Post Head Image.')
     )
     author = models.ForeignKey(
-        to=User, on_delete=CASCADE,
+        to=User, on_delete=CASCADE, db_index=False,
         verbose_name=_('Author'), related_name='posts',
         help_text=_('Post Author.')
     )
@@ -57,18 +58,38 @@ class Post(TimeStampedModel, StatusModel):
         _('Status'), default=PUBLISHED,
         help_text=_('Post Status.')
     )
+    comments_count = models.PositiveIntegerField(
+        _('Comments count'), default=0, editable=False,
+        help_text=_('Denormalized number of post comments.')
+    )
+
+    counter_fields = ('comments_count',)
 
     class Meta:
         verbose_name = _('Post')
         verbose_name_plural = _('Posts')
         ordering = ('-created',)
         indexes = (
-            models.Index(fields=['title', 'body']),
+            models.Index(fields=['status', '-created']),
+            models.Index(fields=['author', '-created']),
         )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the loaded author, so `posts_count` of users is moved
+        when the author changes. `FieldTracker` is not used because
+        it cannot handle the deferred markup body.
+
+        """
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+        return instance
+
     @property
     def image_url(self):
         return build_absolute_uri(None, self.image.url) if self.image else None
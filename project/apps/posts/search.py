@@ -0,0 +1,232 @@
+import re
+from abc import (
+    ABCMeta,
+    abstractmethod,
+)
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+    transaction,
+)
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from posts.models import Post
+
+SEARCH_RANK = 'search_rank'
+
+
+class BaseSearchBackend(metaclass=ABCMeta):
+    """
+    Full-text search document of posts, kept in a separate table.
+
+    Document columns are mapped from `search_fields` of the views,
+    title is weighted above author and body.
+
+    """
+
+    columns = {
+        'title': 'title',
+        'author__username': 'author',
+        'body': 'body',
+    }
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def table_exists(self):
+        with self.connection.cursor() as cursor:
+            return self.table_name in self.connection.introspection.table_names(cursor)
+
+    @staticmethod
+    def get_words(terms):
+        return [word for term in terms for word in re.findall(r'\w+', term)]
+
+    def get_columns(self, search_fields):
+        return [self.columns[field.lstrip('^=@$')] for field in search_fields
+                if field.lstrip('^=@$') in self.columns]
+
+    def create_index(self):
+        """
+        Create search table if it does not exist yet and fill it.
+        Returns `True` if the table was created.
+
+        """
+
+        if self.table_exists():
+            return False
+        with transaction.atomic(using=self.connection.alias):
+            for sql in self.create_sql:
+                self.execute(sql)
+            self.rebuild()
+        return True
+
+    def rebuild(self, chunk_size=1000):
+        """
+        Reindex all posts in chunks of primary keys.
+        Returns the number of indexed posts.
+
+        """
+
+        indexed, last_id = 0, 0
+        while True:
+            with transaction.atomic(using=self.connection.alias):
+                ids = list(Post.objects.using(self.connection.alias).filter(
+                    id__gt=last_id
+                ).order_by('id').values_list('id', flat=True)[:chunk_size])
+                if not ids:
+                    self.execute(self.delete_tail_sql, [last_id])
+                    return indexed
+                self.execute(self.delete_range_sql, [last_id, ids[-1]])
+                indexed += self.execute(self.insert_range_sql, [last_id, ids[-1]])
+                last_id = ids[-1]
+
+    def index_post(self, post):
+        self.delete_post(post.id)
+        self.execute(self.insert_sql, [post.id, post.title, post.body.raw, post.author.username])
+
+    def delete_post(self, post_id):
+        self.execute(self.delete_sql, [post_id])
+
+    def delete_posts(self, post_ids):
+        if post_ids:
+            self.execute(self.delete_many_sql.format(ids=', '.join(['%s'] * len(post_ids))), post_ids)
+
+    @abstractmethod
+    def filter_queryset(self, queryset, terms, search_fields):
+        """
+        Return posts of the queryset matching all words of the terms
+        in the columns of `search_fields`, annotated with `SEARCH_RANK`.
+
+        """
+
+
+class SqliteSearchBackend(BaseSearchBackend):
+    """
+    FTS5 shadow table, rowid is the post id.
+
+    The table is joined to posts with a single MATCH per statement,
+    its `rank` column is configured as weighted bm25 at creation.
+
+    """
+
+    table_name = 'posts_post_fts'
+
+    create_sql = (
+        """CREATE VIRTUAL TABLE posts_post_fts USING fts5(
+               title, body, author, tokenize='porter unicode61'
+           )""",
+        """INSERT INTO posts_post_fts (posts_post_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')""",
+    )
+    insert_sql = """INSERT INTO posts_post_fts (rowid, title, body, author) VALUES (%s, %s, %s, %s)"""
+    delete_sql = """DELETE FROM posts_post_fts WHERE rowid = %s"""
+    delete_many_sql = """DELETE FROM posts_post_fts WHERE rowid IN ({ids})"""
+    delete_range_sql = """DELETE FROM posts_post_fts WHERE rowid > %s AND rowid <= %s"""
+    delete_tail_sql = """DELETE FROM posts_post_fts WHERE rowid > %s"""
+    insert_range_sql = """INSERT INTO posts_post_fts (rowid, title, body, author)
+                          SELECT posts_post.id, posts_post.title, posts_post.body, users_user.username
+                          FROM posts_post INNER JOIN users_user ON users_user.id = posts_post.author_id
+                          WHERE posts_post.id > %s AND posts_post.id <= %s"""
+
+    def get_match_query(self, words, columns):
+        column_filter = '{%s}: ' % ' '.join(columns)
+        return ' AND '.join(
+            '%s"%s"*' % (column_filter, word.replace('"', '""')) for word in words
+        )
+
+    def filter_queryset(self, queryset, terms, search_fields):
+        words, columns = self.get_words(terms), self.get_columns(search_fields)
+        if not words or not columns:
+            return queryset
+        return queryset.extra(
+            tables=[self.table_name],
+            where=['posts_post_fts.rowid = posts_post.id', 'posts_post_fts MATCH %s'],
+            params=[self.get_match_query(words, columns)],
+        ).annotate(**{
+            SEARCH_RANK: RawSQL('-posts_post_fts.rank', (), output_field=FloatField())
+        })
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    tsvector document table with GIN index, columns are stored as weights.
+
+    """
+
+    table_name = 'posts_postsearch'
+    config = 'english'
+    column_weights = {
+        'title': 'A',
+        'author': 'B',
+        'body': 'C',
+    }
+
+    create_sql = (
+        """CREATE TABLE posts_postsearch (
+               post_id integer NOT NULL PRIMARY KEY
+                   REFERENCES posts_post (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+               document tsvector NOT NULL
+           )""",
+        """CREATE INDEX posts_postsearch_document_idx ON posts_postsearch USING GIN (document)""",
+    )
+    document_sql = (f"""setweight(to_tsvector('{config}', {{title}}), 'A') ||
+                        setweight(to_tsvector('{config}', {{body}}), 'C') ||
+                        setweight(to_tsvector('{config}', {{author}}), 'B')""")
+    insert_sql = ("""INSERT INTO posts_postsearch (post_id, document) VALUES (%s, """ +
+                  document_sql.format(title='%s', body='%s', author='%s') + """)""")
+    delete_sql = """DELETE FROM posts_postsearch WHERE post_id = %s"""
+    delete_many_sql = """DELETE FROM posts_postsearch WHERE post_id IN ({ids})"""
+    delete_range_sql = """DELETE FROM posts_postsearch WHERE post_id > %s AND post_id <= %s"""
+    delete_tail_sql = """DELETE FROM posts_postsearch WHERE post_id > %s"""
+    insert_range_sql = ("""INSERT INTO posts_postsearch (post_id, document)
+                           SELECT posts_post.id, """ +
+                        document_sql.format(title='posts_post.title', body='posts_post.body',
+                                            author='users_user.username') + """
+                           FROM posts_post INNER JOIN users_user ON users_user.id = posts_post.author_id
+                           WHERE posts_post.id > %s AND posts_post.id <= %s""")
+
+    def get_ts_query(self, words, columns):
+        weights = ''.join(sorted(self.column_weights[column] for column in columns))
+        return ' & '.join(f'{word}:*{weights}' for word in words)
+
+    def filter_queryset(self, queryset, terms, search_fields):
+        words, columns = self.get_words(terms), self.get_columns(search_fields)
+        if not words or not columns:
+            return queryset
+        ts_query = self.get_ts_query(words, columns)
+        return queryset.filter(
+            id__in=RawSQL(
+                'SELECT post_id FROM posts_postsearch WHERE document @@ to_tsquery(%s, %s)',
+                (self.config, ts_query)
+            )
+        ).annotate(**{
+            SEARCH_RANK: RawSQL(
+                'SELECT ts_rank(document, to_tsquery(%s, %s)) FROM posts_postsearch '
+                'WHERE posts_postsearch.post_id = posts_post.id',
+                (self.config, ts_query), output_field=FloatField()
+            )
+        })
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SqliteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """
+    Return full-text search backend of the database or `None`
+    if the database has no supported full-text search.
+
+    """
+
+    connection = connections[using]
+    backend_class = SEARCH_BACKENDS.get(connection.vendor)
+    return backend_class(connection) if backend_class else None
@@ -1,8 +1,22 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 
 from comments.serializers import CommentDetailsSerializer
+from common.pagination import (
+    KeysetPagination,
+    SwitchablePagination,
+)
+from common.serializers import (
+    LoadedRelationListSerializer,
+    ValuesSerializer,
+    optimize_queryset,
+)
 from posts.models import Post
-from users.serializers import UserSimpleSerializer
+from users.serializers import (
+    UserSimpleSerializer,
+    UserSimpleValuesSerializer,
+)
 
 
 class PostSimpleSerializer(serializers.ModelSerializer):
@@ -13,11 +27,26 @@ class PostSimpleSerializer(serializers.ModelSerializer):
         fields = ('id', 'title', 'created', 'updated')
 
 
+class PostSimpleValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('created', 'created'),
+        ('updated', 'modified'),
+    )
+    converters = {
+        'created': serializers.DateTimeField().to_representation,
+    }
+
+
 class PostDetailsSerializer(serializers.ModelSerializer):
     author = UserSimpleSerializer()
     updated = serializers.ReadOnlyField(source='modified')
-    comments_total = serializers.SerializerMethodField()
+    comments_total = serializers.ReadOnlyField(source='comments_count')
     comments = serializers.SerializerMethodField()
+    comments_next = serializers.SerializerMethodField()
+
+    comments_ordering = ('-created', '-id')
 
     class Meta:
         model = Post
@@ -25,31 +54,72 @@ class PostDetailsSerializer(serializers.ModelSerializer):
                   'image', 'author',
                   'status', 'allow_comments',
                   'created', 'updated',
-                  'comments_total', 'comments')
-
-    @staticmethod
-    def get_comments_total(obj):
-        return getattr(obj, 'comments_total', 0)
-
-    @staticmethod
-    def get_comments(obj):
-        return CommentDetailsSerializer(obj.comments.all(), many=True).data
+                  'comments_total', 'comments', 'comments_next')
+        queryset_fields = ('body_markup_type', '_body_rendered')
+        list_serializer_class = LoadedRelationListSerializer
+
+    @classmethod
+    def get_embedded_comments(cls, obj):
+        """
+        Return the newest `POST_DETAIL_COMMENTS_LIMIT` comments of the post
+        and one more to know if the rest should be linked.
+
+        """
+
+        if not hasattr(obj, '_embedded_comments'):
+            obj._embedded_comments = list(optimize_queryset(
+                obj.comments.all(), CommentDetailsSerializer
+            ).order_by(*cls.comments_ordering)[:settings.POST_DETAIL_COMMENTS_LIMIT + 1])
+        return obj._embedded_comments
+
+    def get_comments(self, obj):
+        comments = self.get_embedded_comments(obj)[:settings.POST_DETAIL_COMMENTS_LIMIT]
+        return CommentDetailsSerializer(comments, many=True).data
+
+    def get_comments_next(self, obj):
+        comments = self.get_embedded_comments(obj)
+        if len(comments) <= settings.POST_DETAIL_COMMENTS_LIMIT:
+            return None
+
+        url = reverse('api:posts:comments', args=(obj.id,))
+        request = self.context.get('request')
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        url = f'{url}?{SwitchablePagination.pagination_query_param}={SwitchablePagination.KEYSET}'
+        return KeysetPagination().get_link_after(
+            url, comments[settings.POST_DETAIL_COMMENTS_LIMIT - 1], self.comments_ordering
+        )
 
 
 class PostListSerializer(PostDetailsSerializer):
+    class Meta(PostDetailsSerializer.Meta):
+        fields = ('id', 'title', 'author',
+                  'status', 'allow_comments',
+                  'created', 'updated',
+                  'comments_total')
+        queryset_fields = ()
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields.pop('body', None)
-        self.fields.pop('image', None)
-        self.fields.pop('comments', None)
 
+class PostListValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('author', UserSimpleValuesSerializer),
+        ('status', 'status'),
+        ('allow_comments', 'allow_comments'),
+        ('created', 'created'),
+        ('updated', 'modified'),
+        ('comments_total', 'comments_count'),
+    )
+    converters = PostSimpleValuesSerializer.converters
 
-class PostSerializer(PostDetailsSerializer):
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields.pop('author', None)
+class PostSerializer(PostDetailsSerializer):
+    class Meta(PostDetailsSerializer.Meta):
+        fields = ('id', 'title', 'body', 'image',
+                  'status', 'allow_comments',
+                  'created', 'updated',
+                  'comments_total', 'comments', 'comments_next')
 
     def create(self, validated_data):
         validated_data.update({
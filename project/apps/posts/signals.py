@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from common.cache import invalidate_response_cache
+from common.signals import pre_batch_delete
+from posts.models import Post
+from posts.search import get_search_backend
+
+User = get_user_model()
+
+
+def create_search_index(using, **kwargs):
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.create_index()
+
+
+def invalidate_post_cache(post):
+    invalidate_response_cache(f'post:{post.id}', 'posts', f'user-posts:{post.author_id}')
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, using, **kwargs):
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.index_post(instance)
+    previous_author_id = getattr(instance, '_loaded_author_id', None)
+    if created:
+        User.objects.change_counter(instance.author_id, 'posts_count', 1)
+    elif previous_author_id is not None and previous_author_id != instance.author_id:
+        User.objects.change_counter(previous_author_id, 'posts_count', -1)
+        User.objects.change_counter(instance.author_id, 'posts_count', 1)
+        invalidate_response_cache(f'user-posts:{previous_author_id}')
+    instance._loaded_author_id = instance.author_id
+    invalidate_post_cache(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, using, **kwargs):
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.delete_post(instance.id)
+    User.objects.change_counter(instance.author_id, 'posts_count', -1)
+    invalidate_post_cache(instance)
+
+
+@receiver(pre_batch_delete, sender=Post)
+def posts_deleting(sender, queryset, using, **kwargs):
+    posts = list(queryset.values_list('id', 'author_id'))
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.delete_posts([post_id for post_id, _ in posts])
+    User.objects.decrease_counter('posts_count', queryset, 'author')
+    invalidate_response_cache('posts', *{
+        tag for post_id, author_id in posts for tag in (f'post:{post_id}', f'user-posts:{author_id}')
+    })
@@ -1,11 +1,62 @@
+import asyncio
+import json
+from collections import OrderedDict
+from concurrent.futures import (
+    Executor,
+    Future,
+)
+from datetime import timedelta
+from io import StringIO
+
 import pytest
 from django.contrib.auth import get_user_model
-from django.db.models import Count
-from django.urls import reverse_lazy
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import (
+    Count,
+    F,
+)
+from django.test.utils import CaptureQueriesContext
+from django.http import HttpResponse
+from django.urls import (
+    resolve,
+    reverse,
+    reverse_lazy,
+)
+from django.utils import timezone
+from freezegun import freeze_time
 from rest_framework import status
-
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from comments.models import Comment
+from common.asgi import ASGIHandler
+from common.cache import invalidate_response_cache
+from common.deletion import delete_objects
+from common.fixtures import (
+    find_fixture,
+    iter_json_array,
+)
+from common.middleware import (
+    admission_stats,
+    AdmissionControlMiddleware,
+)
+from common.pagination import KeysetPagination
+from common.warmup import (
+    get_memory_usage,
+    iter_views,
+    warm_up,
+)
+from config.api_docs import generator
 from posts.models import Post
-from posts.serializers import PostSerializer
+from posts.serializers import (
+    PostListSerializer,
+    PostSerializer,
+)
+from posts.views import PostListApiView
 
 User = get_user_model()
 
@@ -19,6 +70,7 @@ class PostViewsTestSuite:
         cls.my_post_list_url = reverse_lazy('api:posts:my_post_list')
         cls.post_create_url = reverse_lazy('api:posts:create')
         cls.post_detail_url = 'api:posts:detail'
+        cls.post_comments_url = 'api:posts:comments'
         cls.post_update_url = 'api:posts:update'
         cls.post_delete_url = 'api:posts:delete'
 
@@ -42,6 +94,485 @@ class PostViewsTestSuite:
         assert response.data['count'] == posts_count
         assert response.data['results']
 
+        posts = Post.objects.filter(
+            status=Post.PUBLISHED
+        ).order_by('-created', 'author__username')[:len(response.data['results'])]
+        data = PostListSerializer(posts, many=True).data
+        assert response.content == JSONRenderer().render(OrderedDict(response.data, results=data))
+
+    def test_post_list_keyset_pagination(self, client):
+        posts_ids = list(Post.objects.filter(
+            status=Post.PUBLISHED
+        ).order_by('-created', 'author__username').values_list('id', flat=True))
+
+        response = client.get(self.post_list_url, data={'pagination': 'cursor', 'page_size': 10})
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        assert response.data['previous'] is None
+
+        pages = [response.data]
+        while pages[-1]['next']:
+            response = client.get(pages[-1]['next'])
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.data)
+        assert [item['id'] for page in pages for item in page['results']] == posts_ids
+
+        response = client.get(pages[-1]['previous'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == pages[-2]['results']
+
+        response = client.get(self.post_list_url, data={'cursor': 'invalid'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_keyset_pagination_nulls(self):
+        Post.objects.update(image=None)
+        for index, post_id in enumerate(Post.objects.values_list('id', flat=True)[::2]):
+            Post.objects.filter(id=post_id).update(image=f'{index % 3}.jpg')
+
+        # NULLs sort last, ties are ordered by id.
+        rows = sorted(Post.objects.values_list('image', 'id'), key=lambda row: (row[0] is None, row[0] or '', row[1]))
+        for ordering, expected in ((('image',), rows), (('-image',), rows[::-1])):
+            paginator = KeysetPagination()
+            paginator.ordering = ordering
+            ids, url = [], f'{self.post_list_url}?page_size=7'
+            while url:
+                request = Request(APIRequestFactory().get(url))
+                ids.extend(post.id for post in paginator.paginate_queryset(Post.objects.all(), request))
+                url = paginator.get_next_link()
+            assert ids == [post_id for image, post_id in expected]
+
+    def test_post_list_search(self, client, post_factory, faker):
+        title_post = post_factory(title='Zebracorn Migration Patterns')
+        body_post = post_factory(body='Notes about a zebracorn herd.')
+        draft_post = post_factory(title='Zebracorn draft', status=Post.DRAFT)
+
+        response = client.get(self.post_list_url, data={'search': 'zebracorn'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [title_post.id, body_post.id]
+
+        response = client.get(self.post_list_url, data={'search': 'zebracorn', 'pagination': 'cursor', 'page_size': 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [title_post.id]
+        response = client.get(response.data['next'])
+        assert [item['id'] for item in response.data['results']] == [body_post.id]
+        assert response.data['next'] is None
+
+        response = client.get(self.post_list_url, data={'search': 'zebra migra'})
+        assert [item['id'] for item in response.data['results']] == [title_post.id]
+
+        response = client.get(self.post_list_url, data={'search': title_post.author.username})
+        assert title_post.id in [item['id'] for item in response.data['results']]
+
+        title_post.title = faker.sentence()
+        title_post.save()
+        body_post.delete()
+        draft_post.status = Post.PUBLISHED
+        draft_post.save()
+        response = client.get(self.post_list_url, data={'search': 'zebracorn'})
+        assert [item['id'] for item in response.data['results']] == [draft_post.id]
+
+        call_command('rebuild_search_index', chunk_size=10)
+        response = client.get(self.post_list_url, data={'search': 'zebracorn'})
+        assert [item['id'] for item in response.json()['results']] == [draft_post.id]
+
+    def test_post_list_search_throttle(self, client, settings, monkeypatch):
+        monkeypatch.setattr(PostListApiView, 'throttle_rates', {'ip': '2/min', 'view': '3/min'})
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        search = {'search': 'zebracorn'}
+        with freeze_time('2026-01-01 00:00:00') as frozen_time:
+            for _ in range(5):
+                response = client.get(self.post_list_url)
+                assert response.status_code == status.HTTP_200_OK
+
+            for _ in range(2):
+                response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR='10.0.0.1')
+                assert response.status_code == status.HTTP_200_OK
+            response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR='10.0.0.1')
+            assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            # entries before the one of the trusted proxy are sent by the client
+            response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR='10.0.0.2, 10.0.0.1')
+            assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+            response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR='10.0.0.2')
+            assert response.status_code == status.HTTP_200_OK
+            for address in range(3, 8):
+                response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR=f'10.0.0.{address}')
+                assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+            # a sixth of the 3 allowed requests of the previous window is left, denied ones are not counted
+            frozen_time.tick(timedelta(seconds=110))
+            for address, status_code in ((8, status.HTTP_200_OK), (9, status.HTTP_200_OK),
+                                         (10, status.HTTP_429_TOO_MANY_REQUESTS)):
+                response = client.get(self.post_list_url, data=search, HTTP_X_FORWARDED_FOR=f'10.0.0.{address}')
+                assert response.status_code == status_code
+
+    def test_post_list_count_strategy(self, client, post_factory, settings, django_assert_num_queries):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.post_list_url)
+        assert response.data['count_strategy'] == 'exact'
+        assert len([query for query in queries if 'COUNT(' in query['sql']]) == 1
+        with django_assert_num_queries(0):
+            assert client.get(self.post_list_url)['X-Cache'] == 'HIT'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.post_list_url, data={'page_size': 4})
+        assert response.data['count_strategy'] == 'exact'
+        assert not [query for query in queries if 'sqlite_stat1' in query['sql'] or 'pg_class' in query['sql']]
+
+        settings.PAGINATION_COUNT_STRATEGY = 'cached'
+        count = client.get(self.post_list_url, data={'page_size': 5}).json()['count']
+        post_factory(status=Post.PUBLISHED)
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response.json()['count_strategy'] == 'cached'
+        assert response.json()['count'] == count
+
+        settings.PAGINATION_COUNT_STRATEGY = 'estimated'
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        # table estimates are cached until the timeout
+        cache.clear()
+        response = client.get(reverse_lazy('api:users:user_list'))
+        assert response.data['count_strategy'] == 'estimated'
+        assert response.data['count'] == User.objects.count()
+        response = client.get(self.post_list_url, data={'page_size': 6})
+        assert response.data['count_strategy'] == 'cached'
+
+    def test_admission_control(self, client, arf, settings, monkeypatch):
+        settings.ADMISSION_CONTROL_CLASSES = {'default': {'limit': 1}, 'expensive': {'limit': 1}}
+        admission_stats.reset()
+        responses = []
+
+        def make_request():
+            request = arf.get(self.post_list_url)
+            request.resolver_match = resolve(str(self.post_list_url))
+            return request
+
+        def get_response(request):
+            responses.append(middleware.process_view(make_request(), None, (), {}))
+            return HttpResponse()
+
+        middleware = AdmissionControlMiddleware(get_response)
+        request = make_request()
+        assert middleware.process_view(request, None, (), {}) is None
+        middleware(request)
+        assert responses[0].status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert responses[0]['Retry-After'] == '1'
+
+        assert middleware.process_view(make_request(), None, (), {}) is None
+        assert admission_stats.get_stats() == {'api:posts:list': {'admitted': 2, 'queued': 0, 'shed': 1}}
+
+        response = client.get(reverse_lazy('api:users:user_list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert admission_stats.get_stats()['api:users:user_list']['admitted'] == 1
+
+        # The slot is released when counting fails.
+        def count(view_name, outcome):
+            raise ConnectionError()
+
+        monkeypatch.setattr(admission_stats, 'count', count)
+        middleware = AdmissionControlMiddleware(lambda request: middleware.process_view(request, None, (), {}))
+        with pytest.raises(ConnectionError):
+            middleware(make_request())
+        assert middleware.limiters['expensive'].acquire() == 'admitted'
+
+    def test_asgi_handler(self, client, settings):
+        class InlineExecutor(Executor):
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.set_result(fn(*args, **kwargs))
+                return future
+
+        settings.ALLOWED_HOSTS = ['testserver']
+        handler = ASGIHandler()
+        handler.close()
+        handler.read_executor = handler.executor = InlineExecutor()
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': str(self.post_list_url), 'query_string': b'page_size=5',
+            'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 10000),
+        }
+
+        async def disconnect():
+            return {'type': 'http.disconnect'}
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(handler(scope, receive, send))
+            assert messages[0]['status'] == status.HTTP_200_OK
+            assert (b'content-type', b'application/json') in messages[0]['headers']
+            body = b''.join(message['body'] for message in messages[1:])
+            assert json.loads(body.decode()) == client.get(self.post_list_url, data={'page_size': 5}).json()
+
+            messages.clear()
+            loop.run_until_complete(handler({**scope, 'method': 'POST'}, disconnect, send))
+            assert not messages
+        finally:
+            loop.close()
+
+        handler.read_executor = InlineExecutor()
+        scope.update(path=f'/blog{self.post_list_url}', root_path='/blog')
+        assert handler.get_executor(scope) is handler.read_executor
+
+    def test_warm_up(self):
+        views = list(iter_views())
+        assert PostListApiView in {getattr(view, 'cls', None) for view in views}
+        assert warm_up() == len(views)
+        assert get_memory_usage()['rss'] > 0
+
+    def test_render_api_docs(self, client, settings, tmpdir):
+        settings.ALLOWED_HOSTS = ['testserver']
+        settings.API_DOCS_ROOT = str(tmpdir)
+        docs_url = reverse('api-docs:docs-index')
+        response = client.get(docs_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert (True, False) in generator.links_cache
+
+        call_command('render_api_docs', url='http://testserver', stdout=StringIO())
+        response = client.get(docs_url)
+        assert 'Allow' not in response
+        assert response.content == tmpdir.join('index.html').read_binary()
+        assert client.get(reverse('api-docs:schema-js')).content == tmpdir.join('schema.js').read_binary()
+        assert client.get(docs_url, HTTP_ACCEPT='application/coreapi+json')['Content-Type'] == \
+            'application/coreapi+json'
+
+    def test_startup_profile(self):
+        out = StringIO()
+        with pytest.raises(CommandError, match='over the budget of 0ms'):
+            call_command('startup_profile', repeat=1, limit=5, budget=0, stdout=out)
+        report = out.getvalue().splitlines()
+        assert 'modules imported in' in report[0]
+        assert len(report) == 7
+
+    def test_index_advisor(self):
+        out = StringIO()
+        call_command('index_advisor', analyze=True, stdout=out)
+        report = out.getvalue()
+        assert 'api:posts:list: ' in report
+        assert 'sequential scan of posts_post' not in report
+        assert 'Unused indexes: ' in report
+
+    def test_benchmark(self, tmpdir, monkeypatch):
+        posts_count = Post.objects.count()
+        output = tmpdir.join('benchmark.json')
+        call_command('benchmark', scales='1,2', requests=2, output=str(output), stderr=StringIO())
+        report = json.loads(output.read())
+        assert report['scales'][0]['posts'] == posts_count
+        assert report['scales'][1]['posts'] >= posts_count * 2
+        endpoint = report['scales'][-1]['endpoints']['post_list']
+        assert endpoint['status'] == status.HTTP_200_OK
+        assert endpoint['queries'] and endpoint['bytes']
+        assert endpoint['p50_ms'] <= endpoint['p95_ms'] <= endpoint['p99_ms']
+        endpoints = report['scales'][-1]['endpoints']
+        assert all(endpoint['status'] < status.HTTP_400_BAD_REQUEST for endpoint in endpoints.values())
+        assert Post.objects.count() == posts_count
+
+        monkeypatch.setattr(PostListApiView, 'throttle_rates', {'ip': '1/min'})
+        call_command('benchmark', scales='1', requests=2, cache=True, output=str(output), stderr=StringIO())
+        assert json.loads(output.read())['scales'][0]['endpoints']['post_list_search']['status'] == status.HTTP_200_OK
+        monkeypatch.setattr(PostListApiView, 'http_method_names', ('post',))
+        with pytest.raises(CommandError, match='post_list answered with status 405'):
+            call_command('benchmark', scales='1', requests=2, output=str(output), stderr=StringIO())
+
+    def test_fixture_stream(self):
+        with open(find_fixture('posts')) as fixture:
+            objects = json.load(fixture)
+        with open(find_fixture('posts')) as fixture:
+            assert list(iter_json_array(fixture, buffer_size=13)) == objects
+        assert list(iter_json_array(StringIO(' [ ] '))) == []
+        assert list(iter_json_array(StringIO('[1, 22 ,"3"]'), buffer_size=1)) == [1, 22, '3']
+        with pytest.raises(ValueError):
+            list(iter_json_array(StringIO('[{"pk": 1}, {"pk"'), buffer_size=4))
+
+    def test_load_fake_data_again(self):
+        counts = User.objects.count(), Post.objects.count(), Comment.objects.count()
+        post = Post.objects.order_by('id').first()
+        Post.objects.filter(id=post.id).update(title='Changed')
+        call_command('load_fake_data', call_from_test=True, batch_size=50, stdout=StringIO())
+        assert (User.objects.count(), Post.objects.count(), Comment.objects.count()) == counts
+        assert Post.objects.get(id=post.id).title == post.title
+        assert not Post.objects.annotate(total=Count('comments')).exclude(comments_count=F('total')).exists()
+        assert not User.objects.annotate(
+            posts_total=Count('posts', distinct=True), comments_total=Count('comments', distinct=True)
+        ).exclude(posts_count=F('posts_total'), comments_count=F('comments_total')).exists()
+
+    def test_generate_data(self):
+        users_count, posts_count = User.objects.count(), Post.objects.count()
+        call_command('generate_data', users=5, posts=20, comments=100, batch_size=7, workers=1, stdout=StringIO())
+        assert User.objects.count() == users_count + 5
+        assert Post.objects.count() == posts_count + 20
+        post = Post.objects.annotate(total=Count('comments')).order_by('-id').first()
+        assert post.comments_count == post.total
+        assert post.body.rendered.startswith('<h2>')
+
+        user = User.objects.order_by('-id').first()
+        assert user.check_password('password')
+        assert user.emailaddress_set.get().verified
+
+    def test_batch_delete(self, user_factory, post_factory, comment_factory):
+        user, other_post = user_factory(), post_factory()
+        posts = post_factory.create_batch(3, author=user)
+        for post in posts:
+            comment_factory.create_batch(2, post=post)
+        comment_factory.create_batch(3, post=other_post, user=user)
+        other_post.refresh_from_db()
+        comments_count = other_post.comments_count
+
+        progress = []
+        total, deleted = delete_objects(User.objects.filter(id=user.id), batch_size=2,
+                                        progress=lambda label, count: progress.append((label, count)))
+        assert deleted['posts.Post'] == 3
+        assert deleted['comments.Comment'] == 9
+        assert deleted['users.User'] == 1
+        assert total == sum(deleted.values())
+        assert max(count for _, count in progress) <= 2
+        assert not Post.objects.filter(author_id=user.id).exists()
+        other_post.refresh_from_db()
+        assert other_post.comments_count == comments_count - 3
+
+    def test_post_list_response_cache(self, client, post_factory, comment_factory, faker):
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response['X-Cache'] == 'HIT'
+        first_post = Post.objects.get(id=response.json()['results'][0]['id'])
+
+        other_url = reverse_lazy(self.post_detail_url, args=(response.json()['results'][-1]['id'],))
+        assert client.get(other_url)['X-Cache'] == 'MISS'
+        assert client.get(other_url)['X-Cache'] == 'HIT'
+
+        comment_factory(post=first_post)
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['comments_total'] == first_post.comments_count + 1
+        assert client.get(other_url)['X-Cache'] == 'HIT'
+
+        first_post.author.first_name = faker.first_name()
+        first_post.author.save()
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['author']['first_name'] == first_post.author.first_name
+
+        new_post = post_factory()
+        response = client.get(self.post_list_url, data={'page_size': 5})
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['id'] == new_post.id
+
+        client.force_authenticate(new_post.author)
+        assert 'X-Cache' not in client.get(self.post_list_url, data={'page_size': 5})
+
+    def test_response_cache_invalidated_during_view(self, client, monkeypatch):
+        post = Post.objects.filter(status=Post.PUBLISHED).order_by('-created', 'author__username').first()
+        paginate_queryset = PostListApiView.paginate_queryset
+        for tag in ('posts', f'user:{post.author_id}'):
+            invalidate_response_cache('posts')
+
+            def invalidating_paginate_queryset(view, queryset):
+                page = paginate_queryset(view, queryset)
+                invalidate_response_cache(tag)
+                return page
+
+            monkeypatch.setattr(PostListApiView, 'paginate_queryset', invalidating_paginate_queryset)
+            assert client.get(self.post_list_url, data={'page_size': 5})['X-Cache'] == 'MISS'
+            monkeypatch.undo()
+            assert client.get(self.post_list_url, data={'page_size': 5})['X-Cache'] == 'MISS'
+            assert client.get(self.post_list_url, data={'page_size': 5})['X-Cache'] == 'HIT'
+
+        # Invalidations of other tags do not keep the response from being stored.
+        invalidate_response_cache('posts')
+        invalidate_response_cache(f'post:{post.id}')
+
+        def unrelated_paginate_queryset(view, queryset):
+            invalidate_response_cache('user:0')
+            return paginate_queryset(view, queryset)
+
+        monkeypatch.setattr(PostListApiView, 'paginate_queryset', unrelated_paginate_queryset)
+        assert client.get(self.post_list_url, data={'page_size': 5})['X-Cache'] == 'MISS'
+        assert client.get(self.post_list_url, data={'page_size': 5})['X-Cache'] == 'HIT'
+
+    def test_post_conditional_get(self, client, comment_factory, django_assert_num_queries, faker):
+        post = Post.objects.filter(status=Post.PUBLISHED).latest('created')
+        post_detail_url = reverse_lazy(self.post_detail_url, args=(post.id,))
+        etags = {}
+        for url in (self.post_list_url, post_detail_url):
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            etags[url], last_modified = response['ETag'], response['Last-Modified']
+
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert not response.content
+
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+            with django_assert_num_queries(0):
+                response = client.head(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] == etags[url]
+            assert not response.content
+
+        comment = comment_factory(post=post)
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] != etag
+
+        draft_post = Post.objects.filter(status=Post.DRAFT).first()
+        response = client.head(reverse_lazy(self.post_detail_url, args=(draft_post.id,)))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        client.force_authenticate(post.author)
+        for url, queries in ((self.post_list_url, 1), (post_detail_url, 2)):
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            etag, last_modified = response['ETag'], response['Last-Modified']
+            with django_assert_num_queries(queries):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert not response.content
+            assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == \
+                status.HTTP_304_NOT_MODIFIED
+            with django_assert_num_queries(queries):
+                response = client.head(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] == etag
+
+        # Edits of embedded comments and commenters change neither the post
+        # nor its counter.
+        for change in range(3):
+            etag = client.head(post_detail_url)['ETag']
+            if change < 2:
+                comment.body = faker.text()
+                comment.save()
+            else:
+                comment.user.first_name = faker.first_name()
+                comment.user.save()
+            response = client.get(post_detail_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] != etag
+
+        response = client.get(self.post_list_url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        with freeze_time(timezone.now() + timedelta(minutes=1)):
+            Post.objects.filter(status=Post.PUBLISHED).exclude(id=post.id).first().delete()
+            response = client.get(self.post_list_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] != etag
+            response = client.get(self.post_list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == status.HTTP_200_OK
+
+        response = client.head(reverse_lazy(self.post_detail_url, args=(draft_post.id,)))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_my_posts_view(self, client):
         for http_method in ('get', 'post', 'put', 'patch', 'delete'):
             response = getattr(client, http_method)(self.my_post_list_url)
@@ -151,6 +682,59 @@ class PostViewsTestSuite:
         assert response.status_code == status.HTTP_200_OK
         assert response.data == PostSerializer(draft_post).data
 
+    def test_post_detail_comments(self, client, post_factory, comment_factory, settings):
+        settings.POST_DETAIL_COMMENTS_LIMIT = 3
+        post = post_factory()
+        comments = [comment_factory(post=post) for _ in range(7)][::-1]
+
+        response = client.get(reverse_lazy(self.post_detail_url, args=(post.id,)))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['comments_total'] == len(comments)
+        assert [item['id'] for item in response.data['comments']] == [comment.id for comment in comments[:3]]
+
+        comments_ids = [item['id'] for item in response.data['comments']]
+        next_url = response.data['comments_next']
+        while next_url:
+            response = client.get(next_url)
+            assert response.status_code == status.HTTP_200_OK
+            comments_ids.extend(item['id'] for item in response.data['results'])
+            next_url = response.data['next']
+        assert comments_ids == [comment.id for comment in comments]
+
+        response = client.get(reverse_lazy(self.post_comments_url, args=(post.id,)))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == len(comments)
+
+        draft_post = post_factory(status=Post.DRAFT)
+        response = client.get(reverse_lazy(self.post_comments_url, args=(draft_post.id,)))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        client.force_authenticate(draft_post.author)
+        response = client.get(reverse_lazy(self.post_comments_url, args=(draft_post.id,)))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_post_detail_deferred_fields(self, client, post_factory, comment_factory):
+        post = post_factory()
+        comment_factory(post=post)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse_lazy(self.post_detail_url, args=(post.id,)))
+        assert response.status_code == status.HTTP_200_OK
+        data = PostSerializer(Post.objects.get(id=post.id), context={'request': response.wsgi_request}).data
+        assert response.data == data
+
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'ip_address' not in sql
+        assert 'password' not in sql
+
+    def test_post_save_keeps_comments_count(self, post_factory, comment_factory, faker):
+        post = post_factory()
+        loaded = Post.objects.get(id=post.id)
+        comment_factory.create_batch(2, post=post)
+        loaded.title = faker.sentence()
+        loaded.save()
+        post.refresh_from_db()
+        assert (post.title, post.comments_count) == (loaded.title, 2)
+
     def test_post_update(self, client, user_factory, post_factory, faker):
         test_url = reverse_lazy(self.post_update_url, args=(1,))
         for http_method in ('get', 'post', 'put', 'patch', 'delete'):
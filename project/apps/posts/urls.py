@@ -8,6 +8,7 @@ urlpatterns = [
         url(r'^my_post_list/$', views.my_post_list, name='my_post_list'),
         url(r'^create/$', views.post_create, name='create'),
         url(r'^detail/(?P<pk>\d+)/$', views.post_detail, name='detail'),
+        url(r'^(?P<pk>\d+)/comments/$', views.post_comments, name='comments'),
         url(r'^update/(?P<pk>\d+)/$', views.post_update, name='update'),
         url(r'^delete/(?P<pk>\d+)/$', views.post_delete, name='delete'),
 
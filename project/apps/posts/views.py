@@ -1,10 +1,28 @@
-from django.db.models import Count
+from django.conf import settings
+from django.db.models import (
+    Max,
+    Q,
+    Sum,
+)
 from rest_framework import generics
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import (
     AllowAny,
     IsAuthenticated,
 )
 
+from comments.models import Comment
+from comments.serializers import (
+    CommentDetailsSerializer,
+    CommentDetailsValuesSerializer,
+)
+from common.mixins import (
+    BatchDeleteMixin,
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    OptimizedQuerysetMixin,
+    ValuesListMixin,
+)
 from common.permissions import IsObjectOwner
 from posts.filters import (
     PostsSearchFilter,
@@ -17,44 +35,60 @@ from posts.permissions import (
 )
 from posts.serializers import (
     PostListSerializer,
+    PostListValuesSerializer,
     PostSerializer,
 )
 
 
-class PostListApiView(generics.ListAPIView):
+class PostListApiView(ConditionalResponseMixin, CachedResponseMixin, ValuesListMixin,
+                      OptimizedQuerysetMixin, generics.ListAPIView):
     """
     get: Return list of posts
 
     """
 
-    queryset = Post.objects.only(
-        'id', 'title', 'body', 'image',
-        'status', 'allow_comments',
-        'author', 'created', 'modified',
-    ).select_related('author').filter(
+    queryset = Post.objects.filter(
         status=Post.PUBLISHED
-    ).annotate(
-        comments_total=Count('comments')
     ).order_by('-created', 'author__username')
     http_method_names = ('get', 'head', 'options')
     serializer_class = PostListSerializer
+    values_serializer_class = PostListValuesSerializer
+    values_fields = ('author_id',)
     filter_backends = (
         PostsSearchFilter,
         PostsOrderingFilter,
     )
     search_fields = ('title', 'body', 'author__username')
+    ordering = ('-created', 'author__username')
     permission_classes = (AllowAny,)
-
-
-class MyPostListApiView(generics.ListAPIView):
+    throttle_rates = {'ip': '60/min', 'view': '1200/min'}
+    cache_tags = ('posts',)
+    cache_object_tags = ('post:{obj.id}', 'user:{obj.author_id}')
+    validator_aggregates = {
+        'modified': Max('modified'),
+        'comments': Sum('comments_count'),
+        'authors_modified': Max('author__modified'),
+    }
+    validator_tags = ('posts',)
+
+    def get_throttles(self):
+        # only searches are expensive enough to throttle, the plain list is cached
+        if not PostsSearchFilter().get_search_terms(self.request):
+            return []
+        return super().get_throttles()
+
+
+class MyPostListApiView(ValuesListMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     """
     get: Return list of posts of authorized user
 
     """
 
+    queryset = Post.objects.all()
     http_method_names = ('get', 'head', 'options')
     permission_classes = (IsAuthenticated,)
     serializer_class = PostListSerializer
+    values_serializer_class = PostListValuesSerializer
     filter_backends = (
         MyPostsStatusFilter,
         PostsSearchFilter,
@@ -62,13 +96,11 @@ class MyPostListApiView(generics.ListAPIView):
     )
     search_fields = ('title', 'body',)
     filter_fields = ('status',)
+    ordering = ('-created',)
 
     def get_queryset(self):
         user = self.request.user
-        return Post.objects.only(
-            'id', 'title', 'body', 'image',
-            'created', 'modified',
-        ).filter(author_id=user.id).order_by('-created')
+        return super().get_queryset().filter(author_id=user.id).order_by('-created')
 
 
 class PostCreateApiView(generics.CreateAPIView):
@@ -79,45 +111,94 @@ class PostCreateApiView(generics.CreateAPIView):
 
     http_method_names = ('post', 'head', 'options')
     permission_classes = (IsAuthenticated,)
+    throttle_rates = {'user': '10/min'}
     serializer_class = PostSerializer
 
 
-class PostDetailApiView(generics.RetrieveAPIView):
+class PostDetailApiView(ConditionalResponseMixin, CachedResponseMixin, OptimizedQuerysetMixin,
+                        generics.RetrieveAPIView):
     """
     patch: Get post info
 
     """
 
-    queryset = Post.objects.select_related(
-        'author',
-    ).prefetch_related(
-        'comments',
-        'comments__user',
-    ).annotate(
-        comments_total=Count('comments'),
-    )
+    queryset = Post.objects.all()
+    queryset_fields = ('author',)
     http_method_names = ('get', 'head', 'options')
     permission_classes = (AllowAny, PostDetailPermission)
     serializer_class = PostSerializer
     lookup_url_kwarg = 'pk'
+    cache_object_tags = ('post:{obj.id}', 'user:{obj.author_id}')
+    validator_fields = ('modified', 'comments_count', 'author_id')
+    validator_tags = ('post:{pk}', 'user:{author_id}')
+
+    def get_validators_queryset(self):
+        return super().get_validators_queryset().filter(
+            Q(status=Post.PUBLISHED) | Q(author_id=self.request.user.id)
+        )
+
+    def get_validator_tags(self, row):
+        tags = super().get_validator_tags(row)
+        if row['comments_count']:
+            tags.update(f'user:{user_id}' for user_id in Comment.objects.filter(
+                post_id=self.kwargs['pk']
+            ).order_by(*PostSerializer.comments_ordering).values_list(
+                'user_id', flat=True
+            )[:settings.POST_DETAIL_COMMENTS_LIMIT])
+        return tags
+
+    def get_cache_tags(self):
+        tags = super().get_cache_tags()
+        for obj in self.cached_objects:
+            comments = PostSerializer.get_embedded_comments(obj)
+            tags.update(f'user:{comment.user_id}' for comment in comments)
+        return tags
+
+
+class PostCommentsListView(ConditionalResponseMixin, CachedResponseMixin, ValuesListMixin,
+                           OptimizedQuerysetMixin, generics.ListAPIView):
+    """
+    get: Return list of post comments, newest first
+
+    """
+
+    queryset = Comment.objects.all()
+    http_method_names = ('get', 'head', 'options')
+    permission_classes = (AllowAny,)
+    serializer_class = CommentDetailsSerializer
+    values_serializer_class = CommentDetailsValuesSerializer
+    values_fields = ('user_id',)
+    ordering = PostSerializer.comments_ordering
+    cache_tags = ('post:{pk}',)
+    cache_object_tags = ('user:{obj.user_id}',)
+    validator_aggregates = {
+        'modified': Max('modified'),
+        'users_modified': Max('user__modified'),
+    }
+    validator_tags = ('post:{pk}',)
+
+    def get_queryset(self):
+        post = get_object_or_404(
+            Post.objects.only('id').filter(Q(status=Post.PUBLISHED) | Q(author_id=self.request.user.id)),
+            id=self.kwargs['pk'],
+        )
+        return super().get_queryset().filter(post_id=post.id).order_by(*self.ordering)
 
 
-class PostUpdateApiView(generics.UpdateAPIView):
+class PostUpdateApiView(OptimizedQuerysetMixin, generics.UpdateAPIView):
     """
     patch: Update post data.
 
     """
 
-    queryset = Post.objects.only(
-        'id', 'title', 'body', 'image',
-        'author', 'created', 'modified'
-    ).select_related('author')
+    queryset = Post.objects.all()
+    queryset_fields = ('author',)
     http_method_names = ('patch', 'head', 'options')
     permission_classes = (IsAuthenticated, IsObjectOwner)
     serializer_class = PostSerializer
 
 
-class PostDeleteApiView(generics.DestroyAPIView):
+class PostDeleteApiView(BatchDeleteMixin, generics.DestroyAPIView):
     """
     delete: Delete post
 
@@ -135,5 +216,6 @@ post_list = PostListApiView.as_view()
 my_post_list = MyPostListApiView.as_view()
 post_create = PostCreateApiView.as_view()
 post_detail = PostDetailApiView.as_view()
+post_comments = PostCommentsListView.as_view()
 post_update = PostUpdateApiView.as_view()
 post_delete = PostDeleteApiView.as_view()
@@ -36,6 +36,7 @@ class AccountAdapter(DefaultAccountAdapter):
         email_address.verified = True
         email_address.set_as_primary(conditional=False)
         email_address.save()
+        email_address.user.sync_email_state()
 
     def respond_email_verification_sent(self, request, user):
         return Response({'detail': _('Email was successfully confirmed.')})
@@ -8,6 +8,7 @@ from django.contrib.auth.forms import UserCreationForm as UserCreationFormBase
 from django.contrib.auth.models import Group
 from django.utils.translation import ugettext_lazy as _
 
+from common.mixins import BatchDeleteAdminMixin
 from common.utils import get_object_or_none
 
 admin.site.unregister(Group)
@@ -59,7 +60,7 @@ class UserCreationForm(UserCreationFormBase):
 
 
 @admin.register(User)
-class UserAdmin(AuthUserAdmin):
+class UserAdmin(BatchDeleteAdminMixin, AuthUserAdmin):
     add_form = UserCreationForm
     form = UserChangeForm
     inlines = (EmailAddressStackedInline,)
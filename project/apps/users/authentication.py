@@ -0,0 +1,96 @@
+from calendar import timegm
+from datetime import datetime
+from functools import lru_cache
+
+import jwt
+from django.conf import settings
+from django.utils.translation import ugettext as _
+from rest_framework import exceptions
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from rest_framework_jwt.settings import api_settings
+from rest_framework_jwt.utils import jwt_payload_handler as base_jwt_payload_handler
+
+from users.loader import user_loader
+
+# Token claim: user field, identity of the token user
+CLAIMS = {
+    'user_id': 'id',
+    'username': 'username',
+    'email': 'email',
+}
+
+
+def jwt_payload_handler(user):
+    """
+    Default payload with the user fields `StatelessJSONWebTokenAuthentication`
+    identifies the request user with.
+
+    """
+
+    payload = base_jwt_payload_handler(user)
+    payload.update({claim: getattr(user, field) for claim, field in CLAIMS.items()})
+    return payload
+
+
+@lru_cache(maxsize=settings.JWT_VERIFIED_TOKENS_CACHE_SIZE)
+def verify_token(token):
+    """
+    Verified payload of recently seen tokens, repeated tokens
+    skip the signature check. Errors are not cached.
+
+    """
+
+    return api_settings.JWT_DECODE_HANDLER(token)
+
+
+def decode_token(token):
+    """
+    Payload of the token, expiration is checked on every call
+    because verified payloads are cached.
+
+    """
+
+    payload = verify_token(token)
+    now = timegm(datetime.utcnow().utctimetuple())
+    if api_settings.JWT_VERIFY_EXPIRATION and payload.get('exp', now) < now - api_settings.JWT_LEEWAY:
+        raise jwt.ExpiredSignature('Signature has expired.')
+    return payload
+
+
+class StatelessJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """
+    JWT authentication without the user query.
+
+    The request user is loaded by `user_loader` from the cache, which is
+    invalidated on save, so users deactivated, soft-deleted or demoted
+    after login lose access with their next request. Users whose identity
+    differs from the token claims are looked up by the default authentication.
+
+    """
+
+    def authenticate(self, request):
+        jwt_value = self.get_jwt_value(request)
+        if jwt_value is None:
+            return None
+
+        try:
+            payload = decode_token(jwt_value)
+        except jwt.ExpiredSignature:
+            raise exceptions.AuthenticationFailed(_('Signature has expired.'))
+        except jwt.DecodeError:
+            raise exceptions.AuthenticationFailed(_('Error decoding signature.'))
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed()
+
+        return self.authenticate_credentials(payload), jwt_value
+
+    def authenticate_credentials(self, payload):
+        user = user_loader.get(payload.get('user_id'))
+        if user is None or any(getattr(user, field) != payload.get(claim) for claim, field in CLAIMS.items()
+                               if claim in payload):
+            return super().authenticate_credentials(payload)
+        if user.is_removed:
+            raise exceptions.AuthenticationFailed(_('Invalid signature.'))
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User account is disabled.'))
+        return user
@@ -0,0 +1,104 @@
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.cache import (
+    DEFAULT_CACHE_ALIAS,
+    caches,
+)
+from django.db import router
+
+
+class UserLoader:
+    """
+    Users by id cached as rows of their field values.
+
+    Every user has a random version stored in the cache and rows are
+    stored under the version read before the row was loaded. Invalidation
+    deletes the version, so a row loaded concurrently with a save is stored
+    under a version that is never read again.
+    Passwords and frequently changing counters are not cached, loaded users
+    have them deferred and load them with the other deferred fields.
+
+    """
+
+    excluded_fields = ('password', 'posts_count', 'comments_count')
+
+    def __init__(self, prefix, alias=DEFAULT_CACHE_ALIAS, timeout=None):
+        self.prefix = prefix
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def model(self):
+        return get_user_model()
+
+    @property
+    def field_names(self):
+        return [field.attname for field in self.model._meta.concrete_fields
+                if field.attname not in self.excluded_fields]
+
+    def make_version_key(self, user_id):
+        return f'{self.prefix}:version:{user_id}'
+
+    def make_key(self, user_id, version):
+        return f'{self.prefix}:{user_id}:{version}'
+
+    def get_versions(self, user_ids):
+        version_keys = {self.make_version_key(user_id): user_id for user_id in user_ids}
+        versions = {version_keys[key]: version for key, version in self.cache.get_many(version_keys).items()}
+        for user_id in set(user_ids) - set(versions):
+            self.cache.add(self.make_version_key(user_id), uuid4().hex, None)
+            versions[user_id] = self.cache.get(self.make_version_key(user_id))
+        return versions
+
+    def get_many_values(self, user_ids):
+        """
+        Return field values of `field_names` by user id, rows
+        missing in the cache are loaded with one query and cached.
+        Ids of users that do not exist are left out.
+
+        """
+
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {}
+        keys = {self.make_key(user_id, version): user_id for user_id, version in self.get_versions(user_ids).items()}
+        rows = {keys[key]: values for key, values in self.cache.get_many(keys).items()}
+
+        missing = user_ids - set(rows)
+        if missing:
+            pk_index = self.field_names.index(self.model._meta.pk.attname)
+            loaded = {values[pk_index]: values for values in self.model._base_manager.filter(
+                pk__in=missing
+            ).values_list(*self.field_names)}
+            self.cache.set_many({key: loaded[user_id] for key, user_id in keys.items() if user_id in loaded},
+                                self.timeout)
+            rows.update(loaded)
+        return rows
+
+    def get_many(self, user_ids):
+        """
+        Return users by id.
+
+        """
+
+        db = router.db_for_read(self.model)
+        users = {}
+        for user_id, values in self.get_many_values(user_ids).items():
+            user = self.model.from_db(db, self.field_names, values)
+            user.load_deferred_together = True
+            users[user_id] = user
+        return users
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(user_id)
+
+    def invalidate(self, *user_ids):
+        self.cache.delete_many([self.make_version_key(user_id) for user_id in user_ids])
+
+
+user_loader = UserLoader('user-loader', timeout=60 * 60)
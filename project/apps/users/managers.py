@@ -1,7 +1,26 @@
+import logging
+
+from django.apps import apps
 from django.contrib.auth.base_user import BaseUserManager
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+)
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+logger = logging.getLogger(__name__)
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -39,3 +58,57 @@ class UserManager(BaseUserManager):
 
     def create_superuser(self, username, email, password, **extra_fields):
         return self._create_user(username, email, password, True, True, **extra_fields)
+
+    def change_counter(self, user_id, counter, delta):
+        """
+        Add `delta` to the denormalized `counter` field of the user.
+
+        """
+
+        queryset = self.filter(id=user_id)
+        if delta < 0:
+            queryset = queryset.filter(**{f'{counter}__gte': -delta})
+        if not queryset.update(**{counter: F(counter) + delta}) and delta < 0:
+            logger.warning('%s of user %s not decreased by %s, it has drifted, run reconcile_counters.',
+                           counter, user_id, -delta)
+
+    def decrease_counter(self, counter, objects, user_field):
+        """
+        Subtract `objects` from `counter` of the users in their `user_field`
+        in one statement, counters never go below zero.
+
+        """
+
+        counts = objects.filter(**{user_field: OuterRef('pk')}).order_by().values(user_field).annotate(
+            count=Count('pk')
+        ).values('count')
+        self.filter(id__in=objects.values(user_field)).update(**{
+            counter: Greatest(F(counter) - Subquery(counts, output_field=IntegerField()), 0)
+        })
+
+    def with_primary_email(self):
+        """
+        Users with their primary allauth email address prefetched,
+        `User.primary_email` returns it without a query per user.
+
+        """
+
+        EmailAddress = apps.get_model('account', 'EmailAddress')
+        return self.prefetch_related(Prefetch(
+            'emailaddress_set', queryset=EmailAddress.objects.filter(primary=True), to_attr='primary_email_addresses'
+        ))
+
+    def sync_email_state(self, *user_ids):
+        """
+        Copy the primary allauth email address and its verified flag
+        of the users to `primary_email_address` and `email_verified`
+        in one statement.
+
+        """
+
+        EmailAddress = apps.get_model('account', 'EmailAddress')
+        primary = EmailAddress.objects.filter(user=OuterRef('pk'), primary=True).order_by()
+        self.filter(id__in=user_ids).update(
+            primary_email_address=Coalesce(Subquery(primary.values('email')[:1]), Value('')),
+            email_verified=Exists(primary.filter(verified=True)),
+        )
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.11 on 2026-10-18 15:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('comments', 'Comment')
+    posts_count = Post.objects.order_by().values_list('author_id').annotate(total=Count('id'))
+    for user_id, total in posts_count:
+        User.objects.filter(id=user_id).update(posts_count=total)
+    comments_count = Comment.objects.order_by().values_list('user_id').annotate(total=Count('id'))
+    for user_id, total in comments_count:
+        User.objects.filter(id=user_id).update(comments_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_remove_user_index'),
+        ('posts', '0003_post_access_path_indexes'),
+        ('comments', '0003_comment_access_path_indexes'),
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of user posts.', verbose_name='Posts count'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of user comments.', verbose_name='Comments count'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
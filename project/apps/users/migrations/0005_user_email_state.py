@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.11 on 2026-10-18 15:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def fill_email_state(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    EmailAddress = apps.get_model('account', 'EmailAddress')
+    for user_id, email, verified in EmailAddress.objects.filter(primary=True).values_list('user_id', 'email', 'verified'):
+        User.objects.filter(id=user_id).update(primary_email_address=email, email_verified=verified)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_counters'),
+        ('account', '0002_email_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='primary_email_address',
+            field=models.EmailField(blank=True, editable=False, help_text='Denormalized primary email address of the user.', max_length=254, verbose_name='Primary email address'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_verified',
+            field=models.BooleanField(default=False, editable=False, help_text='Denormalized verified flag of the primary email address.', verbose_name='Email verified'),
+        ),
+        migrations.RunPython(fill_email_state, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 import os
 
 from allauth.utils import build_absolute_uri
+from common.models import CounterFieldsMixin
 from common.validators import ImageSizeValidator
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
@@ -9,6 +10,7 @@ from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.staticfiles.templatetags.staticfiles import static
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from model_utils.fields import AutoLastModifiedField
 from model_utils.models import SoftDeletableModel
 from users.managers import UserManager
 
@@ -17,7 +19,7 @@ def get_user_avatar_upload_path(instance, filename):
     return os.path.join(*('users', 'avatars', str(instance.pk), filename))
 
 
-class User(PermissionsMixin, AbstractBaseUser, SoftDeletableModel):
+class User(CounterFieldsMixin, PermissionsMixin, AbstractBaseUser, SoftDeletableModel):
     """
     Common user model.
 
@@ -62,6 +64,10 @@ class User(PermissionsMixin, AbstractBaseUser, SoftDeletableModel):
     date_joined = models.DateTimeField(
         _('Member since'), auto_now_add=True
     )
+    modified = AutoLastModifiedField(
+        _('modified'),
+        help_text=_('Last change of user data.')
+    )
     is_active = models.BooleanField(
         _('Active'), default=True
     )
@@ -69,29 +75,86 @@ class User(PermissionsMixin, AbstractBaseUser, SoftDeletableModel):
         _('Staff status'), default=False,
         help_text=_('Designates whether the user can log into this admin site.')
     )
+    posts_count = models.PositiveIntegerField(
+        _('Posts count'), default=0, editable=False,
+        help_text=_('Denormalized number of user posts.')
+    )
+    comments_count = models.PositiveIntegerField(
+        _('Comments count'), default=0, editable=False,
+        help_text=_('Denormalized number of user comments.')
+    )
+    primary_email_address = models.EmailField(
+        _('Primary email address'), blank=True, editable=False,
+        help_text=_('Denormalized primary email address of the user.')
+    )
+    email_verified = models.BooleanField(
+        _('Email verified'), default=False, editable=False,
+        help_text=_('Denormalized verified flag of the primary email address.')
+    )
 
     objects = UserManager()
 
+    counter_fields = ('posts_count', 'comments_count')
+
+    # Set on users built by `users.loader`.
+    load_deferred_together = False
+
     class Meta:
         verbose_name = _('User')
         verbose_name_plural = _('Users')
         ordering = ('first_name', 'last_name', 'email')
-        indexes = (
-            models.Index(fields=['username', 'email',
-                                 'last_name', 'first_name']),
-        )
 
     def __str__(self):
         return self.username
 
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Users built by `users.loader` load
+        deferred fields together, from the loader cache when it has them.
+
+        """
+
+        if self.load_deferred_together and fields is not None:
+            from users.loader import user_loader
+
+            deferred = self.get_deferred_fields()
+            cached_fields = deferred & set(user_loader.field_names)
+            values = user_loader.get_many_values([self.pk]).get(self.pk) if set(fields) <= cached_fields else None
+            if values is not None:
+                for name, value in zip(user_loader.field_names, values):
+                    if name in cached_fields:
+                        setattr(self, name, value)
+                return
+            fields = set(fields) | deferred
+        super().refresh_from_db(using, fields)
+
+    def save(self, *args, **kwargs):
+        if self.load_deferred_together and kwargs.get('update_fields') is None and self.get_deferred_fields():
+            self.refresh_from_db(fields=self.get_deferred_fields())
+        super().save(*args, **kwargs)
+
     @property
     def primary_email(self):
+        if hasattr(self, 'primary_email_addresses'):
+            return next(iter(self.primary_email_addresses), None)
         return self.emailaddress_set.filter(primary=True).first()
 
     @property
     def is_email_verified(self):
-        email = self.primary_email
-        return email.verified if email else False
+        return self.email_verified
+
+    def sync_email_state(self):
+        """
+        Copy the primary email address and its verified flag to the user.
+        Has to be called after the user is saved with email addresses
+        changed in between, the save writes the old values back.
+
+        """
+
+        email = self.emailaddress_set.filter(primary=True).first()
+        self.primary_email_address = email.email if email else ''
+        self.email_verified = email.verified if email else False
+        self.save(update_fields=('primary_email_address', 'email_verified'))
 
     @property
     def get_full_name(self):
@@ -111,5 +174,15 @@ class User(PermissionsMixin, AbstractBaseUser, SoftDeletableModel):
 
     @property
     def avatar_url(self):
-        url = self.avatar.url if self.avatar else static('/images/user_default_avatar.png')
-        return build_absolute_uri(None, url)
+        return get_avatar_url(self.avatar.name)
+
+
+def get_avatar_url(avatar):
+    """
+    Absolute url of stored avatar name or of the default avatar.
+
+    """
+
+    storage = User._meta.get_field('avatar').storage
+    url = storage.url(avatar) if avatar else static('/images/user_default_avatar.png')
+    return build_absolute_uri(None, url)
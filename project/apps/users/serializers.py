@@ -11,7 +11,13 @@ from rest_auth.serializers import (
 )
 from rest_framework import serializers
 
+from common.serializers import (
+    LoadedRelationSerializerMixin,
+    ValuesSerializer,
+)
 from users.forms import PasswordResetForm
+from users.loader import user_loader
+from users.models import get_avatar_url
 
 User = get_user_model()
 
@@ -104,16 +110,31 @@ class PasswordResetSerializer(PasswordResetSerializerBase):
         }
 
 
-class UserSimpleSerializer(serializers.ModelSerializer):
+class UserSimpleSerializer(LoadedRelationSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'avatar_url',
                   'first_name', 'last_name',)
+        queryset_fields = ('avatar',)
+        loader = user_loader
+
+
+class UserSimpleValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('avatar_url', 'avatar'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )
+    converters = {
+        'avatar_url': get_avatar_url,
+    }
 
 
 class UserDetailsSerializer(serializers.ModelSerializer):
-    posts_total = serializers.SerializerMethodField()
-    comments_total = serializers.SerializerMethodField()
+    posts_total = serializers.ReadOnlyField(source='posts_count')
+    comments_total = serializers.ReadOnlyField(source='comments_count')
 
     class Meta:
         model = User
@@ -122,14 +143,7 @@ class UserDetailsSerializer(serializers.ModelSerializer):
                   'avatar_url', 'last_login',
                   'posts_total', 'comments_total')
         read_only_fields = ('id', 'avatar_url', 'last_login')
-
-    @staticmethod
-    def get_posts_total(obj):
-        return getattr(obj, 'posts_total', 0)
-
-    @staticmethod
-    def get_comments_total(obj):
-        return getattr(obj, 'comments_total', 0)
+        queryset_fields = ('avatar',)
 
     def to_representation(self, instance):
         """
@@ -157,7 +171,8 @@ class UserSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         email = validated_data.get('email')
-        if email and email != instance.email:
+        email_changed = email and email != instance.email
+        if email_changed:
             instance.emailaddress_set.filter(user=instance).update(primary=False)
             email_address, created = instance.emailaddress_set.update_or_create(user=instance,
                                                                                 email=email,
@@ -165,7 +180,10 @@ class UserSerializer(serializers.ModelSerializer):
             if created or not email_address.verified:
                 email_address.send_confirmation()
 
-        return super().update(instance, validated_data)
+        instance = super().update(instance, validated_data)
+        if email_changed:
+            instance.sync_email_state()
+        return instance
 
     def to_representation(self, instance):
         return UserDetailsSerializer(instance).data
@@ -0,0 +1,40 @@
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from common.cache import invalidate_response_cache
+from common.signals import pre_batch_delete
+from users.loader import user_loader
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    user_loader.invalidate(instance.id)
+    invalidate_response_cache(f'user:{instance.id}')
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    user_loader.invalidate(instance.id)
+    invalidate_response_cache(f'user:{instance.id}')
+
+
+@receiver(pre_batch_delete, sender=User)
+def users_deleting(sender, queryset, **kwargs):
+    user_ids = list(queryset.values_list('id', flat=True))
+    user_loader.invalidate(*user_ids)
+    invalidate_response_cache(*(f'user:{user_id}' for user_id in user_ids))
+
+
+@receiver(post_save, sender=EmailAddress)
+@receiver(post_delete, sender=EmailAddress)
+def email_address_changed(sender, instance, **kwargs):
+    User.objects.sync_email_state(instance.user_id)
+    user_loader.invalidate(instance.user_id)
+    invalidate_response_cache(f'user:{instance.user_id}')
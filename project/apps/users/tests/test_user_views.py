@@ -1,13 +1,29 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import (
+    connection,
+    reset_queries,
+)
 from django.db.models import Count
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+)
 from django.urls import reverse_lazy
 from freezegun import freeze_time
 from rest_auth.utils import jwt_encode
 from rest_framework import status
 
 from comments.models import Comment
+from comments.tests.factories import CommentFactory
+from common.deletion import delete_objects
+from common.mail import MailQueueWorker
+from common.models import QueuedEmail
 from posts.models import Post
+from posts.serializers import PostDetailsSerializer
+from posts.tests.factories import PostFactory
+from users.authentication import verify_token
+from users.loader import user_loader
 from users.serializers import UserDetailsSerializer
 from users.tests.factories import USER_DEFAULT_PASSWORD
 from users.tests.utils import find_values_in_mail_body
@@ -322,6 +338,9 @@ class UserViewsTestSuite:
         email.save()
 
         assert not user.primary_email.verified
+        user.refresh_from_db()
+        assert not user.is_email_verified
+        assert user.primary_email_address == email.email
 
         payloads = {
             self.email_field: user.email,
@@ -351,6 +370,9 @@ class UserViewsTestSuite:
         assert self.user_field in response.data
 
         assert user.primary_email.verified
+        user.refresh_from_db()
+        assert user.is_email_verified
+        assert User.objects.with_primary_email().get(id=user.id).primary_email == email
 
     @freeze_time()
     def test_password_change(self, client, user, faker):
@@ -446,6 +468,20 @@ class UserViewsTestSuite:
         assert response.data.get(self.detail_field) == 'Password reset e-mail has been sent.'
         assert len(mailoutbox) == 1
 
+    def test_mail_queue(self, client, user, mailoutbox):
+        with override_settings(EMAIL_BACKEND='common.mail.QueuedEmailBackend'):
+            response = client.post(self.password_reset_url, data={self.email_field: user.email})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(mailoutbox) == 0
+        assert QueuedEmail.objects.get().recipients == user.email
+
+        worker = MailQueueWorker(backend='django.core.mail.backends.locmem.EmailBackend')
+        assert worker.run_batch() == (1, 0)
+        assert worker.run_batch() == (0, 0)
+        assert len(mailoutbox) == 1
+        assert mailoutbox[0].to == [user.email]
+        assert not QueuedEmail.objects.exists()
+
     @freeze_time()
     def test_password_reset_confirm(self, client, user, faker, mailoutbox):
         for http_method in ('get', 'put', 'patch', 'delete'):
@@ -585,6 +621,34 @@ class UserViewsTestSuite:
         assert self.email_field in response.data
         assert response.data.get(self.email_field) == user.email
 
+    def test_user_counters(self, client):
+        def assert_counters():
+            for user in User.objects.annotate(
+                posts_total=Count('posts', distinct=True),
+                comments_total=Count('comments', distinct=True),
+            ):
+                assert (user.posts_count, user.comments_count) == (user.posts_total, user.comments_total)
+
+        assert_counters()
+        author, commenter = User.objects.filter(posts__isnull=False).distinct()[:2]
+        post = PostFactory(author=author)
+        comment = CommentFactory(post=post, user=commenter)
+        CommentFactory(post=post, user=author)
+        assert_counters()
+
+        post.author, comment.user = commenter, author
+        post.save()
+        comment.save()
+        assert_counters()
+
+        comment.delete()
+        assert_counters()
+        delete_objects(Post.objects.filter(author=commenter))
+        assert_counters()
+
+        response = client.get(reverse_lazy(self.user_info_url, args=(commenter.id,)))
+        assert response.data.get(self.posts_total_field) == 0
+
     def test_user_update_view(self, client, faker):
         for http_method in ('get', 'post', 'put', 'patch', 'delete'):
             response = getattr(client, http_method)(self.user_update_url)
@@ -614,7 +678,81 @@ class UserViewsTestSuite:
         assert response.data.get(self.first_name_field) == new_first_name
         assert response.data.get(self.last_name_field) == new_last_name
 
-    def test_user_posts_view(self, client):
+    def test_stateless_jwt_authentication(self, client, faker):
+        user = User.objects.filter(posts__isnull=False).last()
+        client.credentials(HTTP_AUTHORIZATION=f'JWT {jwt_encode(user)}')
+
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse_lazy('api:posts:my_post_list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == user.posts.count()
+        assert not any('"users_user"."username" =' in query['sql'] for query in context.captured_queries)
+
+        modified = user.modified
+        new_first_name = faker.first_name()
+        response = client.patch(self.user_update_url, data={self.first_name_field: new_first_name})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == UserDetailsSerializer(User.objects.get(id=user.id)).data
+        user.refresh_from_db()
+        assert user.first_name == new_first_name
+        assert user.modified > modified
+        assert user.password
+        assert verify_token.cache_info().hits
+
+        client.credentials(HTTP_AUTHORIZATION=f'JWT {jwt_encode(user)}x')
+        response = client.get(reverse_lazy('api:posts:my_post_list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        client.credentials(HTTP_AUTHORIZATION=f'JWT {jwt_encode(user)}')
+        user.is_active = False
+        user.save()
+        response = client.get(reverse_lazy('api:posts:my_post_list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        user.is_active = True
+        user.save()
+        user.delete()
+        response = client.get(reverse_lazy('api:posts:my_post_list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_user_save_keeps_counters(self, faker):
+        user = User.objects.filter(posts__isnull=False).last()
+        loaded = User.objects.get(id=user.id)
+        PostFactory(author=user)
+        CommentFactory(user=user)
+        loaded.first_name = faker.first_name()
+        loaded.save()
+        user.refresh_from_db()
+        assert user.first_name == loaded.first_name
+        assert (user.posts_count, user.comments_count) == (loaded.posts_count + 1, loaded.comments_count + 1)
+
+    def test_user_loader(self, django_assert_num_queries, faker):
+        user_ids = list(User.objects.values_list('id', flat=True)[:5])
+        user_loader.invalidate(*user_ids)
+        with django_assert_num_queries(1):
+            users = user_loader.get_many(user_ids + [0])
+        with django_assert_num_queries(0):
+            assert user_loader.get_many(user_ids).keys() == users.keys() == set(user_ids)
+
+        user = User.objects.get(id=user_ids[0])
+        assert users[user.id].username == user.username
+        user.first_name = faker.first_name()
+        user.save()
+        assert user_loader.get(user.id).first_name == user.first_name
+        user.delete()
+        assert user_loader.get(user.id).is_removed
+
+        post = Post.objects.filter(comments__isnull=False, author_id__in=user_ids[1:]).first() or Post.objects.first()
+        PostDetailsSerializer(post).data
+        post = Post.objects.get(id=post.id)
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            data = PostDetailsSerializer(post).data
+        assert data['author']['username'] == post.author.username
+        assert not any('FROM "users_user"' in query['sql'] for query in context.captured_queries)
+
+    def test_user_posts_view(self, client, post_factory):
         test_url = reverse_lazy(self.user_posts_url, args=(1,))
         for http_method in ('post', 'put', 'patch', 'delete'):
             response = getattr(client, http_method)(test_url)
@@ -637,6 +775,11 @@ class UserViewsTestSuite:
         assert response.data['results']
         assert len(response.data['results']) == posts_count
 
+        post_factory(author=user, title='Zebracorn herd', body='Zebracorn')
+        post_factory(author=user, title='Notes', body='Zebracorn notes')
+        response = client.get(url, data={'search': 'zebracorn', 'ordering': 'title'})
+        assert [item['title'] for item in response.data['results']] == ['Notes', 'Zebracorn herd']
+
     def test_user_comments_view(self, client):
         test_url = reverse_lazy(self.user_comments, args=(1,))
         for http_method in ('post', 'put', 'patch', 'delete'):
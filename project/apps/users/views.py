@@ -1,5 +1,4 @@
 from django.contrib.auth import logout as auth_logout, get_user_model
-from django.db.models import Count
 from django.utils.translation import ugettext_lazy as _
 from rest_auth.registration.views import RegisterView as BaseRegisterView
 from rest_auth.registration.views import VerifyEmailView as BaseVerifyEmailView
@@ -24,13 +23,25 @@ from comments.filters import (
     CommentsOrderingFilter,
 )
 from comments.models import Comment
-from comments.serializers import CommentSimpleSerializer
+from comments.serializers import (
+    CommentSimpleSerializer,
+    CommentSimpleValuesSerializer,
+)
+from common.mixins import (
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    OptimizedQuerysetMixin,
+    ValuesListMixin,
+)
 from posts.filters import (
     PostsSearchFilter,
     PostsOrderingFilter,
 )
 from posts.models import Post
-from posts.serializers import PostSimpleSerializer
+from posts.serializers import (
+    PostSimpleSerializer,
+    PostSimpleValuesSerializer,
+)
 from users.filters import (
     UsersSearchFilter,
     UsersOrderingFilter,
@@ -51,6 +62,7 @@ class RegisterApiView(BaseRegisterView):
     """
 
     http_method_names = ('post', 'head', 'options')
+    throttle_rates = {'ip': '10/hour'}
 
 
 class VerifyEmailResendApiView(generics.GenericAPIView):
@@ -62,6 +74,7 @@ class VerifyEmailResendApiView(generics.GenericAPIView):
     serializer_class = VerifyEmailResendSerializer
     http_method_names = ('post', 'head', 'options')
     permission_classes = (AllowAny,)
+    throttle_rates = {'ip': '10/min'}
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -89,6 +102,7 @@ class VerifyEmailConfirmApiView(BaseVerifyEmailView):
 
         # purge other unverified emails
         user.emailaddress_set.exclude(email=confirmation.email_address.email).delete()
+        user.sync_email_state()
 
         # create token and respond auth key
         payload = jwt_payload_handler(user)
@@ -103,6 +117,7 @@ class LoginApiView(BaseLoginView):
     """
 
     http_method_names = ('post', 'head', 'options')
+    throttle_rates = {'ip': '30/min'}
 
 
 class LogoutApiView(APIView):
@@ -141,6 +156,7 @@ class PasswordResetView(BasePasswordResetView):
     """
 
     http_method_names = ('post', 'head', 'options')
+    throttle_rates = {'ip': '10/min'}
 
 
 class PasswordResetConfirmView(BasePasswordResetConfirmView):
@@ -157,45 +173,40 @@ class PasswordResetConfirmView(BasePasswordResetConfirmView):
     http_method_names = ('post', 'head', 'options')
 
 
-class UserListApiView(generics.ListAPIView):
+class UserListApiView(OptimizedQuerysetMixin, generics.ListAPIView):
     """
     get: List of users
 
     """
 
-    queryset = User.objects.only(
-        'id', 'email', 'username',
-        'first_name', 'last_name',
-        'avatar', 'last_login',
-    ).annotate(
-        posts_total=Count('posts', distinct=True),
-        comments_total=Count('comments', distinct=True),
-    )
+    queryset = User.objects.all()
     http_method_names = ('get', 'head', 'options')
     filter_backends = (UsersSearchFilter, UsersOrderingFilter)
     search_fields = ('email', 'first_name', 'last_name')
+    ordering = ('first_name', 'last_name', 'email')
     serializer_class = UserDetailsSerializer
     permission_classes = (AllowAny,)
+    throttle_rates = {'ip': '60/min'}
 
 
-class UserInfoApiView(generics.RetrieveAPIView):
+class UserInfoApiView(ConditionalResponseMixin, CachedResponseMixin, OptimizedQuerysetMixin,
+                      generics.RetrieveAPIView):
     """
     get: Return user info
 
     """
 
-    queryset = User.objects.only(
-        'id', 'email', 'username',
-        'first_name', 'last_name',
-        'avatar', 'last_login',
-    ).annotate(
-        posts_total=Count('posts', distinct=True),
-        comments_total=Count('comments', distinct=True),
-    )
+    queryset = User.objects.all()
     http_method_names = ('get', 'head', 'options')
     serializer_class = UserDetailsSerializer
     permission_classes = (AllowAny,)
     lookup_url_kwarg = 'pk'
+    cache_tags = ('user:{pk}', 'user-posts:{pk}', 'user-comments:{pk}')
+    validator_fields = ('modified', 'posts_count', 'comments_count')
+    validator_tags = ('user:{pk}',)
+
+    def get_validators_queryset(self):
+        return User.objects.filter(pk=self.kwargs[self.lookup_url_kwarg])
 
 
 class UserUpdateApiView(generics.UpdateAPIView):
@@ -212,18 +223,24 @@ class UserUpdateApiView(generics.UpdateAPIView):
         return self.request.user
 
 
-class UserPostsListView(generics.ListAPIView):
+class UserPostsListView(ConditionalResponseMixin, CachedResponseMixin, ValuesListMixin,
+                        OptimizedQuerysetMixin, generics.ListAPIView):
     """
     get: Return list of user posts
 
     """
 
-    queryset = Post.objects.only('id', 'title', 'created', 'modified')
+    queryset = Post.objects.all()
     http_method_names = ('get', 'head', 'options')
     permission_classes = (AllowAny,)
-    filter_backends = (PostsOrderingFilter, PostsSearchFilter)
+    filter_backends = (PostsSearchFilter, PostsOrderingFilter)
     search_fields = ('title', 'body')
+    ordering = ('-created',)
     serializer_class = PostSimpleSerializer
+    values_serializer_class = PostSimpleValuesSerializer
+    cache_tags = ('user-posts:{pk}',)
+    cache_object_tags = ('post:{obj.id}',)
+    validator_tags = ('user-posts:{pk}',)
 
     def get_queryset(self):
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
@@ -235,18 +252,25 @@ class UserPostsListView(generics.ListAPIView):
         return queryset
 
 
-class UserCommentsListView(generics.ListAPIView):
+class UserCommentsListView(ConditionalResponseMixin, CachedResponseMixin, ValuesListMixin,
+                           OptimizedQuerysetMixin, generics.ListAPIView):
     """
     get: Return list of user comments
 
     """
 
-    queryset = Comment.objects.only('id', 'post_id', 'body', 'created', 'modified')
+    queryset = Comment.objects.all()
+    queryset_fields = ('user',)
     http_method_names = ('get', 'head', 'options')
     permission_classes = (AllowAny,)
     filter_backends = (CommentsSearchFilter, CommentsOrderingFilter)
     search_fields = ('body',)
+    ordering = ('-created', 'user')
     serializer_class = CommentSimpleSerializer
+    values_serializer_class = CommentSimpleValuesSerializer
+    cache_tags = ('user-comments:{pk}',)
+    cache_object_tags = ('comment:{obj.id}',)
+    validator_tags = ('user-comments:{pk}',)
 
     def get_queryset(self):
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field